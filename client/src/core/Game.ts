@@ -9,7 +9,8 @@ import World from "./World"
 const SNAPSHOT_INTERVAL = 25
 
 export default class Game {
-  public maxRound: number = 1
+  public maxRound: number
+  public readonly startRound: number
   public currentRound: Round
   public readonly stats: RoundStats[] = []
   private readonly rounds: schema.Round[] = []
@@ -20,23 +21,35 @@ export default class Game {
    * @param {Games} games - The games wrapper.
    * @param {World} world - The initial world map for the simulation.
    * @param {Agents} initialAgents - The initial agents that will spawn.
+   * @param {schema.GameHeader} keyframe - The state to start from if joining mid-game.
    */
   constructor(
     public readonly games: Games,
     public readonly world: World,
-    public initialAgents: Agents
+    public initialAgents: Agents,
+    private readonly keyframe: schema.GameHeader | null = null
   ) {
-    this.currentRound = new Round(this, this.world, 0, initialAgents)
+    this.startRound = keyframe?.startRound ?? 0
+    this.maxRound = this.startRound + 1
+    this.currentRound = new Round(this, this.world, this.startRound, initialAgents)
+    if (keyframe) {
+      this.world.applyDroneScans(keyframe.droneScans)
+      this.currentRound.stats.applyRound(
+        this.currentRound,
+        schema.Round.create({ round: this.startRound, teamInfo: keyframe.teamInfo })
+      )
+    }
   }
 
   public static fromSchema(games: Games, header: schema.GameHeader): Game {
     const world = World.fromSchema(header.world!)
     const initialAgents = new Agents(games, header.spawns)
-    return new Game(games, world, initialAgents)
+    const keyframe = header.startRound > 0 ? header : null
+    return new Game(games, world, initialAgents, keyframe)
   }
 
   public addRound(round: schema.Round): void {
-    if (this.currentRound.round === 0) {
+    if (this.snapshots.length === 0) {
       this.currentRound.startRound(round)
       this.snapshots.push(this.currentRound.copy())
     }
@@ -61,7 +74,7 @@ export default class Game {
       return
     }
 
-    const clampedRound = Math.max(1, Math.min(round, this.maxRound))
+    const clampedRound = Math.max(this.startRound + 1, Math.min(round, this.maxRound))
     if (clampedRound === this.currentRound.round) {
       return
     }
@@ -75,12 +88,10 @@ export default class Game {
 
     while (updatingRound.round < round) {
       updatingRound.jumpToTurn(updatingRound.turnsLength)
-      const nextDelta =
-        updatingRound.round < this.rounds.length
-          ? this.rounds[updatingRound.round]
-          : null
+      const deltaIndex = updatingRound.round - this.startRound
+      const nextDelta = deltaIndex < this.rounds.length ? this.rounds[deltaIndex] : null
       updatingRound.startRound(nextDelta)
-      if (updatingRound.round % SNAPSHOT_INTERVAL === 0) {
+      if ((updatingRound.round - this.startRound) % SNAPSHOT_INTERVAL === 0) {
         this.snapshots.push(updatingRound.copy())
       }
     }
@@ -104,7 +115,9 @@ export default class Game {
   // }
 
   private getClosestSnapshot(targetRound: number): Round {
-    const snapIndex = Math.floor((targetRound - 1) / SNAPSHOT_INTERVAL)
+    const snapIndex = Math.floor(
+      (targetRound - this.startRound - 1) / SNAPSHOT_INTERVAL
+    )
     if (snapIndex < this.snapshots.length) {
       return this.snapshots[snapIndex]
     }
@@ -112,8 +125,14 @@ export default class Game {
   }
 
   public initEnergy(): void {
+    const energies = new Map<number, number>(
+      this.keyframe?.agents.map((agent): [number, number] => [
+        agent.agentId,
+        agent.energyLevel,
+      ])
+    )
     for (const agent of this.initialAgents.agents.values()) {
-      agent.energyLevel = this.world.startEnergy
+      agent.energyLevel = energies.get(agent.id) ?? this.world.startEnergy
     }
   }
 }
@@ -7,6 +7,8 @@ let nextId = 0
 export default class Games {
   public readonly games: Game[] = []
   public currentGame: Game | undefined = undefined
+  // Whether the current game's footer has been seen
+  private currentGameEnded: boolean = false
   public readonly id: number
   public playable: boolean
 
@@ -28,8 +30,15 @@ export default class Games {
       case "gameHeader": {
         const header = event.event.gameHeader
         const game = Game.fromSchema(this, header)
-        this.games.push(game)
+        // A keyframe mid-game is the server catching us up on the game in
+        // progress, it replaces that game rather than starting another
+        if (header.startRound > 0 && this.currentGame && !this.currentGameEnded) {
+          this.games[this.games.length - 1] = game
+        } else {
+          this.games.push(game)
+        }
         this.currentGame = game
+        this.currentGameEnded = false
         game.initEnergy()
         return
       }
@@ -40,6 +49,7 @@ export default class Games {
         return
       }
       case "gameFooter":
+        this.currentGameEnded = true
         return
       case "gamesFooter":
         return
@@ -41,6 +41,11 @@ export default class Round {
       return
     }
 
+    // rounds where no agent changed have no first turn to clear the dead on
+    if (this.turnsLength === 0) {
+      this.agents.clearDead()
+    }
+
     while (this.turn < turn) {
       this.stepTurn()
     }
@@ -66,7 +71,7 @@ export default class Round {
   }
 
   get droneScans(): schema.DroneScan[] {
-    return this.currentRound?.droneScans ?? []
+    return this.world.getDroneScans()
   }
 
   get stats(): RoundStats {
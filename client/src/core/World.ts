@@ -10,6 +10,10 @@ import invariant from "tiny-invariant"
 import { EditorBrush, LayersBrush, MoveCostBrush, ZoneBrush } from "./Brushes"
 import Round from "./Round"
 
+function droneScanKey(scan: schema.DroneScan): string {
+  return `${scan.location!.x},${scan.location!.y},${scan.team}`
+}
+
 /**
  * Represents a world in aegis.
  * @param width - Width of the world in cells.
@@ -20,7 +24,9 @@ import Round from "./Round"
  */
 export default class World {
   private layerRemovals: schema.Location[] = []
-  private droneScans: schema.DroneScan[] = []
+  // Active drone scans keyed by location and team, rounds only send changes so
+  // durations are counted down here
+  private droneScans: Map<string, schema.DroneScan> = new Map()
 
   constructor(
     public readonly width: number,
@@ -33,7 +39,6 @@ export default class World {
 
   public applyRound(round: schema.Round | null): void {
     this.layerRemovals = []
-    this.droneScans = []
 
     if (!round) {
       return
@@ -45,7 +50,40 @@ export default class World {
       this.layerRemovals.push(loc)
     }
 
-    this.droneScans = round.droneScans
+    this.tickDroneScans()
+    this.applyDroneScans(round.droneScansStarted, round.droneScansExpired)
+  }
+
+  /**
+   * Counts down the remaining duration of every active drone scan by a round,
+   * matching what the server does before sending a round's changes.
+   */
+  private tickDroneScans(): void {
+    for (const [key, scan] of this.droneScans) {
+      if (scan.duration <= 1) {
+        this.droneScans.delete(key)
+      } else {
+        // scans are shared with copies of this world, so replace rather than mutate
+        this.droneScans.set(key, { ...scan, duration: scan.duration - 1 })
+      }
+    }
+  }
+
+  /**
+   * Updates the active drone scans.
+   * @param started - Scans that started or restarted.
+   * @param expired - Scans that ended.
+   */
+  public applyDroneScans(
+    started: schema.DroneScan[],
+    expired: schema.DroneScan[] = []
+  ): void {
+    for (const scan of expired) {
+      this.droneScans.delete(droneScanKey(scan))
+    }
+    for (const scan of started) {
+      this.droneScans.set(droneScanKey(scan), scan)
+    }
   }
 
   /**
@@ -89,7 +127,7 @@ export default class World {
   }
 
   public copy(): World {
-    return new World(
+    const world = new World(
       this.width,
       this.height,
       this.seed,
@@ -97,6 +135,8 @@ export default class World {
       this.startEnergy,
       this.initSpawns
     )
+    world.droneScans = new Map(this.droneScans)
+    return world
   }
 
   /**
@@ -328,7 +368,7 @@ export default class World {
     const droneScanEye = getImage(droneScanEyeSrc)
     invariant(droneScanEye, "drone scan eye image should be loaded already")
 
-    for (const droneScan of this.droneScans) {
+    for (const droneScan of this.droneScans.values()) {
       const coords = renderCoords(
         droneScan.location!.x,
         droneScan.location!.y,
@@ -347,11 +387,7 @@ export default class World {
   }
 
   public getDroneScans(): schema.DroneScan[] {
-    return this.droneScans
-  }
-
-  public applyDroneScanUpdate(droneScanUpdate: schema.DroneScanUpdate): void {
-    this.droneScans = droneScanUpdate.droneScans
+    return Array.from(this.droneScans.values())
   }
 
   public getCellsByType(type: schema.CellType): schema.Cell[] {
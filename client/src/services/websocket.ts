@@ -4,7 +4,8 @@ import { schema } from "aegis-schema"
 import invariant from "tiny-invariant"
 
 export class ClientWebSocket {
-  private url: string = "ws://localhost:6003"
+  // Ask for raw binary frames, older servers ignore this and send base64 text
+  private url: string = "ws://localhost:6003/?transport=binary"
   private reconnectInterval: number = 500
   private games: Games | undefined = undefined
   private game: Game | undefined = undefined
@@ -18,6 +19,7 @@ export class ClientWebSocket {
 
   private connect(): void {
     const ws: WebSocket = new WebSocket(this.url)
+    ws.binaryType = "arraybuffer"
 
     ws.onopen = (): void => {
       console.log(`Connected to ${this.url}`)
@@ -34,22 +36,24 @@ export class ClientWebSocket {
     }
   }
 
-  private handleEvent(data: string): void {
+  private handleEvent(data: ArrayBuffer | string): void {
     try {
-      const decoded = Uint8Array.from(atob(data), (c) => c.charCodeAt(0))
+      const decoded =
+        typeof data === "string"
+          ? Uint8Array.from(atob(data), (c) => c.charCodeAt(0))
+          : new Uint8Array(data)
       const event = schema.Event.fromBinary(decoded)
 
-      if (!this.games) {
-        invariant(
-          event.event.oneofKind === "gamesHeader",
-          "First event must be the GamesHeader."
-        )
-
+      // Only sent first, a client that falls behind is caught up from where it was
+      if (event.event.oneofKind === "gamesHeader") {
+        this.game = undefined
         this.games = new Games(true)
         this.onGamesCreated(this.games)
         return
       }
 
+      invariant(this.games, "First event must be the GamesHeader.")
+
       this.games.addEvent(event)
 
       if (event.event.oneofKind === "round") {
@@ -63,12 +67,6 @@ export class ClientWebSocket {
         this.game = game
       }
 
-      if (event.event.oneofKind === "droneScanUpdate") {
-        if (this.game) {
-          this.game.currentRound.world.applyDroneScanUpdate(event.event.droneScanUpdate)
-        }
-      }
-
       if (event.event.oneofKind === "gameFooter") {
         this.game = undefined
       }
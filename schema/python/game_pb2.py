@@ -29,7 +29,7 @@ from . import turn_pb2 as turn__pb2
 from . import world_pb2 as world__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\ngame.proto\x12\x05\x61\x65gis\x1a\x0elocation.proto\x1a\x0bspawn.proto\x1a\nteam.proto\x1a\nturn.proto\x1a\x0bworld.proto\"[\n\tDroneScan\x12!\n\x08location\x18\x01 \x01(\x0b\x32\x0f.aegis.Location\x12\x19\n\x04team\x18\x02 \x01(\x0e\x32\x0b.aegis.Team\x12\x10\n\x08\x64uration\x18\x03 \x01(\x05\"8\n\x0f\x44roneScanUpdate\x12%\n\x0b\x64rone_scans\x18\x01 \x03(\x0b\x32\x10.aegis.DroneScan\"\r\n\x0bGamesHeader\"W\n\nGameHeader\x12\x1b\n\x05world\x18\x01 \x01(\x0b\x32\x0c.aegis.World\x12\x0e\n\x06rounds\x18\x02 \x01(\x05\x12\x1c\n\x06spawns\x18\x03 \x03(\x0b\x32\x0c.aegis.Spawn\"\xb8\x01\n\x05Round\x12\r\n\x05round\x18\x01 \x01(\x05\x12\'\n\x0elayers_removed\x18\x02 \x03(\x0b\x32\x0f.aegis.Location\x12\x10\n\x08\x64\x65\x61\x64_ids\x18\x03 \x03(\x05\x12\x1a\n\x05turns\x18\x04 \x03(\x0b\x32\x0b.aegis.Turn\x12\"\n\tteam_info\x18\x05 \x03(\x0b\x32\x0f.aegis.TeamInfo\x12%\n\x0b\x64rone_scans\x18\x06 \x03(\x0b\x32\x10.aegis.DroneScan\"\x0c\n\nGameFooter\"\r\n\x0bGamesFooterb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\ngame.proto\x12\x05\x61\x65gis\x1a\x0elocation.proto\x1a\x0bspawn.proto\x1a\nteam.proto\x1a\nturn.proto\x1a\x0bworld.proto\"[\n\tDroneScan\x12!\n\x08location\x18\x01 \x01(\x0b\x32\x0f.aegis.Location\x12\x19\n\x04team\x18\x02 \x01(\x0e\x32\x0b.aegis.Team\x12\x10\n\x08\x64uration\x18\x03 \x01(\x05\"8\n\x0f\x44roneScanUpdate\x12%\n\x0b\x64rone_scans\x18\x01 \x03(\x0b\x32\x10.aegis.DroneScan\"\r\n\x0bGamesHeader\"\xd4\x01\n\nGameHeader\x12\x1b\n\x05world\x18\x01 \x01(\x0b\x32\x0c.aegis.World\x12\x0e\n\x06rounds\x18\x02 \x01(\x05\x12\x1c\n\x06spawns\x18\x03 \x03(\x0b\x32\x0c.aegis.Spawn\x12\x13\n\x0bstart_round\x18\x04 \x01(\x05\x12\"\n\tteam_info\x18\x05 \x03(\x0b\x32\x0f.aegis.TeamInfo\x12\x1b\n\x06\x61gents\x18\x06 \x03(\x0b\x32\x0b.aegis.Turn\x12%\n\x0b\x64rone_scans\x18\x07 \x03(\x0b\x32\x10.aegis.DroneScan\"\xf5\x01\n\x05Round\x12\r\n\x05round\x18\x01 \x01(\x05\x12\'\n\x0elayers_removed\x18\x02 \x03(\x0b\x32\x0f.aegis.Location\x12\x10\n\x08\x64\x65\x61\x64_ids\x18\x03 \x03(\x05\x12\x1a\n\x05turns\x18\x04 \x03(\x0b\x32\x0b.aegis.Turn\x12\"\n\tteam_info\x18\x05 \x03(\x0b\x32\x0f.aegis.TeamInfo\x12-\n\x13\x64rone_scans_started\x18\x07 \x03(\x0b\x32\x10.aegis.DroneScan\x12-\n\x13\x64rone_scans_expired\x18\x08 \x03(\x0b\x32\x10.aegis.DroneScanJ\x04\x08\x06\x10\x07\"\x0c\n\nGameFooter\"\r\n\x0bGamesFooterb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -42,12 +42,12 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_DRONESCANUPDATE']._serialized_end=236
   _globals['_GAMESHEADER']._serialized_start=238
   _globals['_GAMESHEADER']._serialized_end=251
-  _globals['_GAMEHEADER']._serialized_start=253
-  _globals['_GAMEHEADER']._serialized_end=340
-  _globals['_ROUND']._serialized_start=343
-  _globals['_ROUND']._serialized_end=527
-  _globals['_GAMEFOOTER']._serialized_start=529
-  _globals['_GAMEFOOTER']._serialized_end=541
-  _globals['_GAMESFOOTER']._serialized_start=543
-  _globals['_GAMESFOOTER']._serialized_end=556
+  _globals['_GAMEHEADER']._serialized_start=254
+  _globals['_GAMEHEADER']._serialized_end=466
+  _globals['_ROUND']._serialized_start=469
+  _globals['_ROUND']._serialized_end=714
+  _globals['_GAMEFOOTER']._serialized_start=716
+  _globals['_GAMEFOOTER']._serialized_end=728
+  _globals['_GAMESFOOTER']._serialized_start=730
+  _globals['_GAMESFOOTER']._serialized_end=743
 # @@protoc_insertion_point(module_scope)
@@ -63,6 +63,24 @@ export interface GameHeader {
      * @generated from protobuf field: repeated aegis.Spawn spawns = 3
      */
     spawns: Spawn[];
+    /**
+     * The fields below are only set on keyframes for clients joining mid-game
+     *
+     * @generated from protobuf field: int32 start_round = 4
+     */
+    startRound: number;
+    /**
+     * @generated from protobuf field: repeated aegis.TeamInfo team_info = 5
+     */
+    teamInfo: TeamInfo[];
+    /**
+     * @generated from protobuf field: repeated aegis.Turn agents = 6
+     */
+    agents: Turn[];
+    /**
+     * @generated from protobuf field: repeated aegis.DroneScan drone_scans = 7
+     */
+    droneScans: DroneScan[];
 }
 /**
  * @generated from protobuf message aegis.Round
@@ -81,6 +99,8 @@ export interface Round {
      */
     deadIds: number[];
     /**
+     * Only agents whose energy, steps or location changed since their last turn
+     *
      * @generated from protobuf field: repeated aegis.Turn turns = 4
      */
     turns: Turn[];
@@ -89,9 +109,13 @@ export interface Round {
      */
     teamInfo: TeamInfo[];
     /**
-     * @generated from protobuf field: repeated aegis.DroneScan drone_scans = 6
+     * @generated from protobuf field: repeated aegis.DroneScan drone_scans_started = 7
      */
-    droneScans: DroneScan[];
+    droneScansStarted: DroneScan[];
+    /**
+     * @generated from protobuf field: repeated aegis.DroneScan drone_scans_expired = 8
+     */
+    droneScansExpired: DroneScan[];
 }
 /**
  * @generated from protobuf message aegis.GameFooter
@@ -256,13 +280,21 @@ class GameHeader$Type extends MessageType<GameHeader> {
         super("aegis.GameHeader", [
             { no: 1, name: "world", kind: "message", T: () => World },
             { no: 2, name: "rounds", kind: "scalar", T: 5 /*ScalarType.INT32*/ },
-            { no: 3, name: "spawns", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => Spawn }
+            { no: 3, name: "spawns", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => Spawn },
+            { no: 4, name: "start_round", kind: "scalar", T: 5 /*ScalarType.INT32*/ },
+            { no: 5, name: "team_info", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => TeamInfo },
+            { no: 6, name: "agents", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => Turn },
+            { no: 7, name: "drone_scans", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => DroneScan }
         ]);
     }
     create(value?: PartialMessage<GameHeader>): GameHeader {
         const message = globalThis.Object.create((this.messagePrototype!));
         message.rounds = 0;
         message.spawns = [];
+        message.startRound = 0;
+        message.teamInfo = [];
+        message.agents = [];
+        message.droneScans = [];
         if (value !== undefined)
             reflectionMergePartial<GameHeader>(this, message, value);
         return message;
@@ -281,6 +313,18 @@ class GameHeader$Type extends MessageType<GameHeader> {
                 case /* repeated aegis.Spawn spawns */ 3:
                     message.spawns.push(Spawn.internalBinaryRead(reader, reader.uint32(), options));
                     break;
+                case /* int32 start_round */ 4:
+                    message.startRound = reader.int32();
+                    break;
+                case /* repeated aegis.TeamInfo team_info */ 5:
+                    message.teamInfo.push(TeamInfo.internalBinaryRead(reader, reader.uint32(), options));
+                    break;
+                case /* repeated aegis.Turn agents */ 6:
+                    message.agents.push(Turn.internalBinaryRead(reader, reader.uint32(), options));
+                    break;
+                case /* repeated aegis.DroneScan drone_scans */ 7:
+                    message.droneScans.push(DroneScan.internalBinaryRead(reader, reader.uint32(), options));
+                    break;
                 default:
                     let u = options.readUnknownField;
                     if (u === "throw")
@@ -302,6 +346,18 @@ class GameHeader$Type extends MessageType<GameHeader> {
         /* repeated aegis.Spawn spawns = 3; */
         for (let i = 0; i < message.spawns.length; i++)
             Spawn.internalBinaryWrite(message.spawns[i], writer.tag(3, WireType.LengthDelimited).fork(), options).join();
+        /* int32 start_round = 4; */
+        if (message.startRound !== 0)
+            writer.tag(4, WireType.Varint).int32(message.startRound);
+        /* repeated aegis.TeamInfo team_info = 5; */
+        for (let i = 0; i < message.teamInfo.length; i++)
+            TeamInfo.internalBinaryWrite(message.teamInfo[i], writer.tag(5, WireType.LengthDelimited).fork(), options).join();
+        /* repeated aegis.Turn agents = 6; */
+        for (let i = 0; i < message.agents.length; i++)
+            Turn.internalBinaryWrite(message.agents[i], writer.tag(6, WireType.LengthDelimited).fork(), options).join();
+        /* repeated aegis.DroneScan drone_scans = 7; */
+        for (let i = 0; i < message.droneScans.length; i++)
+            DroneScan.internalBinaryWrite(message.droneScans[i], writer.tag(7, WireType.LengthDelimited).fork(), options).join();
         let u = options.writeUnknownFields;
         if (u !== false)
             (u == true ? UnknownFieldHandler.onWrite : u)(this.typeName, message, writer);
@@ -321,7 +377,8 @@ class Round$Type extends MessageType<Round> {
             { no: 3, name: "dead_ids", kind: "scalar", repeat: 1 /*RepeatType.PACKED*/, T: 5 /*ScalarType.INT32*/ },
             { no: 4, name: "turns", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => Turn },
             { no: 5, name: "team_info", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => TeamInfo },
-            { no: 6, name: "drone_scans", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => DroneScan }
+            { no: 7, name: "drone_scans_started", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => DroneScan },
+            { no: 8, name: "drone_scans_expired", kind: "message", repeat: 2 /*RepeatType.UNPACKED*/, T: () => DroneScan }
         ]);
     }
     create(value?: PartialMessage<Round>): Round {
@@ -331,7 +388,8 @@ class Round$Type extends MessageType<Round> {
         message.deadIds = [];
         message.turns = [];
         message.teamInfo = [];
-        message.droneScans = [];
+        message.droneScansStarted = [];
+        message.droneScansExpired = [];
         if (value !== undefined)
             reflectionMergePartial<Round>(this, message, value);
         return message;
@@ -360,8 +418,11 @@ class Round$Type extends MessageType<Round> {
                 case /* repeated aegis.TeamInfo team_info */ 5:
                     message.teamInfo.push(TeamInfo.internalBinaryRead(reader, reader.uint32(), options));
                     break;
-                case /* repeated aegis.DroneScan drone_scans */ 6:
-                    message.droneScans.push(DroneScan.internalBinaryRead(reader, reader.uint32(), options));
+                case /* repeated aegis.DroneScan drone_scans_started */ 7:
+                    message.droneScansStarted.push(DroneScan.internalBinaryRead(reader, reader.uint32(), options));
+                    break;
+                case /* repeated aegis.DroneScan drone_scans_expired */ 8:
+                    message.droneScansExpired.push(DroneScan.internalBinaryRead(reader, reader.uint32(), options));
                     break;
                 default:
                     let u = options.readUnknownField;
@@ -394,9 +455,12 @@ class Round$Type extends MessageType<Round> {
         /* repeated aegis.TeamInfo team_info = 5; */
         for (let i = 0; i < message.teamInfo.length; i++)
             TeamInfo.internalBinaryWrite(message.teamInfo[i], writer.tag(5, WireType.LengthDelimited).fork(), options).join();
-        /* repeated aegis.DroneScan drone_scans = 6; */
-        for (let i = 0; i < message.droneScans.length; i++)
-            DroneScan.internalBinaryWrite(message.droneScans[i], writer.tag(6, WireType.LengthDelimited).fork(), options).join();
+        /* repeated aegis.DroneScan drone_scans_started = 7; */
+        for (let i = 0; i < message.droneScansStarted.length; i++)
+            DroneScan.internalBinaryWrite(message.droneScansStarted[i], writer.tag(7, WireType.LengthDelimited).fork(), options).join();
+        /* repeated aegis.DroneScan drone_scans_expired = 8; */
+        for (let i = 0; i < message.droneScansExpired.length; i++)
+            DroneScan.internalBinaryWrite(message.droneScansExpired[i], writer.tag(8, WireType.LengthDelimited).fork(), options).join();
         let u = options.writeUnknownFields;
         if (u !== false)
             (u == true ? UnknownFieldHandler.onWrite : u)(this.typeName, message, writer);
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import cast
@@ -36,3 +37,31 @@ def get_feature_value(feature: FeatureKey) -> bool | int | None:
     return config.get("features", {}).get(feature) or config.get(
         "competition_specific", {}
     ).get(feature)
+
+
+@dataclass(frozen=True)
+class Features:
+    """Boolean feature flags resolved once from the config."""
+
+    allow_agent_predictions: bool
+    allow_agent_messages: bool
+    allow_drone_scan: bool
+    allow_agent_types: bool
+    hidden_move_costs: bool
+
+
+@lru_cache
+def load_features() -> Features:
+    """
+    Resolve and cache the boolean feature flags.
+
+    Use this on hot paths instead of `has_feature`, which walks the config on
+    every call.
+    """
+    return Features(
+        allow_agent_predictions=bool(has_feature("ALLOW_AGENT_PREDICTIONS")),
+        allow_agent_messages=bool(has_feature("ALLOW_AGENT_MESSAGES")),
+        allow_drone_scan=bool(has_feature("ALLOW_DRONE_SCAN")),
+        allow_agent_types=bool(has_feature("ALLOW_AGENT_TYPES")),
+        hidden_move_costs=bool(has_feature("HIDDEN_MOVE_COSTS")),
+    )
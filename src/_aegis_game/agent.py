@@ -1,18 +1,24 @@
 # pyright: reportImportCycles = false
 
+import random
+from concurrent.futures import Future
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from .agent_type import AgentType
 from .common import Direction, Location
 from .constants import Constants
 from .logger import AGENT_LOGGER
 from .message_buffer import MessageBuffer
-from .sandbox.core import LumenCore
+from .sandbox.core import LumenCore, LumenPool, SharedModule
 from .sandbox.sandbox import Sandbox
 from .team import Team
-from .types import MethodDict
+from .types import ExecMode, MethodDict
 
 if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
     from .game import Game
 
 
@@ -27,7 +33,9 @@ class Agent:
         agent_type: AgentType,
     ) -> None:
         self.game: Game = game
-        self.has_visited: list[bool] = [False] * (game.world.height * game.world.width)
+        self.has_visited: NDArray[np.bool_] = np.zeros(
+            game.world.height * game.world.width, dtype=np.bool_
+        )
         self.id: int = agent_id
         self.team: Team = team
         self.location: Location = location
@@ -50,25 +58,67 @@ class Agent:
     def process_end_of_turn(self) -> None:
         self.game.game_pb.end_turn(self)
 
-    def turn(self) -> None:
+    def turn(self, timeout: float | None = None) -> bool:
         self.process_beginning_of_turn()
         self.errors.clear()
-        self.core.run()  # pyright: ignore[reportOptionalMemberAccess]
+        finished = self.core.run(timeout)  # pyright: ignore[reportOptionalMemberAccess]
         self.log_errors()
+        if not finished:
+            return False
         self.penalize_for_errors()
         self.process_end_of_turn()
+        return True
+
+    def start_warm_up(self, shared: SharedModule | None) -> Future[None] | None:
+        """
+        Start initializing the agent's code, see `LumenCore.start`.
+
+        Args:
+            shared: The team's shared module, for the agent to import.
+
+        """
+        self.errors.clear()
+        self.core.shared = shared  # pyright: ignore[reportOptionalMemberAccess]
+        return self.core.start(init_only=True)  # pyright: ignore[reportOptionalMemberAccess]
+
+    def finish_warm_up(self, future: Future[None] | None, timeout: float) -> bool:
+        """
+        Wait for `start_warm_up` to finish, see `LumenCore.wait`.
+
+        Args:
+            future: What `start_warm_up` returned.
+            timeout: Seconds of CPU time the initialization may use.
+
+        Returns:
+            True if the agent initialized within `timeout`, False otherwise.
+
+        """
+        finished = self.core.wait(future, timeout, cpu_time=timeout)  # pyright: ignore[reportOptionalMemberAccess]
+        usage = self.core.usage  # pyright: ignore[reportOptionalMemberAccess]
+        self.log_errors()
+        # inline initialization can only be checked after it returns
+        return finished and (usage is None or usage.cpu_time < timeout)
 
     def kill(self) -> None:
         self.core.kill()  # pyright: ignore[reportOptionalMemberAccess]
 
-    def launch(
-        self, code: Sandbox | None, methods: MethodDict, *, debug: bool = False
+    def launch(  # noqa: PLR0913
+        self,
+        code: Sandbox | None,
+        methods: MethodDict,
+        *,
+        debug: bool = False,
+        mode: ExecMode = ExecMode.THREAD,
+        executor: LumenPool | None = None,
+        rng: random.Random | None = None,
     ) -> None:
         if code is None:
             error = "No code provided to launch."
             raise ValueError(error)
 
-        self.core = LumenCore(code, methods, self.error)
+        self.core = LumenCore(
+            code, methods, self.error, mode=mode, executor=executor, rng=rng
+        )
         self.debug = debug
 
     def apply_movement_cost(self, direction: Direction) -> None:
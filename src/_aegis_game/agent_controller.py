@@ -4,7 +4,6 @@ from typing import TYPE_CHECKING
 import numpy as np
 from numpy.typing import NDArray
 
-from .aegis_config import has_feature
 from .agent import Agent
 from .agent_type import AgentType
 from .common import CellInfo, Direction, Location
@@ -16,6 +15,7 @@ from .message import Message
 from .team import Team
 
 if TYPE_CHECKING:
+    from .aegis_config import Features
     from .game import Game
 
 
@@ -23,6 +23,7 @@ class AgentController:
     def __init__(self, game: "Game", agent: "Agent") -> None:
         self._game: Game = game
         self._agent: Agent = agent
+        self._features: Features = game.features
 
     def assert_not_none(self, value: object) -> None:
         if value is None:
@@ -30,7 +31,7 @@ class AgentController:
             raise AgentError(error)
 
     def assert_spawn(self, loc: Location, team: Team) -> None:
-        if loc not in self._game.get_spawns():
+        if not self._game.is_spawn(loc):
             error = f"Invalid spawn: {loc}"
             raise AgentError(error)
 
@@ -45,6 +46,13 @@ class AgentController:
             error = "Location is not on the map"
             raise AgentError(error)
 
+    def assert_region(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        self.assert_loc(Location(x0, y0))
+        self.assert_loc(Location(x1, y1))
+        if x0 > x1 or y0 > y1:
+            error = "Region corners must satisfy x0 <= x1 and y0 <= y1"
+            raise AgentError(error)
+
     def assert_move(self, direction: Direction) -> None:
         self.assert_not_none(direction)
         new_loc = self._agent.location.add(direction)
@@ -54,7 +62,7 @@ class AgentController:
             raise AgentError(error)
 
     def assert_dig(self, agent: Agent) -> None:
-        if has_feature("ALLOW_AGENT_TYPES") and agent.type not in (
+        if self._features.allow_agent_types and agent.type not in (
             AgentType.ENGINEER,
             AgentType.COMMANDER,
         ):
@@ -62,7 +70,7 @@ class AgentController:
             raise AgentError(error)
 
     def assert_save(self, agent: Agent) -> None:
-        if has_feature("ALLOW_AGENT_TYPES") and agent.type not in (
+        if self._features.allow_agent_types and agent.type not in (
             AgentType.MEDIC,
             AgentType.COMMANDER,
         ):
@@ -70,12 +78,12 @@ class AgentController:
             raise AgentError(error)
 
     def assert_predict(self) -> None:
-        if not has_feature("ALLOW_AGENT_PREDICTIONS"):
+        if not self._features.allow_agent_predictions:
             msg = "Predictions are not enabled, therefore this method is not available."
             raise AgentError(msg)
 
     def assert_scan(self) -> None:
-        if not has_feature("ALLOW_DRONE_SCAN"):
+        if not self._features.allow_drone_scan:
             msg = "Drone scan is not enabled, therefore this method is not available."
             raise AgentError(msg)
 
@@ -106,6 +114,7 @@ class AgentController:
         return self._agent.energy_level
 
     def get_lumens(self) -> int:
+        """Return the current lumens of the agent's team."""
         return self._game.team_info.get_lumens(self._agent.team)
 
     def move(self, direction: Direction) -> None:
@@ -305,8 +314,98 @@ class AgentController:
 
         """
         self.assert_loc(loc)
+        return self._visible_cell_info(
+            loc, hidden_move_costs=self._features.hidden_move_costs
+        )
 
-        idx = loc.x + loc.y * self._game.world.width
+    def get_cell_infos(self, locs: list[Location]) -> list[CellInfo]:
+        """
+        Return the cell info at each of the given locations.
+
+        Equivalent to calling `get_cell_info_at` for every location, with the same
+        visibility rules, but in a single call.
+
+        Args:
+            locs: The locations to query.
+
+        Returns:
+            Information about each cell, in the same order as `locs`.
+
+        """
+        hidden_move_costs = self._features.hidden_move_costs
+        cell_infos: list[CellInfo] = []
+        for loc in locs:
+            self.assert_loc(loc)
+            cell_infos.append(
+                self._visible_cell_info(loc, hidden_move_costs=hidden_move_costs)
+            )
+        return cell_infos
+
+    def get_region(self, x0: int, y0: int, x1: int, y1: int) -> list[CellInfo]:
+        """
+        Return the cell info of every cell in a rectangular region.
+
+        Both corners are inclusive. The same visibility rules as `get_cell_info_at`
+        apply to every cell.
+
+        Args:
+            x0: The x-coordinate of the bottom-left corner.
+            y0: The y-coordinate of the bottom-left corner.
+            x1: The x-coordinate of the top-right corner.
+            y1: The y-coordinate of the top-right corner.
+
+        Returns:
+            Information about each cell, row by row starting at `y0`.
+
+        Raises:
+            AgentError: If a corner is off the map or the corners are out of order.
+
+        """
+        self.assert_region(x0, y0, x1, y1)
+        hidden_move_costs = self._features.hidden_move_costs
+        return [
+            self._visible_cell_info(Location(x, y), hidden_move_costs=hidden_move_costs)
+            for y in range(y0, y1 + 1)
+            for x in range(x0, x1 + 1)
+        ]
+
+    def get_region_arrays(
+        self, x0: int, y0: int, x1: int, y1: int
+    ) -> tuple[NDArray[np.int32], NDArray[np.int8]]:
+        """
+        Return the move costs and top layer kinds of a rectangular region as arrays.
+
+        Both corners are inclusive. Both arrays have shape `(y1 - y0 + 1, x1 - x0 + 1)`
+        and are indexed `[y - y0, x - x0]`. Top layers are given as `LayerKind` values.
+
+        If `HIDDEN_MOVE_COSTS` feature is enabled, unvisited cells have `move_cost = 1`.
+
+        Args:
+            x0: The x-coordinate of the bottom-left corner.
+            y0: The y-coordinate of the bottom-left corner.
+            x1: The x-coordinate of the top-right corner.
+            y1: The y-coordinate of the top-right corner.
+
+        Returns:
+            A tuple of the move cost array and the top layer kind array.
+
+        Raises:
+            AgentError: If a corner is off the map or the corners are out of order.
+
+        """
+        self.assert_region(x0, y0, x1, y1)
+        world = self._game.world
+        rows, cols = slice(y0, y1 + 1), slice(x0, x1 + 1)
+
+        move_costs = world.grid.move_cost[rows, cols].copy()
+        if self._features.hidden_move_costs:
+            visited = self._agent.has_visited.reshape(world.height, world.width)
+            move_costs[~visited[rows, cols]] = 1
+
+        return move_costs, world.grid.top_layer[rows, cols].copy()
+
+    def _visible_cell_info(self, loc: Location, *, hidden_move_costs: bool) -> CellInfo:
+        """Build the cell info at an on-map location as this agent sees it."""
         cell_info = self._game.get_cell_info_at(loc)
 
         is_adjacent = self._agent.location.is_adjacent_to(loc)
@@ -317,7 +416,8 @@ class AgentController:
             top = cell_info.top_layer
             cell_info.layers = [top] if top is not None else []
 
-        if has_feature("HIDDEN_MOVE_COSTS") and not self._agent.has_visited[idx]:
+        idx = loc.x + loc.y * self._game.world.width
+        if hidden_move_costs and not self._agent.has_visited[idx]:
             cell_info.move_cost = 1
 
         return cell_info
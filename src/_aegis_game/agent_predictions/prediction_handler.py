@@ -1,10 +1,10 @@
-import random
 from typing import cast
 
 import numpy as np
 from numpy.typing import NDArray
 
 from _aegis_game.args_parser import LaunchArgs
+from _aegis_game.game_snapshot import PredictionSnapshot
 from _aegis_game.logger import LOGGER
 from _aegis_game.team import Team
 from _aegis_game.types.prediction import (
@@ -19,7 +19,8 @@ CompletedPredictions = dict[tuple[Team, int], CompletedPrediction]
 
 
 class PredictionHandler:
-    def __init__(self, args: LaunchArgs) -> None:
+    def __init__(self, args: LaunchArgs, rng: np.random.Generator) -> None:
+        self._rng: np.random.Generator = rng
         self._pending_predictions: PendingPredictions = {}
         self._completed_predictions: CompletedPredictions = {}
         self._data_loader: PredictionDataLoader = PredictionDataLoader(args)
@@ -41,7 +42,7 @@ class PredictionHandler:
 
         # Only create if no pending prediction exists
         if key not in self._pending_predictions:
-            random_index = random.randint(0, len(self._data_loader.x_test) - 1)
+            random_index = int(self._rng.integers(len(self._data_loader.x_test)))
             pending_prediction: PendingPrediction = {
                 "image_to_predict": self.get_image_from_index(random_index),
                 "correct_label": self.get_label_from_index(random_index),
@@ -102,3 +103,39 @@ class PredictionHandler:
         del self._pending_predictions[key]
 
         return is_correct
+
+    def snapshot(self) -> PredictionSnapshot:
+        """Capture the pending and completed predictions."""
+        return PredictionSnapshot(
+            [
+                (
+                    team.value,
+                    surv_id,
+                    pending["image_to_predict"],
+                    int(pending["correct_label"]),
+                )
+                for (team, surv_id), pending in self._pending_predictions.items()
+            ],
+            [
+                (team.value, surv_id, completed["is_correct"])
+                for (team, surv_id), completed in self._completed_predictions.items()
+            ],
+        )
+
+    def restore(self, snapshot: PredictionSnapshot) -> None:
+        """Replace the pending and completed predictions with a snapshot."""
+        self._pending_predictions = {
+            (Team(team), surv_id): {
+                "image_to_predict": image,
+                "correct_label": np.int32(label),
+            }
+            for team, surv_id, image, label in snapshot.pending
+        }
+        self._completed_predictions = {
+            (Team(team), surv_id): {
+                "team": Team(team),
+                "surv_id": surv_id,
+                "is_correct": is_correct,
+            }
+            for team, surv_id, is_correct in snapshot.completed
+        }
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 
 from .aegis_config import get_feature_value
 from .constants import Constants
+from .types import Backpressure, ExecMode
 
 
 @dataclass
@@ -14,9 +15,23 @@ class TypedNamespace:
     agent: str | None
     agent2: str | None
     client: bool
+    headless: bool
+    exec_mode: str
+    record: str | None
+    backpressure: str
+    track_memory: bool
     debug: bool
     log: bool
     init_type: str
+    agents: list[str]
+    seeds: list[int] | None
+    versus: bool
+    workers: int | None
+    output: str | None
+    amounts: list[int]
+    file: str
+    game: int
+    start_round: int | None
 
 
 @dataclass
@@ -29,6 +44,40 @@ class LaunchArgs:
     client: bool
     debug: bool
     log: bool
+    headless: bool = False
+    exec_mode: ExecMode = ExecMode.THREAD
+    record: str | None = None
+    backpressure: Backpressure = Backpressure.DROP
+    track_memory: bool = False
+
+
+@dataclass
+class TournamentArgs:
+    agents: list[str]
+    world: list[str]
+    seeds: list[int] | None
+    amount: int
+    rounds: int
+    versus: bool
+    workers: int | None
+    output: str | None
+
+
+@dataclass
+class BenchArgs:
+    agents: list[str] | None
+    world: list[str] | None
+    amounts: list[int]
+    rounds: int
+    exec_mode: ExecMode
+    output: str | None
+
+
+@dataclass
+class ReplayArgs:
+    file: str
+    game: int = 0
+    start_round: int | None = None
 
 
 @dataclass
@@ -46,11 +95,14 @@ class ForgeArgs:
 class Args:
     command: str
     launch_args: LaunchArgs | None = None
+    tournament_args: TournamentArgs | None = None
+    bench_args: BenchArgs | None = None
+    replay_args: ReplayArgs | None = None
     forge_args: ForgeArgs | None = None
     init_args: InitArgs | None = None
 
 
-def parse_args() -> Args:
+def parse_args() -> Args:  # noqa: PLR0915
     parser = argparse.ArgumentParser(description="AEGIS Simulation")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -99,11 +151,55 @@ def parse_args() -> Args:
             "for team Voidseers (e.g., 'agent_path', 'agent_mas')"
         ),
     )
-    _ = run_parser.add_argument(
+    output_group = run_parser.add_mutually_exclusive_group()
+    _ = output_group.add_argument(
         "--client",
         action="store_true",
         help="Used by the client, tells the server to wait for the client to connect",
     )
+    _ = output_group.add_argument(
+        "--headless",
+        action="store_true",
+        help="Skip building and sending client events (for grading/batch runs)",
+    )
+    _ = run_parser.add_argument(
+        "--exec-mode",
+        choices=[mode.value for mode in ExecMode],
+        default=ExecMode.THREAD.value,
+        help=(
+            "How agent turns are executed: one thread per agent (default), "
+            "a small shared thread pool, or inline on the game thread "
+            "(inline turns can't be interrupted for running over the time limit)"
+        ),
+    )
+    _ = run_parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help=(
+            "Record the game events to a .aegisreplay file for `aegis replay`, "
+            "the suffix is added if the name has none"
+        ),
+    )
+    _ = run_parser.add_argument(
+        "--backpressure",
+        choices=[policy.value for policy in Backpressure],
+        default=Backpressure.DROP.value,
+        help=(
+            "What to do when a client can't keep up with the events: wait for "
+            "it, drop its queued events and catch it up from the latest keyframe "
+            "(default), or send what is queued and then only what didn't fit"
+        ),
+    )
+    _ = run_parser.add_argument(
+        "--track-memory",
+        action="store_true",
+        help=(
+            "Trace the memory agents allocate and kill agents over the per-turn "
+            "limit (slows agents down)"
+        ),
+    )
     _ = run_parser.add_argument(
         "--debug",
         action="store_true",
@@ -115,6 +211,125 @@ def parse_args() -> Args:
         help="Enable AEGIS console output logging to a file",
     )
 
+    tournament_parser = subparsers.add_parser(
+        "tournament", help="Run many headless games in parallel"
+    )
+    _ = tournament_parser.add_argument(
+        "--agents",
+        type=str,
+        nargs="+",
+        required=True,
+        help="One or more agent folder names under 'agents/', separated by spaces.",
+    )
+    _ = tournament_parser.add_argument(
+        "--world",
+        type=str,
+        nargs="+",
+        required=True,
+        help="One or more world names (without .world extension), separated by spaces.",
+    )
+    _ = tournament_parser.add_argument(
+        "--seeds",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Seeds to run each world with (default = the world's own seed)",
+    )
+    _ = tournament_parser.add_argument(
+        "--amount",
+        type=int,
+        default=default_agent_amount if default_agent_amount is not None else 1,
+        help="Number of agents to run per team (default = 1)",
+    )
+    _ = tournament_parser.add_argument(
+        "--rounds",
+        type=int,
+        default=Constants.DEFAULT_MAX_ROUNDS,
+        help=f"Number of simulation rounds (default = {Constants.DEFAULT_MAX_ROUNDS})",
+    )
+    _ = tournament_parser.add_argument(
+        "--versus",
+        action="store_true",
+        help="Play every ordered pair of agents against each other instead of solo",
+    )
+    _ = tournament_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default = number of CPUs)",
+    )
+    _ = tournament_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Write one row per game to this CSV file",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Measure engine performance on the reference agents and worlds"
+    )
+    _ = bench_parser.add_argument(
+        "--agents",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Agent folder names under 'agents/' (default = every agent)",
+    )
+    _ = bench_parser.add_argument(
+        "--world",
+        type=str,
+        nargs="+",
+        default=None,
+        help="World names without .world extension (default = every world)",
+    )
+    _ = bench_parser.add_argument(
+        "--amounts",
+        type=int,
+        nargs="+",
+        default=[1, 5, 10],
+        help="Agent counts to run each world with (default = 1 5 10)",
+    )
+    _ = bench_parser.add_argument(
+        "--rounds",
+        type=int,
+        default=100,
+        help="Number of rounds per game (default = 100)",
+    )
+    _ = bench_parser.add_argument(
+        "--exec-mode",
+        choices=[mode.value for mode in ExecMode],
+        default=ExecMode.THREAD.value,
+        help="How agent turns are executed, as for `aegis launch` (default = thread)",
+    )
+    _ = bench_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Write the JSON report to this file instead of stdout",
+    )
+
+    replay_parser = subparsers.add_parser(
+        "replay", help="Serve a recorded .aegisreplay file to the client"
+    )
+    _ = replay_parser.add_argument(
+        "file",
+        type=str,
+        help="Replay file written by `aegis launch --record`",
+    )
+    _ = replay_parser.add_argument(
+        "--game",
+        type=int,
+        default=0,
+        help="Game of a multi-world replay to start from, counting from 0",
+    )
+    _ = replay_parser.add_argument(
+        "--round",
+        dest="start_round",
+        type=int,
+        default=None,
+        help="Round to start from, played from the nearest keyframe before it",
+    )
+
     _ = subparsers.add_parser("forge", help="Make stub.py file after config changes")
 
     init_parser = subparsers.add_parser(
@@ -143,6 +358,44 @@ def parse_args() -> Args:
                 client=args.client,
                 debug=args.debug,
                 log=args.log,
+                headless=args.headless,
+                exec_mode=ExecMode(args.exec_mode),
+                record=args.record,
+                backpressure=Backpressure(args.backpressure),
+                track_memory=args.track_memory,
+            ),
+        )
+    if args.command == "tournament":
+        return Args(
+            command="tournament",
+            tournament_args=TournamentArgs(
+                agents=args.agents,
+                world=args.world,
+                seeds=args.seeds,
+                amount=args.amount,
+                rounds=args.rounds,
+                versus=args.versus,
+                workers=args.workers,
+                output=args.output,
+            ),
+        )
+    if args.command == "bench":
+        return Args(
+            command="bench",
+            bench_args=BenchArgs(
+                agents=args.agents,
+                world=args.world,
+                amounts=args.amounts,
+                rounds=args.rounds,
+                exec_mode=ExecMode(args.exec_mode),
+                output=args.output,
+            ),
+        )
+    if args.command == "replay":
+        return Args(
+            command="replay",
+            replay_args=ReplayArgs(
+                file=args.file, game=args.game, start_round=args.start_round
             ),
         )
     if args.command == "forge":
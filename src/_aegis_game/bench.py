@@ -0,0 +1,287 @@
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import override
+
+import numpy as np
+
+from .agent import Agent
+from .args_parser import BenchArgs, LaunchArgs
+from .common import Cell, Location
+from .game import Game
+from .game_pb import GamePb
+from .logger import AGENT_LOGGER, LOGGER, setup_console_logging
+from .play import load_named_world, run_rounds
+from .sandbox.cache import CodeCache
+from .sandbox.sandbox import Sandbox
+from .server_websocket import WebSocketServer
+from .types import ExecMode
+from .world import World
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_VERSION = 2
+# Agents the sandbox overhead is measured with
+# RestrictedPython caps `range` below 1000 elements, so probe loops are nested
+PROBE_CALLS = 100 * 100
+PROBE_ROUNDS = 100
+PROBE_AGENTS = {
+    "empty": "def think() -> None:\n    pass\n",
+    "loop": (
+        "def think() -> None:\n"
+        "    for _ in range(100):\n"
+        "        for _ in range(100):\n"
+        "            pass\n"
+    ),
+    "calls": (
+        "def think() -> None:\n"
+        "    for _ in range(100):\n"
+        "        for _ in range(100):\n"
+        "            get_id()\n"
+    ),
+}
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """A single game to measure."""
+
+    agent: str
+    world: str
+    amount: int
+
+
+@dataclass
+class BenchResult:
+    """What was measured for a single game."""
+
+    agent: str
+    world: str
+    amount: int
+    rounds: int = 0
+    turns: int = 0
+    seconds: float = 0.0
+    rounds_per_sec: float = 0.0
+    turn_p50_us: float = 0.0
+    turn_p99_us: float = 0.0
+    # CPU time of the agents' own threads, a p50 well below `turn_p50_us`
+    # means the machine rather than the agent was slow
+    cpu_p50_us: float = 0.0
+    bytes_per_round: float = 0.0
+    peak_rss_mb: float | None = None
+    error: str = ""
+
+
+class _TimedGame(Game):
+    """A `Game` that records how long every turn takes."""
+
+    def __init__(
+        self,
+        code: list[Sandbox | None],
+        args: LaunchArgs,
+        world: World,
+        game_pb: GamePb,
+    ) -> None:
+        self.turn_times: list[int] = []
+        self.cpu_times: list[float] = []
+        super().__init__(code, args, world, game_pb)
+
+    @override
+    def _run_turn(self, agent: Agent) -> None:
+        start = time.perf_counter_ns()
+        super()._run_turn(agent)
+        self.turn_times.append(time.perf_counter_ns() - start)
+        # what the turn cost, as `Game` judged it
+        usage = agent.core.usage  # pyright: ignore[reportOptionalMemberAccess]
+        if usage is not None:
+            self.cpu_times.append(usage.cpu_time)
+
+
+class _CountingGamePb(GamePb):
+    """A `GamePb` that builds every event as usual but only counts its bytes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.event_bytes: int = 0
+
+    @override
+    def _add_event(self, event: bytes, *, keyframe: bool = False) -> None:
+        self.event_bytes += len(event)
+
+
+def _launch_args(args: BenchArgs, amount: int) -> LaunchArgs:
+    return LaunchArgs(
+        amount=amount,
+        world=[],
+        rounds=args.rounds,
+        agent="bench",
+        agent2=None,
+        client=False,
+        debug=False,
+        log=False,
+        exec_mode=args.exec_mode,
+    )
+
+
+def _peak_rss_mb() -> float | None:
+    """Return the peak resident memory of this process, where it's known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    mb = peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+    return round(mb, 1)
+
+
+def _play(game: _TimedGame) -> float:
+    """Run a game to the end and return how long its rounds took."""
+    start = time.perf_counter()
+    run_rounds(game)
+    return time.perf_counter() - start
+
+
+def _run_case(case: BenchCase, args: BenchArgs) -> BenchResult:
+    """Measure one game in a fresh worker process."""
+    LOGGER.setLevel(logging.WARNING)
+    AGENT_LOGGER.setLevel(logging.CRITICAL)
+    result = BenchResult(case.agent, case.world, case.amount)
+
+    try:
+        code = Sandbox.from_directory(Path.cwd() / "agents" / case.agent, CodeCache())
+        world = load_named_world(case.world)
+        world.rounds = args.rounds
+        game_pb = _CountingGamePb()
+        game_pb.make_games_header(WebSocketServer(wait_for_client=False))
+        game = _TimedGame([code, None], _launch_args(args, case.amount), world, game_pb)
+        game_pb.make_game_header(world)
+        # only count what rounds cost, the header carries the whole world
+        game_pb.event_bytes = 0
+        seconds = _play(game)
+    except Exception as e:  # noqa: BLE001
+        result.error = str(e)
+        return result
+
+    result.rounds = game.round
+    result.turns = len(game.turn_times)
+    result.seconds = round(seconds, 4)
+    if game.round:
+        result.rounds_per_sec = round(game.round / seconds, 2)
+        result.bytes_per_round = round(game_pb.event_bytes / game.round, 1)
+    if game.turn_times:
+        p50, p99 = np.percentile(game.turn_times, [50, 99]) / 1000
+        result.turn_p50_us = round(float(p50), 2)
+        result.turn_p99_us = round(float(p99), 2)
+    if game.cpu_times:
+        result.cpu_p50_us = round(float(np.median(game.cpu_times)) * 1e6, 2)
+    result.peak_rss_mb = _peak_rss_mb()
+    return result
+
+
+def _probe_turn_ns(source: str, args: BenchArgs) -> float:
+    """Return the median turn time of a single agent running `source`."""
+    cells = [Cell(x, y) for y in range(3) for x in range(3)]
+    cells[4].set_spawn_cell()
+    world = World(3, 3, 0, 100, cells, {Location(1, 1): 1})
+    world.rounds = PROBE_ROUNDS
+    game_pb = _CountingGamePb()
+    game_pb.make_games_header(WebSocketServer(wait_for_client=False))
+    code = Sandbox.from_directory_dict({"main.py": source})
+    # inline so the handoff to agent threads doesn't drown the difference
+    probe_args = replace(_launch_args(args, 1), exec_mode=ExecMode.INLINE)
+    game = _TimedGame([code, None], probe_args, world, game_pb)
+    _ = _play(game)
+    return float(np.median(game.turn_times))
+
+
+def measure_sandbox(args: BenchArgs) -> dict[str, float]:
+    """
+    Measure what the sandbox costs agents.
+
+    Returns:
+        The cost of a turn that does nothing, and the cost of one API call
+        from agent code on top of the guarded loop making it.
+
+    """
+    turn_ns = {
+        name: _probe_turn_ns(source, args) for name, source in PROBE_AGENTS.items()
+    }
+    return {
+        "turn_overhead_us": round(turn_ns["empty"] / 1000, 2),
+        "api_call_ns": round((turn_ns["calls"] - turn_ns["loop"]) / PROBE_CALLS, 1),
+    }
+
+
+def make_cases(args: BenchArgs) -> list[BenchCase]:
+    """Build the agents x worlds x amounts matrix of games to measure."""
+    agents = args.agents or sorted(
+        path.parent.name for path in (Path.cwd() / "agents").glob("*/main.py")
+    )
+    worlds = args.world or sorted(
+        path.stem for path in (Path.cwd() / "worlds").glob("*.world")
+    )
+    return [
+        BenchCase(agent, world, amount)
+        for agent in agents
+        for world in worlds
+        for amount in args.amounts
+    ]
+
+
+def run_bench(args: BenchArgs) -> None:
+    setup_console_logging()
+    if args.output is None:
+        # the report goes to stdout
+        LOGGER.setLevel(logging.WARNING)
+
+    cases = make_cases(args)
+    if not cases:
+        error = "No games to measure, no agents or worlds were found"
+        raise ValueError(error)
+
+    LOGGER.info("Measuring sandbox overhead")
+    level = LOGGER.level
+    LOGGER.setLevel(logging.WARNING)
+    AGENT_LOGGER.setLevel(logging.CRITICAL)
+    sandbox = measure_sandbox(args)
+    LOGGER.setLevel(level)
+
+    results: list[BenchResult] = []
+    # one process per game so each peak RSS is the game's own, games run one
+    # at a time so they don't compete for CPU
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as executor:
+        for done, case in enumerate(cases, start=1):
+            result = executor.submit(_run_case, case, args).result()
+            results.append(result)
+            LOGGER.info(
+                f"[{done}/{len(cases)}] {case.agent} x{case.amount} on {case.world}: "
+                + (result.error or f"{result.rounds_per_sec} rounds/s")
+            )
+
+    report = {
+        "version": BENCH_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "exec_mode": args.exec_mode.value,
+        "rounds": args.rounds,
+        "sandbox": sandbox,
+        "results": [asdict(result) for result in results],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        _ = Path(args.output).write_text(text + "\n", encoding="utf-8")
+        LOGGER.info(f"Wrote results to {args.output}")
@@ -2,12 +2,15 @@ import sys
 import traceback
 
 from .args_parser import parse_args
+from .bench import run_bench
 from .cli_scripts.client_installer import main as install_client
 from .cli_scripts.init_scaffold import init_scaffold
 from .play import run
+from .replay import run_replay
+from .tournament import run_tournament
 
 
-def main() -> None:
+def main() -> None:  # noqa: C901, PLR0912, PLR0915
     args = parse_args()
 
     if args.command == "run":
@@ -20,6 +23,36 @@ def main() -> None:
             traceback.print_exc()
             sys.exit(1)
 
+    elif args.command == "tournament":
+        try:
+            if args.tournament_args is None:
+                sys.exit(1)
+            run_tournament(args.tournament_args)
+        except Exception as e:  # noqa: BLE001
+            print(f"ERROR: {e}", file=sys.stderr)
+            traceback.print_exc()
+            sys.exit(1)
+
+    elif args.command == "bench":
+        try:
+            if args.bench_args is None:
+                sys.exit(1)
+            run_bench(args.bench_args)
+        except Exception as e:  # noqa: BLE001
+            print(f"ERROR: {e}", file=sys.stderr)
+            traceback.print_exc()
+            sys.exit(1)
+
+    elif args.command == "replay":
+        try:
+            if args.replay_args is None:
+                sys.exit(1)
+            run_replay(args.replay_args)
+        except Exception as e:  # noqa: BLE001
+            print(f"ERROR: {e}", file=sys.stderr)
+            traceback.print_exc()
+            sys.exit(1)
+
     elif args.command == "forge":
         from .cli_scripts.build_public_api import main as build_api  # noqa: PLC0415
 
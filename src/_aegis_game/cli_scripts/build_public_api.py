@@ -238,7 +238,9 @@ class StubGenerator:
 
     def _build_header(self, stubs: list[FunctionStub]) -> str:
         """Generate the import/header section for the stub file."""
-        needs_numpy = any("predict" in stub.name for stub in stubs)
+        needs_numpy = any(
+            "predict" in stub.name or "np." in stub.signature for stub in stubs
+        )
         needs_messages = any("message" in stub.name for stub in stubs)
 
         imports: list[str] = []
@@ -253,6 +255,8 @@ class StubGenerator:
 
         import_lines: list[str] = []
         import_lines.extend(imports)
+        if imports:
+            import_lines.append("")
         import_lines.append("from . import (")
         import_lines.extend(f"    {name}," for name in relative_imports)
         import_lines.append(")\n\n")
@@ -12,8 +12,19 @@ class Constants:
     # Game constants
     DEFAULT_MAX_ROUNDS: int = 1000
     MESSAGE_HISTORY_LIMIT: int = 5
+    # seconds of CPU time per turn, turns slowed down by a busy machine get
+    # up to `TURN_WALL_TIME_FACTOR` times as long on the wall clock
     MAX_TURN_TIME_LIMIT: float = 1.0
+    TURN_WALL_TIME_FACTOR: float = 3.0
+    # bytes allocated at a turn's peak, only checked with `--track-memory`
+    MAX_TURN_MEMORY: int = 256 << 20
+    MAX_TURN_API_CALLS: int = 100_000
+    INIT_TIME_LIMIT: float = 10.0
+    TURN_INTERRUPT_GRACE: float = 0.5
+    TURN_INTERRUPT_POLL: float = 0.001
     INITIAL_TEAM_LUMENS: int = 100
+    AGENT_POOL_WORKERS: int = 4
+    KEYFRAME_INTERVAL: int = 50
 
     # Points constants
     SURVIVOR_SAVE_ALIVE_SCORE: int = 100
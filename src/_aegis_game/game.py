@@ -1,5 +1,7 @@
+import itertools
 import random
 import time
+import tracemalloc
 from collections.abc import Callable
 from typing import cast
 
@@ -8,7 +10,7 @@ from numpy.typing import NDArray
 
 from _aegis_game.decorator import requires
 
-from .aegis_config import has_feature
+from .aegis_config import Features, load_features
 from .agent import Agent
 from .agent_controller import AgentController
 from .agent_predictions.prediction_handler import PredictionHandler
@@ -18,13 +20,24 @@ from .common import Cell, CellInfo, Direction, Location
 from .common.objects import Rubble, Survivor
 from .constants import Constants
 from .game_pb import GamePb
+from .game_snapshot import (
+    SNAPSHOT_VERSION,
+    AgentSnapshot,
+    GameSnapshot,
+    cell_snapshot,
+    dumps,
+    layer_from_state,
+    loads,
+)
 from .id_gen import IDGenerator
-from .logger import LOGGER
+from .logger import AGENT_LOGGER, LOGGER
+from .sandbox.core import LumenPool, SharedModule, load_shared
 from .sandbox.sandbox import Sandbox
 from .team import Team
 from .team_info import TeamInfo
-from .types import GameOverReason, MethodDict
+from .types import CellType, ExecMode, GameOverReason, MethodDict
 from .world import World
+from .world_grid import LayerKind
 
 
 class Game:
@@ -35,26 +48,59 @@ class Game:
         world: World,
         game_pb: GamePb,
     ) -> None:
-        random.seed(world.seed)
+        # owned by the game so agents and other games can't shift its draws
+        self.random: random.Random = random.Random(world.seed)
+        self.np_random: np.random.Generator = np.random.default_rng(world.seed)
         self.code: list[Sandbox | None] = code
         self.args: LaunchArgs = args
         self.running: bool = True
         self.reason: GameOverReason | None = None
         self.world: World = world
         self.round: int = 0
-        self.id_gen: IDGenerator = IDGenerator()
+        self.id_gen: IDGenerator = IDGenerator(self.random)
         self.team_info: TeamInfo = TeamInfo()
         self.team_info.add_lumens(Team.GOOBS, Constants.INITIAL_TEAM_LUMENS)
         self.team_info.add_lumens(Team.VOIDSEERS, Constants.INITIAL_TEAM_LUMENS)
         self.game_pb: GamePb = game_pb
+        if args.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.features: Features = load_features()
         # key is location, value is team -> num of agents queuing to remove the layer this round
         self._queued_layers_to_remove: dict[Location, dict[Team, int]] = {}
         self._drone_scans: dict[Location, dict[Team, int]] = {}
         self._pending_drone_scans: dict[Location, dict[Team, int]] = {}
+        # Cell types never change, survivors only disappear in `remove_layer`
+        grid = world.grid
+        self._spawns: list[Location] = grid.locations_of_type(CellType.SPAWN_CELL)
+        self._spawn_set: frozenset[Location] = frozenset(self._spawns)
+        self._charging_cells: list[Location] = grid.locations_of_type(
+            CellType.CHARGING_CELL
+        )
+        # dict keeps survivor locations in cell order
+        self._survivor_locs: dict[Location, None] = dict.fromkeys(
+            grid.survivor_locations()
+        )
         self._prediction_handler: PredictionHandler | None = (
-            PredictionHandler(args) if has_feature("ALLOW_AGENT_PREDICTIONS") else None
+            PredictionHandler(args, self.np_random)
+            if self.features.allow_agent_predictions
+            else None
+        )
+        # shared by every agent's turns when running in pool mode
+        self.executor: LumenPool | None = (
+            LumenPool(
+                max_workers=Constants.AGENT_POOL_WORKERS,
+                thread_name_prefix="lumen",
+            )
+            if args.exec_mode == ExecMode.POOL
+            else None
         )
         self.agents: dict[int, Agent] = {}
+        # launched agents whose code hasn't been initialized yet
+        self._cold_agents: list[Agent] = []
+        # each team's shared.py, run when its first agents warm up
+        self._shared: dict[Team, SharedModule | None] = {}
+        # teams whose shared.py ran over the init limit, their agents are killed
+        self._failed_teams: set[Team] = set()
         self.team_agents: dict[Team, str] = {}
         if self.args.agent is not None:
             self.team_agents[Team.GOOBS] = self.args.agent
@@ -63,11 +109,11 @@ class Game:
         self._init_spawn()
 
     def _init_spawn(self) -> None:
-        if has_feature("ALLOW_AGENT_TYPES"):
+        if self.features.allow_agent_types:
             # if agent types enabled, spawn one commander at a random spawn location for each team (team needs to spawn rest of agents)
 
             spawns = self.get_spawns()
-            spawn_loc = random.choice(spawns)
+            spawn_loc = self.random.choice(spawns)
 
             self._spawn_agents_at(spawn_loc, 1)
 
@@ -108,7 +154,7 @@ class Game:
 
             all_spawns = self.get_spawns()
             while remaining > 0:
-                loc = random.choice(all_spawns)
+                loc = self.random.choice(all_spawns)
                 self._spawn_agents_at(loc, 1)
                 remaining -= 1
 
@@ -121,17 +167,35 @@ class Game:
                 self.spawn_agent(loc, Team.VOIDSEERS, AgentType.COMMANDER)
 
     def _run_turn(self, agent: Agent) -> None:
+        limit = Constants.MAX_TURN_TIME_LIMIT
         start = time.perf_counter()
-        agent.turn()
-        end = time.perf_counter()
-        duration = end - start
-        if duration >= Constants.MAX_TURN_TIME_LIMIT:
-            LOGGER.warning(
-                f"{agent.id}'s turn took {duration:.2f}s (over {Constants.MAX_TURN_TIME_LIMIT}s limit)"
+        # Thread and pool modes interrupt the turn once it uses up its CPU
+        # time, inline turns can only be checked after they return
+        finished = agent.turn(limit)
+        duration = time.perf_counter() - start
+        usage = agent.core.usage  # pyright: ignore[reportOptionalMemberAccess]
+        if usage is None:
+            LOGGER.warning(f"{agent.id}'s turn didn't stop after {duration:.2f}s")
+            self.kill_agent(agent.id)
+            return
+
+        reason = usage.over_budget()
+        if not finished or reason is not None:
+            reason = reason or (
+                f"was interrupted after {duration:.2f}s "
+                f"with {usage.cpu_time:.2f}s of CPU time"
             )
+            LOGGER.warning(f"{agent.id}'s turn {reason}")
             self.kill_agent(agent.id)
+        elif duration >= limit:
+            # the agent stayed within its CPU time, something else slowed it down
+            LOGGER.warning(
+                f"{agent.id}'s turn took {duration:.2f}s but only "
+                f"{usage.cpu_time:.2f}s of CPU time, the machine may be overloaded"
+            )
 
     def run_round(self) -> None:
+        self.warm_up()
         self.tick_drone_scans()
         self.round += 1
         self.game_pb.start_round(self.round)
@@ -140,13 +204,238 @@ class Game:
         self.for_each_agent(self._run_turn)
         self.rotate_message_buffers()
         self.activate_pending_drone_scans()
-        self.game_pb.send_drone_scan_update(self._drone_scans)
         self.serialize_team_info()
         self.grim_reaper()
         self.serialize_drone_scans()
         self.game_pb.end_round()
+        if (
+            self.round % Constants.KEYFRAME_INTERVAL == 0
+            and self.game_pb.wants_keyframe()
+        ):
+            self.game_pb.make_keyframe(
+                self.world,
+                list(self.agents.values()),
+                self.team_info,
+                self._drone_scans,
+            )
         self.check_game_over()
 
+    def warm_up(self) -> None:
+        """
+        Initialize the code of every agent that hasn't had a turn yet.
+
+        Imports and other module-level setup then don't count towards the
+        agents' first turns. Each agent has `Constants.INIT_TIME_LIMIT` of CPU
+        time of its own instead and is killed if it runs over, so agents
+        initializing alongside a slow one keep their whole budget. In thread
+        mode agents initialize in parallel, in pool mode as many at a time as
+        there are workers, inline one at a time. A team's `shared.py` runs
+        first, with the same limit, and if it runs over every agent of the
+        team is killed.
+        """
+        agents = [
+            agent for agent in self._cold_agents if self.agents.get(agent.id) is agent
+        ]
+        self._cold_agents.clear()
+        if not agents:
+            return
+
+        limit = Constants.INIT_TIME_LIMIT
+        start = time.perf_counter()
+        agents = self._warm_up_shared(agents)
+        if self.executor is not None:
+            # an initialization can only be timed once a worker picks it up
+            batch_size = len(self.executor.workers)
+        elif self.args.exec_mode == ExecMode.THREAD:
+            batch_size = len(agents)
+        else:
+            batch_size = 1
+        slow: list[Agent] = []
+        for batch in itertools.batched(agents, max(1, batch_size)):
+            futures = [agent.start_warm_up(self._shared[agent.team]) for agent in batch]
+            slow.extend(
+                agent
+                for agent, future in zip(batch, futures, strict=True)
+                if not agent.finish_warm_up(future, limit)
+            )
+
+        for agent in slow:
+            LOGGER.warning(f"{agent.id}'s initialization took over the {limit}s limit")
+            self.kill_agent(agent.id)
+        if self.round == 0:
+            LOGGER.info(
+                f"Initialized {len(agents)} agents in {time.perf_counter() - start:.2f}s"
+            )
+
+    def _warm_up_shared(self, agents: list[Agent]) -> list[Agent]:
+        """Run the `shared.py` of the agents' teams, returning the agents to keep."""
+        for team in dict.fromkeys(agent.team for agent in agents):
+            if team not in self._shared:
+                self._shared[team] = self._load_shared(team)
+
+        for agent in agents:
+            if agent.team in self._failed_teams:
+                self.kill_agent(agent.id)
+        return [agent for agent in agents if agent.team not in self._failed_teams]
+
+    def snapshot(self) -> bytes:
+        """
+        Capture the game between rounds as compact serialized state.
+
+        This covers the world, agents, team info, drone scans, message
+        buffers, predictions, ids and the random state. It doesn't cover the
+        state of the agents' own code, which starts over on `restore`.
+
+        Returns:
+            The serialized state, for `restore`.
+
+        """
+        grid = self.world.grid
+        occupied = (grid.top_layer != LayerKind.NONE) | (grid.agent_count > 0)
+        cells = [
+            cell_snapshot(index, self.world.peek_cell(index))
+            for index in np.flatnonzero(occupied).tolist()
+        ]
+        agents = [
+            AgentSnapshot(
+                agent.id,
+                agent.team.value,
+                agent.type.name,
+                agent.location.x,
+                agent.location.y,
+                agent.energy_level,
+                agent.action_cooldown,
+                agent.steps_taken,
+                np.packbits(agent.has_visited).tobytes(),
+                agent.message_buffer.snapshot(),
+            )
+            for agent in self.agents.values()
+        ]
+        return dumps(
+            GameSnapshot(
+                SNAPSHOT_VERSION,
+                self.world.width,
+                self.world.height,
+                self.round,
+                self.running,
+                None if self.reason is None else self.reason.name,
+                cells,
+                agents,
+                self.team_info.snapshot(),
+                self._drone_scan_states(self._drone_scans),
+                self._drone_scan_states(self._pending_drone_scans),
+                list(self.id_gen.available_ids),
+                self.random.getstate(),
+                self.np_random.bit_generator.state,
+                None
+                if self._prediction_handler is None
+                else self._prediction_handler.snapshot(),
+            )
+        )
+
+    def restore(self, data: bytes) -> None:
+        """
+        Continue this game from a snapshot.
+
+        The game must be new and on the same world the snapshot was taken on.
+        Its agents are replaced by the ones in the snapshot, which start their
+        code over.
+
+        Args:
+            data: State returned by `snapshot`.
+
+        Raises:
+            ValueError: If the data isn't a snapshot of a game on this world.
+
+        """
+        state = loads(data)
+        if (state.width, state.height) != (self.world.width, self.world.height):
+            error = (
+                f"Snapshot is of a {state.width}x{state.height} world, "
+                f"not {self.world.width}x{self.world.height}"
+            )
+            raise ValueError(error)
+
+        for agent in self.agents.values():
+            agent.kill()
+        self.agents.clear()
+        self._cold_agents.clear()
+        self._restore_cells(state)
+
+        self.round = state.round
+        self.running = state.running
+        self.reason = None if state.reason is None else GameOverReason[state.reason]
+        self.team_info.restore(state.team_info)
+        self._drone_scans = self._drone_scans_from_states(state.drone_scans)
+        self._pending_drone_scans = self._drone_scans_from_states(
+            state.pending_drone_scans
+        )
+        self._queued_layers_to_remove.clear()
+        self._survivor_locs = dict.fromkeys(self.world.grid.survivor_locations())
+        self.id_gen.available_ids = list(state.available_ids)
+        self.random.setstate(state.random_state)
+        self.np_random.bit_generator.state = state.np_random_state
+        if self._prediction_handler is not None and state.predictions is not None:
+            self._prediction_handler.restore(state.predictions)
+
+        # drop the events of the agents spawned when this game was created
+        self.game_pb.clear_round()
+        self.game_pb.start_round(self.round)
+        size = self.world.width * self.world.height
+        for agent_state in state.agents:
+            agent = Agent(
+                self,
+                agent_state.id,
+                Location(agent_state.x, agent_state.y),
+                Team(agent_state.team),
+                agent_state.energy_level,
+                AgentType[agent_state.agent_type],
+            )
+            agent.action_cooldown = agent_state.action_cooldown
+            agent.steps_taken = agent_state.steps_taken
+            visited = np.frombuffer(agent_state.has_visited, dtype=np.uint8)
+            agent.has_visited = np.unpackbits(visited, count=size).astype(np.bool_)
+            agent.message_buffer.restore(agent_state.message_buffer)
+            self._launch_agent(agent)
+            self.agents[agent.id] = agent
+            self.game_pb.add_spawn(agent.id, agent.team, agent.location)
+
+    def _restore_cells(self, state: GameSnapshot) -> None:
+        """Set the layers and agents of every cell that has either now or then."""
+        grid = self.world.grid
+        occupied = (grid.top_layer != LayerKind.NONE) | (grid.agent_count > 0)
+        cells = {cell.index: cell for cell in state.cells}
+        for index in sorted(set(np.flatnonzero(occupied).tolist()) | cells.keys()):
+            cell = self.world.cells[index]
+            cell_state = cells.get(index)
+            if cell_state is None:
+                cell.layers = []
+                cell.agents = []
+            else:
+                cell.layers = [layer_from_state(layer) for layer in cell_state.layers]
+                cell.agents = list(cell_state.agents)
+            grid.update_layers(cell)
+            grid.agent_count[cell.location.y, cell.location.x] = len(cell.agents)
+
+    @staticmethod
+    def _drone_scan_states(
+        drone_scans: dict[Location, dict[Team, int]],
+    ) -> list[tuple[int, int, int, int]]:
+        return [
+            (loc.x, loc.y, team.value, duration)
+            for loc, teams in drone_scans.items()
+            for team, duration in teams.items()
+        ]
+
+    @staticmethod
+    def _drone_scans_from_states(
+        states: list[tuple[int, int, int, int]],
+    ) -> dict[Location, dict[Team, int]]:
+        drone_scans: dict[Location, dict[Team, int]] = {}
+        for x, y, team, duration in states:
+            drone_scans.setdefault(Location(x, y), {})[Team(team)] = duration
+        return drone_scans
+
     def rotate_message_buffers(self) -> None:
         """
         Advance all agents' message buffers to the next round.
@@ -176,13 +465,13 @@ class Game:
     def grim_reaper(self) -> None:
         dead_agents: list[Agent] = []
 
+        grid = self.world.grid
         for agent in self.agents.values():
             died = False
-            cell = self.get_cell_at(agent.location)
             if agent.energy_level <= 0:
                 LOGGER.info("Agent %s ran out of energy and died.\n", agent.id)
                 died = True
-            elif cell and cell.is_killer_cell():
+            elif grid.is_type(agent.location, CellType.KILLER_CELL):
                 LOGGER.info("Agent %s ran into killer cell and died.\n", agent.id)
                 died = True
 
@@ -197,6 +486,8 @@ class Game:
     def stop(self) -> None:
         self.running = False
         self.for_each_agent(lambda agent: self.kill_agent(agent.id))
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
 
     def end_if_no_units(self, _team: Team) -> None:
         if self.reason is not None:
@@ -230,18 +521,56 @@ class Game:
         agent_id = self.id_gen.next_id() if agent_id is None else agent_id
         energy = int(self.world.start_energy * agent_type.energy_multiplier)
         agent = Agent(self, agent_id, loc, team, energy, agent_type)
-        ac = AgentController(self, agent)
-        agent.launch(self.code[team.value], self.methods(ac), debug=self.args.debug)
+        self._launch_agent(agent)
         self.add_agent(agent, loc)
         self.team_info.add_units(agent.team, 1)
         self.game_pb.add_spawn(agent.id, agent.team, agent.location)
 
+    def _launch_agent(self, agent: Agent) -> None:
+        ac = AgentController(self, agent)
+        agent.launch(
+            self.code[agent.team.value],
+            self.methods(ac),
+            debug=self.args.debug,
+            mode=self.args.exec_mode,
+            executor=self.executor,
+            rng=random.Random(f"{self.world.seed}:{agent.id}"),
+        )
+        self._cold_agents.append(agent)
+
+    def _load_shared(self, team: Team) -> SharedModule | None:
+        code = self.code[team.value]
+        if code is None:
+            return None
+
+        errors: list[str] = []
+        try:
+            shared = load_shared(
+                code,
+                errors.append,
+                mode=self.args.exec_mode,
+                executor=self.executor,
+                timeout=Constants.INIT_TIME_LIMIT,
+                rng=random.Random(f"{self.world.seed}:{team.name}"),
+            )
+        except TimeoutError as e:
+            LOGGER.warning(f"[{team.name}] {e}, killing the team's agents")
+            self._failed_teams.add(team)
+            shared = None
+        for error in errors:
+            if self.args.debug:
+                AGENT_LOGGER.error(f"[{team.name}] shared.py failed:\n{error}")
+            else:
+                AGENT_LOGGER.warning(
+                    f"[{team.name}] [ERROR] shared.py failed. (Turn on debug to see error message)"
+                )
+        return shared
+
     def add_agent(self, agent: Agent, loc: Location) -> None:
         if agent not in self.agents:
             self.agents[agent.id] = agent
 
-            cell = self.get_cell_at(loc)
-            cell.agents.append(agent.id)
+            self.world.add_agent_at(loc, agent.id)
             LOGGER.info("Added agent %s", agent.id)
 
     def get_agent(self, agent_id: int) -> Agent:
@@ -298,8 +627,9 @@ class Game:
             self.team_info.add_score(team, Constants.LUMENS_PER_SAVE)
 
     def remove_layer(self, loc: Location) -> None:
-        cell = self.get_cell_at(loc)
-        _ = cell.remove_top_layer()
+        _ = self.world.remove_top_layer(loc)
+        if self.world.grid.survivors[loc.y, loc.x] == 0:
+            _ = self._survivor_locs.pop(loc, None)
         self.game_pb.add_removed_layer(loc)
 
     def mark_surrounding_cells_visited(self, agent: Agent, loc: Location) -> None:
@@ -315,13 +645,13 @@ class Game:
             agent.has_visited[index] = True
 
     def add_agent_to_loc(self, agent_id: int, loc: Location) -> None:
-        self.get_cell_at(loc).agents.append(agent_id)
+        self.world.add_agent_at(loc, agent_id)
         agent = self.get_agent(agent_id)
-        if has_feature("HIDDEN_MOVE_COSTS"):
+        if self.features.hidden_move_costs:
             self.mark_surrounding_cells_visited(agent, loc)
 
     def remove_agent_from_loc(self, agent_id: int, loc: Location) -> None:
-        self.get_cell_at(loc).agents.remove(agent_id)
+        self.world.remove_agent_at(loc, agent_id)
 
     def move_agent(self, agent_id: int, start_loc: Location, end_loc: Location) -> None:
         self.remove_agent_from_loc(agent_id, start_loc)
@@ -358,10 +688,8 @@ class Game:
                     del self._drone_scans[loc][team]
 
     def serialize_drone_scans(self) -> None:
-        """Add all active drone scans to the protobuf data for this round."""
-        for loc, teams in self._drone_scans.items():
-            for team, duration in teams.items():
-                self.game_pb.add_drone_scan(loc, team, duration)
+        """Add the drone scans that started or expired to this round's data."""
+        self.game_pb.update_drone_scans(self._drone_scans)
 
     def save(self, survivor: Survivor, agent: Agent) -> None:
         if (
@@ -379,7 +707,7 @@ class Game:
             f"Saving survivor {survivor.id} at {agent.location} for team {agent.team.name} on round {self.round}"
         )
         if (
-            has_feature("ALLOW_AGENT_PREDICTIONS")
+            self.features.allow_agent_predictions
             and self._prediction_handler is not None
         ):
             LOGGER.info(
@@ -402,7 +730,7 @@ class Game:
 
     def predict(self, surv_id: int, label: np.int32, agent: Agent) -> None:
         if (
-            not has_feature("ALLOW_AGENT_PREDICTIONS")
+            not self.features.allow_agent_predictions
             or self._prediction_handler is None
         ):
             return
@@ -432,8 +760,7 @@ class Game:
         return 0 <= loc.x < self.world.width and 0 <= loc.y < self.world.height
 
     def get_cell_at(self, loc: Location) -> Cell:
-        index = loc.x + loc.y * self.world.width
-        return self.world.cells[index]
+        return self.world.get_cell_at(loc)
 
     def get_cell_info_at(self, location: Location) -> CellInfo:
         cell = self.get_cell_at(location)
@@ -447,24 +774,25 @@ class Game:
 
     def get_survs(self) -> list[Location]:
         """Return a list of survivor locations."""
-        return [
-            cell.location for cell in self.world.cells if cell.number_of_survivors() > 0
-        ]
+        return list(self._survivor_locs)
 
     @requires("ALLOW_AGENT_TYPES")
     def get_spawns(self) -> list[Location]:
         """Return a list of spawn locations."""
-        return [cell.location for cell in self.world.cells if cell.is_spawn()]
+        return list(self._spawns)
+
+    def is_spawn(self, loc: Location) -> bool:
+        return loc in self._spawn_set
 
     def get_charging_cells(self) -> list[Location]:
         """Return a list of charging locations."""
-        return [cell.location for cell in self.world.cells if cell.is_charging_cell()]
+        return list(self._charging_cells)
 
     def get_prediction_info_for_agent(
         self, team: Team
     ) -> list[tuple[int, NDArray[np.uint8], NDArray[np.int32]]]:
         if (
-            not has_feature("ALLOW_AGENT_PREDICTIONS")
+            not self.features.allow_agent_predictions
             or self._prediction_handler is None
         ):
             return []
@@ -474,6 +802,7 @@ class Game:
         return {
             "AgentType": AgentType,
             "Direction": Direction,
+            "LayerKind": LayerKind,
             "Location": Location,
             "Rubble": Rubble,
             "Survivor": Survivor,
@@ -485,6 +814,9 @@ class Game:
             "get_energy_level": ac.get_energy_level,
             "get_lumens": ac.get_lumens,
             "get_cell_info_at": ac.get_cell_info_at,
+            "get_cell_infos": ac.get_cell_infos,
+            "get_region": ac.get_region,
+            "get_region_arrays": ac.get_region_arrays,
             "send_message": ac.send_message,
             "read_messages": ac.read_messages,
             "drone_scan": ac.drone_scan,
@@ -1,9 +1,11 @@
+from typing import override
+
 from .agent import Agent
 from .common import Location
+from .replay import ReplayWriter
 from .schemas.event_pb2 import Event
 from .schemas.game_pb2 import (
     DroneScan,
-    DroneScanUpdate,
     GameFooter,
     GameHeader,
     GamesFooter,
@@ -23,15 +25,28 @@ from .world_pb import serialize_world
 
 
 class GamePb:
-    def __init__(self) -> None:
+    def __init__(self, replay: ReplayWriter | None = None) -> None:
         self.round: int = 0
         self.team_info: list[PbTeamInfo] = []
         self.turns: list[Turn] = []
         self.spawns: list[Spawn] = []
         self.removed_layers: list[PbLocation] = []
         self.dead_ids: list[int] = []
-        self.drone_scans: list[DroneScan] = []
+        self.drone_scans_started: list[DroneScan] = []
+        self.drone_scans_expired: list[DroneScan] = []
+        # what the client last saw, so rounds only carry what changed
+        self._agent_states: dict[int, tuple[int, int, int, int]] = {}
+        self._drone_scans_sent: dict[tuple[Location, Team], int] = {}
         self.ws_server: WebSocketServer | None = None
+        self.replay: ReplayWriter | None = replay
+
+    def _add_event(self, event: bytes, *, keyframe: bool = False) -> None:
+        if self.ws_server is None:
+            error = "Server should have started."
+            raise ValueError(error)
+        self.ws_server.add_event(event, keyframe=keyframe)
+        if self.replay is not None:
+            self.replay.add_event(event, keyframe=keyframe)
 
     def make_games_header(self, ws_server: WebSocketServer) -> None:
         self.ws_server = ws_server
@@ -41,7 +56,7 @@ class GamePb:
         event.games_header.CopyFrom(games_header)
 
         binary_string = event.SerializeToString()
-        self.ws_server.add_event(binary_string)
+        self._add_event(binary_string)
 
     def make_game_header(self, world: World) -> None:
         if self.ws_server is None:
@@ -56,43 +71,112 @@ class GamePb:
         if self.spawns:
             game_header.spawns.extend(self.spawns)
 
+        self._agent_states.clear()
+        self._drone_scans_sent.clear()
+
         event = Event()
         event.game_header.CopyFrom(game_header)
 
         binary_string = event.SerializeToString()
-        self.ws_server.add_event(binary_string)
+        if self.replay is not None:
+            self.replay.start_game()
+        self._add_event(binary_string, keyframe=True)
         # clear so it doesn't keep ids for agent turn spawns
         self.spawns.clear()
 
-    def start_round(self, game_round: int) -> None:
-        self.round = game_round
-
-    def send_drone_scan_update(
-        self, drone_scans: dict[Location, dict[Team, int]]
+    def wants_keyframe(self) -> bool:
+        """
+        Check whether a keyframe made now would be used.
+
+        Keyframes are recorded to replays and sent to clients that connect or
+        fall behind. With no replay and no client, a client connecting later
+        catches up from every event since the game header instead.
+        """
+        if self.replay is not None:
+            return True
+        return self.ws_server is not None and self.ws_server.has_clients()
+
+    def make_keyframe(
+        self,
+        world: World,
+        agents: list[Agent],
+        team_info: TeamInfo,
+        drone_scans: dict[Location, dict[Team, int]],
     ) -> None:
-        """Send drone scan data to the client."""
+        """
+        Snapshot the game at the end of the current round for late clients.
+
+        The keyframe is a `GameHeader` of the current world, agents and team
+        info, so a client connecting later only needs it and the events after
+        it instead of every event since the game started. It is also recorded
+        for replays to be played from.
+        """
         if self.ws_server is None:
             error = "Server should have started."
             raise ValueError(error)
 
-        pb_drone_update = DroneScanUpdate()
+        game_header = GameHeader()
+        game_header.world.CopyFrom(serialize_world(world))
+        game_header.rounds = world.rounds
+        game_header.start_round = self.round
+
+        for agent in agents:
+            pb_spawn = game_header.spawns.add()
+            pb_spawn.agentId = agent.id
+            pb_spawn.loc.x = agent.location.x
+            pb_spawn.loc.y = agent.location.y
+            pb_spawn.team = self.team_to_schema(agent.team)
+
+            pb_agent = game_header.agents.add()
+            pb_agent.agentId = agent.id
+            pb_agent.energy_level = agent.energy_level
+            pb_agent.steps_taken = agent.steps_taken
+            pb_agent.loc.CopyFrom(pb_spawn.loc)
+
+        for team in Team:
+            pb_team_info = game_header.team_info.add()
+            self._fill_team_info(pb_team_info, team, team_info)
 
         for loc, teams in drone_scans.items():
             for team, duration in teams.items():
-                drone_scan = DroneScan()
-                drone_scan.location.x = loc.x
-                drone_scan.location.y = loc.y
-                drone_scan.team = (
-                    PbTeam.GOOBS if team == Team.GOOBS else PbTeam.VOIDSEERS
+                self._fill_drone_scan(
+                    game_header.drone_scans.add(), loc, team, duration
                 )
-                drone_scan.duration = duration
-                pb_drone_update.drone_scans.append(drone_scan)
 
         event = Event()
-        event.drone_scan_update.CopyFrom(pb_drone_update)
+        event.game_header.CopyFrom(game_header)
 
         binary_string = event.SerializeToString()
-        self.ws_server.add_event(binary_string)
+        self.ws_server.set_keyframe(binary_string)
+        if self.replay is not None:
+            self.replay.add_keyframe(binary_string)
+
+    def start_round(self, game_round: int) -> None:
+        self.round = game_round
+
+    def update_drone_scans(self, drone_scans: dict[Location, dict[Team, int]]) -> None:
+        """
+        Add the drone scans that started or expired since the last round.
+
+        A scan whose duration went up was restarted and is sent again. Expired
+        scans are sent with a duration of 0.
+        """
+        current = {
+            (loc, team): duration
+            for loc, teams in drone_scans.items()
+            for team, duration in teams.items()
+        }
+        for (loc, team), duration in current.items():
+            previous = self._drone_scans_sent.get((loc, team))
+            if previous is None or duration >= previous:
+                pb_drone_scan = DroneScan()
+                self._fill_drone_scan(pb_drone_scan, loc, team, duration)
+                self.drone_scans_started.append(pb_drone_scan)
+        for loc, team in self._drone_scans_sent.keys() - current.keys():
+            pb_drone_scan = DroneScan()
+            self._fill_drone_scan(pb_drone_scan, loc, team, 0)
+            self.drone_scans_expired.append(pb_drone_scan)
+        self._drone_scans_sent = current
 
     def end_round(self) -> None:
         if self.ws_server is None:
@@ -104,16 +188,30 @@ class GamePb:
         pb_round.team_info.extend(self.team_info)
         pb_round.layers_removed.extend(self.removed_layers)
         pb_round.dead_ids.extend(self.dead_ids)
-        pb_round.drone_scans.extend(self.drone_scans)
+        pb_round.drone_scans_started.extend(self.drone_scans_started)
+        pb_round.drone_scans_expired.extend(self.drone_scans_expired)
 
         event = Event()
         event.round.CopyFrom(pb_round)
 
         binary_string = event.SerializeToString()
-        self.ws_server.add_event(binary_string)
+        self._add_event(binary_string)
+        if self.replay is not None:
+            self.replay.end_round(self.round)
         self.clear_round()
 
     def end_turn(self, agent: Agent) -> None:
+        state = (
+            agent.energy_level,
+            agent.steps_taken,
+            agent.location.x,
+            agent.location.y,
+        )
+        if not self.spawns and self._agent_states.get(agent.id) == state:
+            self.clear_turn()
+            return
+        self._agent_states[agent.id] = state
+
         pb_turn = Turn()
         pb_turn.agentId = agent.id
         pb_turn.energy_level = agent.energy_level
@@ -140,7 +238,7 @@ class GamePb:
         event.game_footer.CopyFrom(game_footer)
 
         binary_string = event.SerializeToString()
-        self.ws_server.add_event(binary_string)
+        self._add_event(binary_string)
 
     def make_games_footer(self) -> None:
         if self.ws_server is None:
@@ -153,10 +251,16 @@ class GamePb:
         event.games_footer.CopyFrom(games_footer)
 
         binary_string = event.SerializeToString()
-        self.ws_server.add_event(binary_string)
+        self._add_event(binary_string)
 
     def add_team_info(self, team: Team, team_info: TeamInfo) -> None:
         pb_team_info = PbTeamInfo()
+        self._fill_team_info(pb_team_info, team, team_info)
+        self.team_info.append(pb_team_info)
+
+    def _fill_team_info(
+        self, pb_team_info: PbTeamInfo, team: Team, team_info: TeamInfo
+    ) -> None:
         pb_team_info.saved_alive = team_info.get_saved_alive(team)
         pb_team_info.saved_dead = team_info.get_saved_dead(team)
         pb_team_info.saved = team_info.get_saved(team)
@@ -166,7 +270,6 @@ class GamePb:
         pb_team_info.score = team_info.get_score(team)
         pb_team_info.units = team_info.get_units(team)
         pb_team_info.team = self.team_to_schema(team)
-        self.team_info.append(pb_team_info)
 
     def add_spawn(self, agent_id: int, team: Team, loc: Location) -> None:
         pb_spawn = Spawn()
@@ -186,16 +289,15 @@ class GamePb:
 
     def add_dead(self, agent_id: int) -> None:
         self.dead_ids.append(agent_id)
+        _ = self._agent_states.pop(agent_id, None)
 
-    def add_drone_scan(self, loc: Location, team: Team, duration: int) -> None:
-        pb_drone_scan = DroneScan()
-        pb_loc = PbLocation()
-        pb_loc.x = loc.x
-        pb_loc.y = loc.y
-        pb_drone_scan.location.CopyFrom(pb_loc)
+    def _fill_drone_scan(
+        self, pb_drone_scan: DroneScan, loc: Location, team: Team, duration: int
+    ) -> None:
+        pb_drone_scan.location.x = loc.x
+        pb_drone_scan.location.y = loc.y
         pb_drone_scan.team = self.team_to_schema(team)
         pb_drone_scan.duration = duration
-        self.drone_scans.append(pb_drone_scan)
 
     def team_to_schema(self, team: Team) -> PbTeam:
         return PbTeam.GOOBS if team == Team.GOOBS else PbTeam.VOIDSEERS
@@ -206,7 +308,75 @@ class GamePb:
         self.turns.clear()
         self.removed_layers.clear()
         self.dead_ids.clear()
-        self.drone_scans.clear()
+        self.drone_scans_started.clear()
+        self.drone_scans_expired.clear()
 
     def clear_turn(self) -> None:
         self.spawns.clear()
+
+
+class HeadlessGamePb(GamePb):
+    """
+    A `GamePb` that discards every event.
+
+    Used for headless runs where no client will ever read the event stream,
+    so no protobuf messages are built or encoded.
+    """
+
+    @override
+    def make_games_header(self, ws_server: WebSocketServer) -> None:
+        pass
+
+    @override
+    def make_game_header(self, world: World) -> None:
+        pass
+
+    @override
+    def update_drone_scans(self, drone_scans: dict[Location, dict[Team, int]]) -> None:
+        pass
+
+    @override
+    def wants_keyframe(self) -> bool:
+        return False
+
+    @override
+    def make_keyframe(
+        self,
+        world: World,
+        agents: list[Agent],
+        team_info: TeamInfo,
+        drone_scans: dict[Location, dict[Team, int]],
+    ) -> None:
+        pass
+
+    @override
+    def end_round(self) -> None:
+        pass
+
+    @override
+    def end_turn(self, agent: Agent) -> None:
+        pass
+
+    @override
+    def make_game_footer(self) -> None:
+        pass
+
+    @override
+    def make_games_footer(self) -> None:
+        pass
+
+    @override
+    def add_team_info(self, team: Team, team_info: TeamInfo) -> None:
+        pass
+
+    @override
+    def add_spawn(self, agent_id: int, team: Team, loc: Location) -> None:
+        pass
+
+    @override
+    def add_removed_layer(self, loc: Location) -> None:
+        pass
+
+    @override
+    def add_dead(self, agent_id: int) -> None:
+        pass
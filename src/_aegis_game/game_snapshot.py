@@ -0,0 +1,143 @@
+import pickle
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .common import Cell
+from .common.objects import Rubble, Survivor, WorldObject
+from .world_grid import LayerKind
+
+SNAPSHOT_VERSION = 2
+
+# (kind, id, health or energy required, agents required)
+LayerState = tuple[int, int, int, int]
+# (message, round, sender id)
+MessageState = tuple[str, int, int]
+# (x, y, team, duration)
+DroneScanState = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class MessageBufferSnapshot:
+    """The rounds kept by a message buffer and their messages."""
+
+    rounds: list[int]
+    messages: dict[int, list[MessageState]]
+    pending: list[MessageState]
+
+
+@dataclass(frozen=True)
+class AgentSnapshot:
+    """The state of one agent, without the state of its running code."""
+
+    id: int
+    team: int
+    agent_type: str
+    x: int
+    y: int
+    energy_level: int
+    action_cooldown: int
+    steps_taken: int
+    # `has_visited` packed 8 cells to a byte
+    has_visited: bytes
+    message_buffer: MessageBufferSnapshot
+
+
+@dataclass(frozen=True)
+class CellSnapshot:
+    """The layers and agents of a cell that has either."""
+
+    index: int
+    layers: list[LayerState]
+    agents: list[int]
+
+
+@dataclass(frozen=True)
+class PredictionSnapshot:
+    """The pending and completed predictions of both teams."""
+
+    # (team, survivor id, image, correct label)
+    pending: list[tuple[int, int, NDArray[np.uint8], int]]
+    # (team, survivor id, correct)
+    completed: list[tuple[int, int, bool]]
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    """Everything needed to continue a game from the end of a round."""
+
+    version: int
+    width: int
+    height: int
+    round: int
+    running: bool
+    reason: str | None
+    cells: list[CellSnapshot]
+    agents: list[AgentSnapshot]
+    team_info: dict[str, list[int]]
+    drone_scans: list[DroneScanState]
+    pending_drone_scans: list[DroneScanState]
+    available_ids: list[int]
+    random_state: tuple[Any, ...]
+    np_random_state: dict[str, Any]
+    predictions: PredictionSnapshot | None
+
+
+def layer_state(layer: WorldObject) -> LayerState:
+    if isinstance(layer, Survivor):
+        return (LayerKind.SURVIVOR, layer.id, layer.health, 0)
+    if isinstance(layer, Rubble):
+        return (
+            LayerKind.RUBBLE,
+            layer.id,
+            layer.energy_required,
+            layer.agents_required,
+        )
+    error = f"Can't snapshot layer {layer!r}"
+    raise TypeError(error)
+
+
+def layer_from_state(state: LayerState) -> WorldObject:
+    kind, layer_id, value, agents_required = state
+    if kind == LayerKind.SURVIVOR:
+        return Survivor(layer_id, value)
+    return Rubble(layer_id, value, agents_required)
+
+
+def cell_snapshot(index: int, cell: Cell) -> CellSnapshot:
+    return CellSnapshot(
+        index, [layer_state(layer) for layer in cell.layers], list(cell.agents)
+    )
+
+
+def dumps(snapshot: GameSnapshot) -> bytes:
+    """Serialize a snapshot to compressed bytes."""
+    return zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def loads(data: bytes) -> GameSnapshot:
+    """
+    Read a snapshot written by `dumps`.
+
+    Only load snapshots you wrote, like any pickle they can run code.
+
+    Raises:
+        ValueError: If the data isn't a snapshot of this version.
+
+    """
+    try:
+        snapshot = pickle.loads(zlib.decompress(data))  # noqa: S301
+    except (zlib.error, pickle.UnpicklingError, EOFError) as e:
+        error = "Data is not a game snapshot"
+        raise ValueError(error) from e
+
+    if not isinstance(snapshot, GameSnapshot):
+        error = "Data is not a game snapshot"
+        raise ValueError(error)  # noqa: TRY004
+    if snapshot.version != SNAPSHOT_VERSION:
+        error = f"Unsupported snapshot version {snapshot.version}"
+        raise ValueError(error)
+    return snapshot
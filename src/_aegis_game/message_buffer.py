@@ -1,6 +1,7 @@
 from collections import deque
 
 from .constants import Constants
+from .game_snapshot import MessageBufferSnapshot
 from .message import Message
 
 
@@ -87,3 +88,24 @@ class MessageBuffer:
 
         """
         self._rotate_to(round_num)
+
+    def snapshot(self) -> MessageBufferSnapshot:
+        """Capture the rounds and messages in the buffer."""
+        return MessageBufferSnapshot(
+            list(self._history),
+            {
+                r: [(m.message, m.round_num, m.sender_id) for m in messages]
+                for r, messages in self._round_map.items()
+            },
+            [(m.message, m.round_num, m.sender_id) for m in self._pending],
+        )
+
+    def restore(self, snapshot: MessageBufferSnapshot) -> None:
+        """Replace the contents of the buffer with a snapshot."""
+        self._history.clear()
+        self._history.extend(snapshot.rounds)
+        self._round_map = {
+            r: [Message(*message) for message in messages]
+            for r, messages in snapshot.messages.items()
+        }
+        self._pending = [Message(*message) for message in snapshot.pending]
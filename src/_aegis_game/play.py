@@ -5,11 +5,16 @@ from google.protobuf.message import DecodeError
 from .aegis_config import has_feature
 from .args_parser import LaunchArgs
 from .game import Game
-from .game_pb import GamePb
+from .game_pb import GamePb, HeadlessGamePb
 from .logger import LOGGER, setup_console_and_file_logging, setup_console_logging
+from .replay import REPLAY_SUFFIX, ReplayWriter
+from .sandbox.cache import CodeCache
+from .sandbox.core import TurnTimeoutError
 from .sandbox.sandbox import Sandbox
 from .server_websocket import WebSocketServer
 from .team import Team
+from .world import World
+from .world_binary import WorldCache
 from .world_pb import load_world
 
 
@@ -58,59 +63,98 @@ def make_game_start_string(args: LaunchArgs, world: str) -> str:
     return f"GOOBS vs VOIDSEERS on {world}"
 
 
+def load_named_world(world_name: str, world_cache: WorldCache | None = None) -> World:
+    """Load a world by name from the `worlds/` directory, through `world_cache`."""
+    world_path = Path.cwd() / "worlds" / f"{world_name}.world"
+
+    try:
+        if world_cache is not None:
+            return world_cache.load(world_path)
+        return load_world(world_path)
+    except (FileNotFoundError, DecodeError) as e:
+        error = f"Unable to load world {world_path}!"
+        raise ValueError(error) from e
+
+
+def run_rounds(game: Game) -> None:
+    """Run rounds until the game is over."""
+    while game.running:
+        try:
+            game.run_round()
+        # not an `Exception`, but one escaping a turn mustn't end the run either
+        except (Exception, TurnTimeoutError):  # noqa: BLE001
+            LOGGER.exception("This shouldn't have happened. Internal error.")
+            game.running = False
+
+
 def run(args: LaunchArgs) -> None:
     if args.agent is None and args.agent2 is None:
         error = "At least one agent must be provided"
         raise ValueError(error)
 
+    if args.record is not None and args.headless:
+        error = "Headless games have no events to record"
+        raise ValueError(error)
+
+    if args.client and args.headless:
+        error = "Headless games have no events to send to a client"
+        raise ValueError(error)
+
     setup_console_and_file_logging() if args.log else setup_console_logging()
 
+    code_cache = CodeCache()
+    world_cache = WorldCache()
     sandbox_goobs = (
-        Sandbox.from_directory(Path.cwd() / "agents" / args.agent)
+        Sandbox.from_directory(Path.cwd() / "agents" / args.agent, code_cache)
         if args.agent is not None
         else None
     )
     sandbox_seers = (
-        Sandbox.from_directory(Path.cwd() / "agents" / args.agent2)
+        Sandbox.from_directory(Path.cwd() / "agents" / args.agent2, code_cache)
         if args.agent2 is not None
         else None
     )
-    ws_server = WebSocketServer(wait_for_client=args.client)
-    game_pb = GamePb()
-
-    ws_server.start()
-    game_pb.make_games_header(ws_server)
-
-    for i, arg_world in enumerate(args.world):
-        world_name = f"{arg_world}"
-        world_path = Path.cwd() / "worlds" / f"{world_name}.world"
-
-        try:
-            world = load_world(world_path)
-        except (FileNotFoundError, DecodeError) as e:
-            error = f"Unable to load world {world_path}!"
-            raise ValueError(error) from e
-
-        world.rounds = args.rounds
-
-        try:
-            game = Game([sandbox_goobs, sandbox_seers], args, world, game_pb)
-        except ValueError as e:
-            enhanced_msg = f"Error in world '{world_name}': {e}"
-            raise ValueError(enhanced_msg) from e
-
-        LOGGER.info("========== AEGIS START ==========")
-        LOGGER.info(make_game_start_string(args, world_name))
+    replay = None
+    if args.record is not None:
+        record = Path(args.record)
+        replay = ReplayWriter(
+            record if record.suffix else record.with_suffix(REPLAY_SUFFIX)
+        )
+    # headless games have no events, so nothing to serve
+    ws_server = None
+    if args.headless:
+        game_pb = HeadlessGamePb()
+    else:
+        ws_server = WebSocketServer(
+            wait_for_client=args.client, backpressure=args.backpressure
+        )
+        game_pb = GamePb(replay)
+        ws_server.start()
+        game_pb.make_games_header(ws_server)
+
+    try:
+        for i, arg_world in enumerate(args.world):
+            world_name = f"{arg_world}"
+            world = load_named_world(world_name, world_cache)
+            world.rounds = args.rounds
 
-        game_pb.make_game_header(world)
-        while game.running:
             try:
-                game.run_round()
-            except Exception:  # noqa: BLE001
-                LOGGER.exception("This shouldn't have happened. Internal error.")
-                game.running = False
-
-        game_pb.make_game_footer()
-        log_game_end(game, args, i)
-    game_pb.make_games_footer()
-    ws_server.finish()
+                game = Game([sandbox_goobs, sandbox_seers], args, world, game_pb)
+            except ValueError as e:
+                enhanced_msg = f"Error in world '{world_name}': {e}"
+                raise ValueError(enhanced_msg) from e
+
+            LOGGER.info("========== AEGIS START ==========")
+            LOGGER.info(make_game_start_string(args, world_name))
+
+            game_pb.make_game_header(world)
+            run_rounds(game)
+            game_pb.make_game_footer()
+            log_game_end(game, args, i)
+        game_pb.make_games_footer()
+    finally:
+        if replay is not None:
+            replay.close()
+            LOGGER.info(f"Recorded replay to {replay.path}")
+    if ws_server is not None:
+        ws_server.finish()
@@ -0,0 +1,302 @@
+import bisect
+import struct
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+from .args_parser import ReplayArgs
+from .logger import LOGGER, setup_console_logging
+from .server_websocket import WebSocketServer
+from .types import Backpressure
+
+if TYPE_CHECKING:
+    from io import BufferedWriter
+
+REPLAY_SUFFIX = ".aegisreplay"
+MAGIC = b"AEGISRPL"
+VERSION = 2
+
+# File layout:
+#   header  - magic, version
+#   blocks  - one zlib block per round of records (length, flags, event)
+#   index   - one entry per block
+#   trailer - index offset, number of entries, magic
+_HEADER = struct.Struct("<8sH")
+_RECORD = struct.Struct("<IB")
+_INDEX_ENTRY = struct.Struct("<IIQI?")
+_TRAILER = struct.Struct("<QI8s")
+
+_FLAG_KEYFRAME = 1
+# a keyframe only played when playback starts from it
+_FLAG_SEEK_ONLY = 2
+
+
+class ReplayIndexEntry(NamedTuple):
+    """Location of the block holding the events up to the end of a round."""
+
+    game: int
+    round: int
+    offset: int
+    size: int
+    # whether playback can start from a keyframe in the block
+    keyframe: bool
+
+
+class ReplayEvent(NamedTuple):
+    """A serialized event read back from a replay."""
+
+    data: bytes
+    keyframe: bool
+    seek_only: bool = False
+
+
+class ReplayWriter:
+    """
+    Streams serialized events to a replay file.
+
+    Events are buffered and written as one compressed block per round, so a
+    reader can seek to any round through the index at the end of the file and
+    play it from the keyframe before it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Create the replay file and write its header.
+
+        Args:
+            path: Where to write the replay.
+
+        """
+        self.path: Path = path
+        self._file: BufferedWriter = path.open("wb")
+        _ = self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._pending: bytearray = bytearray()
+        self._pending_keyframe: bool = False
+        # the records of the last block written, to add trailing events to
+        self._block: bytes = b""
+        self._index: list[ReplayIndexEntry] = []
+        self._game: int = -1
+        self._round: int = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def start_game(self) -> None:
+        """Start indexing the events of the next game."""
+        self._flush_trailing()
+        self._game += 1
+        self._round = 0
+
+    def add_event(self, event: bytes, *, keyframe: bool = False) -> None:
+        """
+        Buffer an event for the current round.
+
+        Args:
+            event: The serialized event.
+            keyframe: Whether the event fully describes the current game.
+
+        """
+        self._add_record(event, _FLAG_KEYFRAME if keyframe else 0)
+
+    def add_keyframe(self, event: bytes) -> None:
+        """
+        Buffer a keyframe of the game so far for seeking.
+
+        Unlike keyframes added with `add_event`, it isn't played unless playback
+        starts from it, since the events before it already describe the game.
+
+        Args:
+            event: The serialized keyframe.
+
+        """
+        self._add_record(event, _FLAG_KEYFRAME | _FLAG_SEEK_ONLY)
+
+    def _add_record(self, event: bytes, flags: int) -> None:
+        self._pending += _RECORD.pack(len(event), flags)
+        self._pending += event
+        if flags & _FLAG_KEYFRAME:
+            self._pending_keyframe = True
+
+    def end_round(self, game_round: int) -> None:
+        """Write the events buffered so far as the block ending `game_round`."""
+        self._round = game_round
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        block = zlib.compress(self._pending)
+        offset = self._file.tell()
+        _ = self._file.write(block)
+        self._index.append(
+            ReplayIndexEntry(
+                max(self._game, 0),
+                self._round,
+                offset,
+                len(block),
+                self._pending_keyframe,
+            )
+        )
+        self._block = bytes(self._pending)
+        self._pending.clear()
+        self._pending_keyframe = False
+
+    def _flush_trailing(self) -> None:
+        """
+        Write the events after a game's last round into that round's block.
+
+        A block of their own would get the same index entry as that round.
+        """
+        if (
+            not self._pending
+            or not self._index
+            or self._index[-1].game != max(self._game, 0)
+        ):
+            self._flush()
+            return
+        # the block is the last thing in the file, write it again with them
+        last = self._index.pop()
+        self._pending[:0] = self._block
+        self._pending_keyframe |= last.keyframe
+        _ = self._file.seek(last.offset)
+        _ = self._file.truncate()
+        self._flush()
+
+    def close(self) -> None:
+        """Write any buffered events and the index. The file is complete after."""
+        if self._file.closed:
+            return
+        self._flush_trailing()
+        index_offset = self._file.tell()
+        for entry in self._index:
+            _ = self._file.write(_INDEX_ENTRY.pack(*entry))
+        _ = self._file.write(_TRAILER.pack(index_offset, len(self._index), MAGIC))
+        self._file.close()
+
+
+class ReplayReader:
+    """Reads the events and round index of a replay file."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Load a replay file.
+
+        Args:
+            path: The replay to read.
+
+        Raises:
+            ValueError: If the file isn't a complete replay.
+
+        """
+        self.path: Path = path
+        self._data: bytes = path.read_bytes()
+
+        if len(self._data) < _HEADER.size + _TRAILER.size:
+            error = f"{path} is too short to be a replay"
+            raise ValueError(error)
+
+        magic, version = _HEADER.unpack_from(self._data)
+        if magic != MAGIC:
+            error = f"{path} is not a replay file"
+            raise ValueError(error)
+        if version != VERSION:
+            error = f"Unsupported replay version {version} in {path}"
+            raise ValueError(error)
+
+        index_offset, count, magic = _TRAILER.unpack_from(
+            self._data, len(self._data) - _TRAILER.size
+        )
+        if magic != MAGIC:
+            error = f"{path} has no index, the recording didn't finish"
+            raise ValueError(error)
+
+        self.index: list[ReplayIndexEntry] = [
+            ReplayIndexEntry(
+                *_INDEX_ENTRY.unpack_from(
+                    self._data, index_offset + i * _INDEX_ENTRY.size
+                )
+            )
+            for i in range(count)
+        ]
+
+    def find(self, game: int, game_round: int) -> int:
+        """
+        Find the block holding the events of a round.
+
+        Returns:
+            The position of the block in `index`.
+
+        """
+        keys = [(entry.game, entry.round) for entry in self.index]
+        position = bisect.bisect_left(keys, (game, game_round))
+        return min(position, len(self.index) - 1)
+
+    def read_block(self, entry: ReplayIndexEntry) -> list[ReplayEvent]:
+        """Decompress a block and split it into events."""
+        block = zlib.decompress(self._data[entry.offset : entry.offset + entry.size])
+        events: list[ReplayEvent] = []
+        position = 0
+        while position < len(block):
+            length, flags = _RECORD.unpack_from(block, position)
+            position += _RECORD.size
+            data = block[position : position + length]
+            position += length
+            events.append(
+                ReplayEvent(
+                    data,
+                    keyframe=bool(flags & _FLAG_KEYFRAME),
+                    seek_only=bool(flags & _FLAG_SEEK_ONLY),
+                )
+            )
+        return events
+
+    def events(self, start: int = 0) -> Iterator[ReplayEvent]:
+        """
+        Yield the events played from the block at position `start` in `index` on.
+
+        If that block has a keyframe, playback starts from its last one.
+        Keyframes written only for seeking are skipped everywhere else.
+        """
+        for position in range(start, len(self.index)):
+            entry = self.index[position]
+            events = self.read_block(entry)
+            if position == start and entry.keyframe:
+                first = max(i for i, event in enumerate(events) if event.keyframe)
+                yield events[first]
+                events = events[first + 1 :]
+            yield from (event for event in events if not event.seek_only)
+
+    def seek(self, game: int, game_round: int) -> Iterator[ReplayEvent]:
+        """
+        Yield the events that play a game from the keyframe before a round on.
+
+        The first event of the replay, which comes before every game, is
+        yielded first.
+        """
+        position = self.find(game, game_round)
+        while position > 0 and not self.index[position].keyframe:
+            position -= 1
+        if position > 0:
+            yield self.read_block(self.index[0])[0]
+        yield from self.events(position)
+
+
+def run_replay(args: ReplayArgs) -> None:
+    """Serve a recorded replay to the client without running any agents."""
+    setup_console_logging()
+
+    reader = ReplayReader(Path(args.file))
+    LOGGER.info(f"Serving {args.file} ({len(reader.index)} blocks)")
+    # without a round, the game plays from its header
+    events = reader.seek(args.game, args.start_round or 0)
+
+    # nothing is lost by waiting, the file is already complete
+    ws_server = WebSocketServer(wait_for_client=True, backpressure=Backpressure.BLOCK)
+    ws_server.start()
+    for event in events:
+        ws_server.add_event(event.data, keyframe=event.keyframe)
+    ws_server.finish()
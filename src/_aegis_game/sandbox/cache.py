@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import marshal
+import os
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from _aegis_game.logger import LOGGER
+
+from . import typed_ast
+
+if TYPE_CHECKING:
+    from types import CodeType
+
+# relative to the directory games are run from
+CACHE_DIR = Path(".aegis_cache") / "code"
+
+
+@cache
+def _compile_fingerprint() -> bytes:
+    """
+    Identify everything besides the source that affects the compiled code.
+
+    This covers the interpreter's bytecode format, the RestrictedPython version
+    and the source of our restricting policy, so changing any of them misses.
+    """
+    try:
+        rp_version = version("RestrictedPython")
+    except PackageNotFoundError:
+        rp_version = "unknown"
+
+    digest = hashlib.sha256()
+    digest.update(importlib.util.MAGIC_NUMBER)
+    digest.update(rp_version.encode())
+    digest.update(Path(typed_ast.__file__).read_bytes())
+    return digest.digest()
+
+
+class CodeCache:
+    """On-disk cache of compiled agent code objects."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory the marshalled code objects are stored in,
+                `CACHE_DIR` under the current directory by default.
+
+        """
+        self.directory: Path = (
+            Path.cwd() / CACHE_DIR if directory is None else directory
+        )
+
+    def key(self, filename: str, source: str) -> str:
+        """Return the cache key for a source file."""
+        digest = hashlib.sha256(_compile_fingerprint())
+        digest.update(filename.encode())
+        digest.update(b"\0")
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def _path(self, filename: str, source: str) -> Path:
+        return self.directory / f"{self.key(filename, source)}.bin"
+
+    def get(self, filename: str, source: str) -> CodeType | None:
+        """
+        Load previously compiled code for a source file.
+
+        Returns:
+            The cached code object, or None if it isn't cached or can't be read.
+
+        """
+        path = self._path(filename, source)
+        try:
+            return cast("CodeType", marshal.loads(path.read_bytes()))  # noqa: S302
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            LOGGER.warning(f"Ignoring unreadable code cache entry {path}: {e}")
+            return None
+
+    def put(self, filename: str, source: str, code: CodeType) -> None:
+        """Store compiled code for a source file. Failures are only logged."""
+        path = self._path(filename, source)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _ = tmp_path.write_bytes(marshal.dumps(code))
+            # atomic so concurrent tournament workers never see partial files
+            _ = tmp_path.replace(path)
+        except OSError as e:
+            LOGGER.warning(f"Unable to write code cache entry {path}: {e}")
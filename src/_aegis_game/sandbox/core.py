@@ -1,28 +1,221 @@
 # pyright: reportMissingTypeStubs = false
 # pyright: reportUnknownMemberType = false
 import builtins as py_builtins
+import contextlib
+import ctypes
+import functools
+import queue
+import random
+import sys
+import threading
+import time
 import traceback
+import tracemalloc
 import types
 from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from pathlib import Path
 from threading import Event, Thread
 from typing import Any, override
 
+import numpy as np
 from RestrictedPython import (
     Guards,
     limited_builtins,  # pyright: ignore[reportUnknownVariableType]
     safe_builtins,  # pyright: ignore[reportUnknownVariableType]
 )
 
-from _aegis_game.types import MethodDict
+from _aegis_game.constants import Constants
+from _aegis_game.types import ExecMode, MethodDict
 
 from .sandbox import Sandbox
 
+# Frames from files under this directory belong to the engine, not the agent
+ENGINE_DIR = str(Path(__file__).resolve().parent.parent)
+# Optional file run once per team, agents get its names with `import shared`
+SHARED_MODULE = "shared"
+
+
+class TurnTimeoutError(BaseException):
+    """
+    Raised inside an agent's turn when it runs over the time limit.
+
+    Derives from `BaseException` so `except Exception` in agent code can't swallow it.
+    """
+
+
+@dataclass(frozen=True)
+class TurnUsage:
+    """What one turn cost, measured on the thread that ran it."""
+
+    # seconds the turn's thread spent on a CPU, which other threads and
+    # processes competing for the machine don't add to
+    cpu_time: float
+    # peak bytes allocated during the turn, None unless tracemalloc is tracing
+    memory: int | None
+    api_calls: int
+
+    def over_budget(self) -> str | None:
+        """
+        Check the turn against the budgets in `Constants`.
+
+        API calls aren't checked here, calls over their budget already fail.
+
+        Returns:
+            Why the turn went over a budget, or None if it didn't.
+
+        """
+        if self.cpu_time >= Constants.MAX_TURN_TIME_LIMIT:
+            return (
+                f"used {self.cpu_time:.2f}s of CPU time "
+                f"(over {Constants.MAX_TURN_TIME_LIMIT}s limit)"
+            )
+        if self.memory is not None and self.memory >= Constants.MAX_TURN_MEMORY:
+            return (
+                f"allocated {self.memory / (1 << 20):.1f} MiB "
+                f"(over {Constants.MAX_TURN_MEMORY >> 20} MiB limit)"
+            )
+        return None
+
+
+def _freeze(value: object) -> object:
+    """
+    Return a read-only copy of the lists, dicts, sets and arrays in `value`.
+
+    Lists become tuples, dicts read-only mappings and sets frozensets. Arrays
+    are copied into immutable memory, so they can't be made writeable again.
+    Anything else is returned as it is.
+    """
+    # not subclasses, a named tuple would lose its fields
+    if isinstance(value, list | tuple) and type(value) in {list, tuple}:
+        return tuple(_freeze(item) for item in value)  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(value, dict):
+        return types.MappingProxyType(
+            {key: _freeze(item) for key, item in value.items()}  # pyright: ignore[reportUnknownVariableType]
+        )
+    if isinstance(value, set):
+        return frozenset(value)  # pyright: ignore[reportUnknownArgumentType]
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        return np.frombuffer(value.tobytes(), value.dtype).reshape(value.shape)
+    return value
+
+
+class SharedModule(types.ModuleType):
+    """
+    The names defined by a team's `shared.py`, which its agents can't rebind.
+
+    The values are shared by every agent of the team, so the containers among
+    them are frozen first, see `_freeze`. One agent can then only change what
+    its teammates see through objects of its own classes.
+    """
+
+    def __init__(self, namespace: Mapping[str, object]) -> None:
+        """
+        Initialize the module.
+
+        Args:
+            namespace: The globals `shared.py` ran in, only public names are kept.
+
+        """
+        super().__init__(SHARED_MODULE)
+        vars(self).update(
+            (name, _freeze(value))
+            for name, value in namespace.items()
+            if not name.startswith("_")
+        )
+
+    @override
+    def __setattr__(self, name: str, value: object) -> None:
+        error = f"Can't set '{name}', {SHARED_MODULE} is read-only"
+        raise AttributeError(error)
+
+    @override
+    def __delattr__(self, name: str) -> None:
+        error = f"Can't delete '{name}', {SHARED_MODULE} is read-only"
+        raise AttributeError(error)
+
+
+def random_module(rng: random.Random) -> types.ModuleType:
+    """Return a copy of the `random` module whose functions draw from `rng`."""
+    module = types.ModuleType(random.__name__, random.__doc__)
+    for name in random.__all__:
+        value: object = getattr(random, name)
+        # the module's functions are methods of one hidden, global instance
+        if isinstance(getattr(value, "__self__", None), random.Random):
+            value = getattr(rng, name)
+        setattr(module, name, value)
+    return module
+
+
+def load_shared(  # noqa: PLR0913
+    code: Sandbox,
+    error: Callable[[str], None],
+    *,
+    mode: ExecMode = ExecMode.INLINE,
+    executor: "LumenPool | None" = None,
+    timeout: float | None = None,
+    rng: random.Random | None = None,
+) -> SharedModule | None:
+    """
+    Run a team's `shared.py` for every agent of the team to import.
+
+    It runs like an agent's initialization, in the same restricted namespace
+    but without the agent API since it doesn't belong to any one agent.
+
+    Args:
+        code: The team's sandboxed code.
+        error: A callback to report errors raised by `shared.py`.
+        mode: How `shared.py` is run, as for the team's agents.
+        executor: The shared executor used in pool mode.
+        timeout: Seconds `shared.py` may run before it is interrupted.
+        rng: What `import random` draws from, see `LumenCore`.
+
+    Returns:
+        The shared module, or None if the team has no `shared.py` or it failed.
+
+    Raises:
+        TimeoutError: If `shared.py` ran over `timeout`.
+
+    """
+    if SHARED_MODULE not in code:
+        return None
+
+    core = LumenCore(
+        code,
+        {},
+        error,
+        mode=mode,
+        executor=executor,
+        module=SHARED_MODULE,
+        rng=rng,
+    )
+    try:
+        finished = core.wait(core.start(init_only=True), timeout)
+    finally:
+        core.kill()
+    if not finished:
+        error_msg = f"{SHARED_MODULE}.py ran over the {timeout}s limit"
+        raise TimeoutError(error_msg)
+    if not core.initialized:
+        return None
+    return SharedModule(core.namespace)
+
 
 class LumenCore:
     """Core executor for running agent code in a restricted, sandboxed environment."""
 
-    def __init__(
-        self, code: Sandbox, methods: MethodDict, error: Callable[..., None]
+    def __init__(  # noqa: PLR0913
+        self,
+        code: Sandbox,
+        methods: MethodDict,
+        error: Callable[..., None],
+        *,
+        mode: ExecMode = ExecMode.THREAD,
+        executor: "LumenPool | None" = None,
+        shared: SharedModule | None = None,
+        module: str = "main",
+        rng: random.Random | None = None,
     ) -> None:
         """
         Initialize the LumenCore executor.
@@ -31,14 +224,47 @@ class LumenCore:
             code: A sandboxed script containing the agent logic.
             methods: A dictionary of allowed API methods for the agent.
             error: A callback to report errors during execution.
+            mode: How turns are executed.
+            executor: The shared executor turns are submitted to in pool mode.
+            shared: The team's shared module, returned for `import shared`.
+            module: The file in `code` that initializing runs.
+            rng: What `import random` draws from instead of the global
+                generator, so seeding it makes the agent's choices repeatable.
 
         """
         self.code: Sandbox = code
+        self.module: str = module
+        self.shared: SharedModule | None = shared
         self.methods: MethodDict = methods
         self.error: Callable[..., None] = error
+        self.random: types.ModuleType = random if rng is None else random_module(rng)
         self.initialized: bool = False
-        self.thread: LumenThread = LumenThread(self)
-        self.thread.start()
+        self.mode: ExecMode = mode
+        self.executor: LumenPool | None = executor
+        self.thread: LumenThread | None = None
+        # id of the thread currently running a turn, None between turns
+        self.turn_thread_id: int | None = None
+        self.turn_lock: threading.Lock = threading.Lock()
+        # whether the next turn only initializes the agent's code
+        self.init_only: bool = False
+        # what the last turn cost, None until it stops
+        self.usage: TurnUsage | None = None
+        self.api_calls: int = 0
+        # CPU clock of the turn's thread when the turn started
+        self.turn_cpu_start: float = 0.0
+        # set once the turn is being interrupted, before anything is raised in it
+        self.interrupting: bool = False
+        # whether the turn's thread is inside an API method, where it must not
+        # be interrupted
+        self.in_api_call: bool = False
+
+        if mode == ExecMode.POOL and executor is None:
+            error_msg = "Pool mode requires a shared executor"
+            raise ValueError(error_msg)
+
+        if mode == ExecMode.THREAD:
+            self.thread = LumenThread(self)
+            self.thread.start()
 
         self.allowed_modules: set[str] = {
             "os",
@@ -56,6 +282,8 @@ class LumenCore:
         }
 
         self.namespace: dict[str, object] = self._build_namespace()
+        if module != "main":
+            self.namespace["__name__"] = module
 
     def _build_namespace(self) -> dict[str, object]:
         """
@@ -68,7 +296,10 @@ class LumenCore:
         builtins: MethodDict = {
             **safe_builtins,
             **limited_builtins,
-            **self.methods,
+            **{
+                name: method if isinstance(method, type) else self._count(method)
+                for name, method in self.methods.items()
+            },
             **{
                 name: getattr(py_builtins, name)
                 for name in [
@@ -88,12 +319,16 @@ class LumenCore:
         }
 
         builtins["__import__"] = self.custom_import
+        # Agents must not be able to catch `TurnTimeoutError`
+        builtins["BaseException"] = Exception
 
         namespace: dict[str, object] = {
             "__builtins__": builtins,
             "__name__": "__main__",
             "_getattr_": self.deny_private_attr,
             "_getitem_": self.deny_private_items,
+            # `NodeTransformer` leaves most calls to these two out since they
+            # change nothing, keep them that way
             "_getiter_": self.default_guarded_iter,
             "_write_": self.default_guarded_write,
             "__metaclass__": type,
@@ -103,6 +338,33 @@ class LumenCore:
 
         return namespace
 
+    def _count(self, method: Callable[..., Any]) -> Callable[..., Any]:  # pyright: ignore[reportExplicitAny]
+        """
+        Wrap an API method to count its calls and keep interrupts out of it.
+
+        Calls past `Constants.MAX_TURN_API_CALLS` fail, and once the turn is
+        being interrupted every call ends the turn instead of running.
+        """
+
+        @functools.wraps(method)
+        def counted(*args: object, **kwargs: object) -> object:
+            self.in_api_call = True
+            try:
+                if self.interrupting:
+                    # one may have been raised asynchronously just before the flag
+                    # was set, raise it here rather than in the engine call
+                    _clear_in_thread(threading.get_ident())
+                    raise TurnTimeoutError
+                self.api_calls += 1
+                if self.api_calls > Constants.MAX_TURN_API_CALLS:
+                    error = f"Over the limit of {Constants.MAX_TURN_API_CALLS} API calls per turn"
+                    raise RuntimeError(error)
+                return method(*args, **kwargs)  # pyright: ignore[reportAny]
+            finally:
+                self.in_api_call = False
+
+        return counted
+
     def default_guarded_iter(self, ob: object) -> object:
         """Bypass iteration restrictions (safe override for RestrictedPython)."""
         return ob
@@ -124,6 +386,9 @@ class LumenCore:
 
         Disallows relative/private imports and validates modules against allowlist.
         """
+        if name == SHARED_MODULE and self.shared is not None and level == 0:
+            return self.shared
+
         # Allow "import module" if it's in the allowed list
         if not fromlist and name not in self.allowed_modules:
             error = f"Import of module '{name}' is not allowed"
@@ -143,6 +408,8 @@ class LumenCore:
         if name.startswith("_") or name not in self.allowed_modules:
             error = f"Import of module '{name}' is not allowed"
             raise ImportError(error)
+        if name == random.__name__:
+            return self.random
         return __import__(name, globals_, locals_, fromlist, level)  # pyright: ignore[reportAny]
 
     @staticmethod
@@ -164,7 +431,7 @@ class LumenCore:
     def init(self) -> None:
         """Initialize the agent's main code."""
         try:
-            exec(self.code["main"], self.namespace)  # noqa: S102
+            exec(self.code[self.module], self.namespace)  # noqa: S102
             self.initialized = True
         except Exception:  # noqa: BLE001
             self.error(traceback.format_exc(limit=5))
@@ -180,15 +447,259 @@ class LumenCore:
         except Exception:  # noqa: BLE001
             self.error(traceback.format_exc(limit=5))
 
-    def run(self) -> None:
-        """Triggers a turn execution in the LumenThread and waits for completion."""
-        self.thread.trigger_turn()
-        self.thread.wait_for_turn()
+    def step(self) -> None:
+        """Run a single turn, initializing the agent's code first if needed."""
+        init_only = self.init_only
+        self.api_calls = 0
+        memory_start = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        self.turn_cpu_start = time.thread_time()
+        try:
+            with self.turn_lock:
+                self.turn_thread_id = threading.get_ident()
+            if not self.initialized:
+                self.init()
+
+            if not init_only:
+                self.think()
+        except TurnTimeoutError:
+            self.error("Turn was interrupted for exceeding the time limit.")
+        finally:
+            self._end_turn()
+            memory = None
+            if memory_start is not None:
+                memory = tracemalloc.get_traced_memory()[1] - memory_start
+            self.usage = TurnUsage(
+                time.thread_time() - self.turn_cpu_start, memory, self.api_calls
+            )
+
+    def _end_turn(self) -> None:
+        """
+        Stop interrupts from reaching the turn's thread, now back in engine code.
+
+        One sent before `turn_thread_id` was cleared can still go off until it's
+        cleared as well, so this retries until neither is left.
+        """
+        while True:
+            try:
+                with self.turn_lock:
+                    self.turn_thread_id = None
+                _clear_in_thread(threading.get_ident())
+            except TurnTimeoutError:
+                continue
+            return
+
+    def run(self, timeout: float | None = None) -> bool:
+        """
+        Execute a turn according to the execution mode and wait for completion.
+
+        Args:
+            timeout: Seconds of CPU time the turn may use before it is
+                interrupted, see `wait`. Ignored in inline mode, where turns run
+                on the caller's thread.
+
+        Returns:
+            True if the turn finished, False if it had to be interrupted.
+
+        """
+        return self.wait(self.start(), timeout, cpu_time=timeout)
+
+    def start(self, *, init_only: bool = False) -> Future[None] | None:
+        """
+        Start a turn without waiting for it, so several agents can run at once.
+
+        Inline turns run to completion before this returns.
+
+        Args:
+            init_only: Only initialize the agent's code, without calling `think()`.
+
+        Returns:
+            The turn's future in pool mode, to pass to `wait`.
+
+        """
+        self.init_only = init_only
+        self.usage = None
+        self.interrupting = False
+        if self.thread is not None:
+            self.thread.trigger_turn()
+            return None
+        if self.executor is not None:
+            return self.executor.submit(self.step)
+        self.step()
+        return None
+
+    def wait(
+        self,
+        future: Future[None] | None,
+        timeout: float | None = None,
+        *,
+        cpu_time: float | None = None,
+    ) -> bool:
+        """
+        Wait for a turn started by `start`, interrupting it if it runs too long.
+
+        Args:
+            future: What `start` returned.
+            timeout: Seconds to wait before the turn is interrupted.
+            cpu_time: If given, keep waiting past `timeout` while the turn has
+                used less CPU time than this, so a turn slowed down by a busy
+                machine isn't cut short. The wait never goes past
+                `Constants.TURN_WALL_TIME_FACTOR` times `timeout`.
+
+        Returns:
+            True if the turn finished, False if it had to be interrupted.
+
+        """
+        if self.thread is not None:
+            thread = self.thread
+            if thread.wait_for_turn(timeout) or self._wait_for_cpu(
+                thread.wait_for_turn, timeout, cpu_time
+            ):
+                return True
+            _ = self.interrupt(thread.turn_done_event.is_set)
+            return False
+
+        if future is not None:
+            if _wait_for_future(future, timeout) or self._wait_for_cpu(
+                functools.partial(_wait_for_future, future), timeout, cpu_time
+            ):
+                return True
+            if not future.cancel() and not self.interrupt(future.done):
+                self._abandon_worker()
+            return False
+        return True
+
+    def _abandon_worker(self) -> None:
+        """Give up on the pool worker stuck in this agent's turn."""
+        with self.turn_lock:
+            thread_id = self.turn_thread_id
+        if self.executor is not None and thread_id is not None:
+            self.executor.replace_worker(thread_id)
+
+    def _wait_for_cpu(
+        self,
+        wait: Callable[[float], bool],
+        timeout: float | None,
+        cpu_time: float | None,
+    ) -> bool:
+        """
+        Keep waiting for a turn that ran past `timeout` but not past `cpu_time`.
+
+        Returns:
+            True if the turn finished, False once it used up `cpu_time` or ran
+            out of wall clock time. Also False where the CPU time of another
+            thread can't be read, the wall clock is then all there is.
+
+        """
+        if timeout is None or cpu_time is None:
+            return False
+        deadline = time.perf_counter() + timeout * (Constants.TURN_WALL_TIME_FACTOR - 1)
+        while (remaining := deadline - time.perf_counter()) > 0:
+            used = self.turn_cpu_time()
+            if used is None or used >= cpu_time:
+                return False
+            if wait(min(remaining, cpu_time - used)):
+                return True
+        return False
+
+    def turn_cpu_time(self) -> float | None:
+        """
+        Return the CPU time the running turn has used so far.
+
+        Returns:
+            The seconds, or None between turns or where the platform can't
+            read another thread's CPU clock.
+
+        """
+        with self.turn_lock:
+            thread_id = self.turn_thread_id
+        if thread_id is None:
+            return None
+        try:
+            clock = time.pthread_getcpuclockid(thread_id)
+            return time.clock_gettime(clock) - self.turn_cpu_start
+        except (AttributeError, OSError):
+            return None
+
+    def interrupt(self, is_done: Callable[[], bool]) -> bool:
+        """
+        Raise `TurnTimeoutError` in the thread running the current turn.
+
+        From now on the agent's next API call raises instead of running. The
+        exception is also raised asynchronously while the thread is executing
+        agent code. An API call that starts before it goes off clears it and
+        raises it itself, so it never goes off in the middle of an engine call
+        that mutates game state. Delivery is retried until the turn ends or
+        `Constants.TURN_INTERRUPT_GRACE` passes.
+
+        Args:
+            is_done: Returns True once the turn has finished.
+
+        Returns:
+            True if the turn stopped within the grace period.
+
+        """
+        self.interrupting = True
+        deadline = time.perf_counter() + Constants.TURN_INTERRUPT_GRACE
+        while time.perf_counter() < deadline:
+            if is_done():
+                return True
+            with self.turn_lock:
+                thread_id = self.turn_thread_id
+                if (
+                    thread_id is not None
+                    and not self.in_api_call
+                    and self._in_agent_code(thread_id)
+                ):
+                    _raise_in_thread(thread_id, TurnTimeoutError)
+            time.sleep(Constants.TURN_INTERRUPT_POLL)
+        return is_done()
+
+    def _in_agent_code(self, thread_id: int) -> bool:
+        """Check whether a thread is currently running agent code."""
+        frame = sys._current_frames().get(thread_id)  # noqa: SLF001
+        boundaries = (LumenCore.init.__code__, LumenCore.think.__code__)
+        while frame is not None:
+            if frame.f_code in boundaries:
+                return True
+            if frame.f_code.co_filename.startswith(ENGINE_DIR):
+                return False
+            frame = frame.f_back
+        return False
 
     def kill(self) -> None:
-        """Terminates the thread execution and waits for cleanup."""
+        """Terminates the thread execution (if any) and waits for cleanup."""
+        if self.thread is None:
+            return
+
         self.thread.kill()
-        self.thread.join()
+        # a thread that ignored its interrupt is left behind as a daemon
+        self.thread.join(Constants.TURN_INTERRUPT_GRACE)
+
+
+def _wait_for_future(future: Future[None], timeout: float | None) -> bool:
+    try:
+        future.result(timeout)
+    except TimeoutError:
+        return False
+    except TurnTimeoutError:
+        # went off as the turn was ending, the turn is over all the same
+        return True
+    return True
+
+
+def _raise_in_thread(thread_id: int, exc: type[BaseException]) -> None:
+    """Asynchronously raise `exc` in the thread with the given id."""
+    _ = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exc)
+    )
+
+
+def _clear_in_thread(thread_id: int) -> None:
+    """Clear an exception raised asynchronously in a thread that hasn't gone off."""
+    _ = ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), None)
 
 
 class LumenThread(Thread):
@@ -202,7 +713,7 @@ class LumenThread(Thread):
             runner: The LumenCore instance this thread manages.
 
         """
-        super().__init__()
+        super().__init__(daemon=True)
         self.runner: LumenCore = runner
         self.running: bool = True
         self.paused: bool = False
@@ -219,10 +730,9 @@ class LumenThread(Thread):
             if not self.running:
                 break
 
-            if not self.runner.initialized:
-                self.runner.init()
-
-            self.runner.think()
+            # an interrupt can land just as the turn is finishing
+            with contextlib.suppress(TurnTimeoutError):
+                self.runner.step()
             self.run_event.clear()
             self.turn_done_event.set()
 
@@ -233,10 +743,21 @@ class LumenThread(Thread):
         else:
             self.run_event.set()
 
-    def wait_for_turn(self) -> None:
-        """Wait for the current turn to finish."""
-        _ = self.turn_done_event.wait()
-        _ = self.turn_done_event.clear()
+    def wait_for_turn(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the current turn to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait forever.
+
+        Returns:
+            True if the turn finished, False if the wait timed out.
+
+        """
+        if not self.turn_done_event.wait(timeout):
+            return False
+        self.turn_done_event.clear()
+        return True
 
     def wait_for_resume(self) -> None:
         """Wait for the thread to resume if paused."""
@@ -249,3 +770,108 @@ class LumenThread(Thread):
         self.running = False
         self.run_event.set()
         self.pause_event.set()
+
+
+class LumenPool(Executor):
+    """
+    A fixed number of daemon threads that pool mode turns are submitted to.
+
+    Unlike `ThreadPoolExecutor`, whose workers are joined when the interpreter
+    exits, a worker stuck in a turn that ignores its interrupt can be given up
+    on with `replace_worker`, the same as a stuck `LumenThread`.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "lumen") -> None:
+        """
+        Initialize the pool and start its workers.
+
+        Args:
+            max_workers: Number of turns that can run at once.
+            thread_name_prefix: Prefix of the workers' thread names.
+
+        """
+        self.thread_name_prefix: str = thread_name_prefix
+        self.workers: list[Thread] = []
+        # idents of workers left to their stuck turns
+        self.abandoned: set[int] = set()
+        self._queue: queue.SimpleQueue[tuple[Future[Any], Callable[[], Any]] | None] = (  # pyright: ignore[reportExplicitAny]
+            queue.SimpleQueue()
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self._shutdown: bool = False
+        for _ in range(max_workers):
+            self._start_worker()
+
+    def _start_worker(self) -> None:
+        worker = Thread(
+            target=self._work,
+            name=f"{self.thread_name_prefix}_{len(self.workers)}",
+            daemon=True,
+        )
+        self.workers.append(worker)
+        worker.start()
+
+    def _work(self) -> None:
+        while (item := self._queue.get()) is not None:
+            future, fn = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn()  # pyright: ignore[reportAny]
+            except BaseException as e:  # noqa: BLE001
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            del item, future, fn
+
+    @override
+    def submit[**P, T](
+        self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+    ) -> Future[T]:
+        future: Future[T] = Future()
+        with self._lock:
+            if self._shutdown:
+                error = "Can't submit turns after shutdown"
+                raise RuntimeError(error)
+            self._queue.put((future, functools.partial(fn, *args, **kwargs)))
+        return future
+
+    def replace_worker(self, thread_id: int) -> None:
+        """
+        Start a new worker in place of one stuck in a turn.
+
+        Args:
+            thread_id: Ident of the stuck worker, which isn't waited for on
+                shutdown.
+
+        """
+        with self._lock:
+            if self._shutdown or thread_id in self.abandoned:
+                return
+            self.abandoned.add(thread_id)
+            self._start_worker()
+
+    @override
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop the workers once the turns already submitted have run.
+
+        Args:
+            wait: Wait for the workers to stop, except those given up on.
+            cancel_futures: Cancel the turns that haven't started yet.
+
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            if cancel_futures:
+                with contextlib.suppress(queue.Empty):
+                    while (item := self._queue.get_nowait()) is not None:
+                        _ = item[0].cancel()
+            for _ in self.workers:
+                self._queue.put(None)
+        if wait:
+            for worker in self.workers:
+                if worker.ident not in self.abandoned:
+                    worker.join()
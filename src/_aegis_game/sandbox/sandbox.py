@@ -17,6 +17,8 @@ if TYPE_CHECKING:
     from pathlib import Path
     from types import CodeType
 
+    from .cache import CodeCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,12 +34,16 @@ class Sandbox:
         self.code: dict[str, CodeType] = code.copy()
 
     @classmethod
-    def from_directory_dict(cls, files: dict[str, str]) -> Sandbox:
+    def from_directory_dict(
+        cls, files: dict[str, str], cache: CodeCache | None = None
+    ) -> Sandbox:
         """
         Create CodeSandbox from a dictionary of filename -> source code mappings.
 
         Args:
             files: Dictionary mapping filenames to their source code content.
+            cache: Optional cache to load unchanged files from instead of
+                compiling them again.
 
         Returns:
             A new CodeSandbox instance with compiled modules.
@@ -56,6 +62,11 @@ class Sandbox:
             module_name = filename.removesuffix(".py")
             cleaned_source = cls._strip_stub_import(source)
 
+            cached = cache.get(filename, cleaned_source) if cache else None
+            if cached is not None:
+                code[module_name] = cached
+                continue
+
             try:
                 compiled = cast(
                     "CodeType",
@@ -71,16 +82,21 @@ class Sandbox:
                 raise CompilationError(error) from e
 
             code[module_name] = compiled
+            if cache is not None:
+                cache.put(filename, cleaned_source, compiled)
 
         return cls(code)
 
     @classmethod
-    def from_directory(cls, directory_path: Path) -> Sandbox:
+    def from_directory(
+        cls, directory_path: Path, cache: CodeCache | None = None
+    ) -> Sandbox:
         """
         Create CodeSandbox from a directory containing Python files.
 
         Args:
             directory_path: Path to directory containing Python files.
+            cache: Optional cache of previously compiled files.
 
         Returns:
             A new CodeSandbox instance with compiled modules from the directory.
@@ -111,7 +127,7 @@ class Sandbox:
             if not files:
                 LOGGER.warning(f"No readable Python files found in {directory_path}")
 
-            return cls.from_directory_dict(files)
+            return cls.from_directory_dict(files, cache)
 
         except OSError as e:
             error = f"Failed to access directory {directory_path}: {e}"
@@ -3,23 +3,91 @@
 from ast import (
     AST,
     AnnAssign,
+    Assign,
+    AsyncFor,
+    AsyncFunctionDef,
+    Attribute,
+    Break,
+    Call,
     ClassDef,
     Constant,
+    Continue,
+    ExceptHandler,
     Expr,
+    For,
+    FunctionDef,
+    Load,
     Name,
     ParamSpec,
+    Return,
+    Subscript,
+    Try,
+    Tuple,
     TypeAlias,
     TypeVar,
     TypeVarTuple,
+    While,
+    comprehension,
+    copy_location,
+    expr,
+    iter_child_nodes,
+    match_case,
     stmt,
 )
-from typing import override
+from collections.abc import Iterator
+from typing import TypeIs, override
 
 from RestrictedPython import RestrictingNodeTransformer
 
 
+def _is_public(node: expr) -> TypeIs[Constant]:
+    """Return whether `node` is a string literal the runtime guards would allow."""
+    return (
+        isinstance(node, Constant)
+        and isinstance(node.value, str)
+        and not node.value.startswith("_")
+    )
+
+
+def _jumps_out(body: list[stmt], *, in_loop: bool = False) -> Iterator[stmt]:
+    """Yield the `return`, `break` and `continue` statements that leave `body`."""
+    for node in body:
+        if isinstance(node, Return) or (
+            isinstance(node, Break | Continue) and not in_loop
+        ):
+            yield node
+        elif isinstance(node, FunctionDef | AsyncFunctionDef | ClassDef):
+            continue
+        elif isinstance(node, For | AsyncFor | While):
+            yield from _jumps_out(node.body, in_loop=True)
+            # `break` in a loop's `else` belongs to the loop around it
+            yield from _jumps_out(node.orelse, in_loop=in_loop)
+        else:
+            for child in iter_child_nodes(node):
+                if isinstance(child, ExceptHandler | match_case):
+                    yield from _jumps_out(child.body, in_loop=in_loop)
+                elif isinstance(child, stmt):
+                    yield from _jumps_out([child], in_loop=in_loop)
+
+
 class NodeTransformer(RestrictingNodeTransformer):
-    """Allow type annoation in RestrictedPython."""
+    """
+    Allow type annoation in RestrictedPython.
+
+    Also leaves out the calls to `_getiter_` and `_write_` RestrictedPython
+    wraps every loop, unpacking and attribute or item write in. `LumenCore`
+    makes both guards return their argument unchanged, so the calls only cost
+    agents a function call each time.
+
+    The calls to `_getattr_` and `_getitem_` are left out where their check
+    can be made now: literal attribute names and literal or tuple keys that
+    can be seen not to start with `_`. RestrictedPython lets the name `_`
+    itself compile, so it keeps its runtime check like every other private
+    name would.
+
+    `return`, `break` and `continue` are rejected inside `finally` blocks,
+    where they would swallow the interrupt that ends a turn over its time.
+    """
 
     def doc_str(self, node: stmt) -> str | None:
         if (
@@ -42,6 +110,64 @@ class NodeTransformer(RestrictingNodeTransformer):
             current_name = None
         return doc_strings
 
+    @override
+    def guard_iter(self, node: For | comprehension) -> AST:
+        # no `_getiter_`, or `_iter_unpack_sequence_` for tuple targets
+        return self.node_contents_visit(node)
+
+    @override
+    def visit_Assign(self, node: Assign) -> AST:
+        # no `_unpack_sequence_` for tuple targets
+        return self.node_contents_visit(node)
+
+    @override
+    def visit_Attribute(self, node: Attribute) -> AST:
+        new_node = self._without_write_guard(super().visit_Attribute(node))
+        guarded = self._guarded_load(new_node, "_getattr_")
+        if guarded is None:
+            return new_node
+        value, attr = guarded
+        if not _is_public(attr):
+            return new_node
+        return copy_location(Attribute(value, attr.value, Load()), node)
+
+    @override
+    def visit_Subscript(self, node: Subscript) -> AST:
+        new_node = self._without_write_guard(super().visit_Subscript(node))
+        guarded = self._guarded_load(new_node, "_getitem_")
+        if guarded is None:
+            return new_node
+        # only string keys are checked, a tuple or other literal can't be one
+        value, key = guarded
+        if isinstance(key, Tuple) or (
+            isinstance(key, Constant)
+            and (not isinstance(key.value, str) or _is_public(key))
+        ):
+            return copy_location(Subscript(value, key, Load()), node)
+        return new_node
+
+    def _guarded_load(self, node: AST, guard: str) -> tuple[expr, expr] | None:
+        """Return the object and name or key of a `guard(a, b)` call."""
+        if (
+            isinstance(node, Call)
+            and isinstance(node.func, Name)
+            and node.func.id == guard
+            and len(node.args) == 2  # noqa: PLR2004
+        ):
+            return node.args[0], node.args[1]
+        return None
+
+    def _without_write_guard(self, node: AST) -> AST:
+        """Turn `_write_(a).b` or `_write_(a)[b]` back into `a.b` or `a[b]`."""
+        if (
+            isinstance(node, Attribute | Subscript)
+            and isinstance(node.value, Call)
+            and isinstance(node.value.func, Name)
+            and node.value.func.id == "_write_"
+        ):
+            node.value = node.value.args[0]
+        return node
+
     @override
     def visit_AnnAssign(self, node: AnnAssign) -> AST:
         return self.node_contents_visit(node)
@@ -62,6 +188,23 @@ class NodeTransformer(RestrictingNodeTransformer):
     def visit_ParamSpec(self, node: ParamSpec) -> AST:
         return self.node_contents_visit(node)
 
+    @override
+    def visit_ExceptHandler(self, node: ExceptHandler) -> AST:
+        # A bare `except:` would also catch the engine's turn timeout interrupt
+        if node.type is None:
+            node.type = copy_location(Name(id="Exception", ctx=Load()), node)
+        return super().visit_ExceptHandler(node)
+
+    @override
+    def visit_Try(self, node: Try) -> AST:
+        # Leaving a `finally` block discards the exception being raised,
+        # including the engine's turn timeout interrupt
+        for jump in _jumps_out(node.finalbody):
+            self.error(
+                jump, f"'{type(jump).__name__.lower()}' in 'finally' is not allowed."
+            )
+        return super().visit_Try(node)
+
     @override
     def visit_ClassDef(self, node: ClassDef) -> stmt:
         # find attribute docs in this class definition
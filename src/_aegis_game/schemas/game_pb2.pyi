@@ -32,30 +32,40 @@ class GamesHeader(_message.Message):
     def __init__(self) -> None: ...
 
 class GameHeader(_message.Message):
-    __slots__ = ("world", "rounds", "spawns")
+    __slots__ = ("world", "rounds", "spawns", "start_round", "team_info", "agents", "drone_scans")
     WORLD_FIELD_NUMBER: _ClassVar[int]
     ROUNDS_FIELD_NUMBER: _ClassVar[int]
     SPAWNS_FIELD_NUMBER: _ClassVar[int]
+    START_ROUND_FIELD_NUMBER: _ClassVar[int]
+    TEAM_INFO_FIELD_NUMBER: _ClassVar[int]
+    AGENTS_FIELD_NUMBER: _ClassVar[int]
+    DRONE_SCANS_FIELD_NUMBER: _ClassVar[int]
     world: _world_pb2.World
     rounds: int
     spawns: _containers.RepeatedCompositeFieldContainer[_spawn_pb2.Spawn]
-    def __init__(self, world: _Optional[_Union[_world_pb2.World, _Mapping]] = ..., rounds: _Optional[int] = ..., spawns: _Optional[_Iterable[_Union[_spawn_pb2.Spawn, _Mapping]]] = ...) -> None: ...
+    start_round: int
+    team_info: _containers.RepeatedCompositeFieldContainer[_team_pb2.TeamInfo]
+    agents: _containers.RepeatedCompositeFieldContainer[_turn_pb2.Turn]
+    drone_scans: _containers.RepeatedCompositeFieldContainer[DroneScan]
+    def __init__(self, world: _Optional[_Union[_world_pb2.World, _Mapping]] = ..., rounds: _Optional[int] = ..., spawns: _Optional[_Iterable[_Union[_spawn_pb2.Spawn, _Mapping]]] = ..., start_round: _Optional[int] = ..., team_info: _Optional[_Iterable[_Union[_team_pb2.TeamInfo, _Mapping]]] = ..., agents: _Optional[_Iterable[_Union[_turn_pb2.Turn, _Mapping]]] = ..., drone_scans: _Optional[_Iterable[_Union[DroneScan, _Mapping]]] = ...) -> None: ...
 
 class Round(_message.Message):
-    __slots__ = ("round", "layers_removed", "dead_ids", "turns", "team_info", "drone_scans")
+    __slots__ = ("round", "layers_removed", "dead_ids", "turns", "team_info", "drone_scans_started", "drone_scans_expired")
     ROUND_FIELD_NUMBER: _ClassVar[int]
     LAYERS_REMOVED_FIELD_NUMBER: _ClassVar[int]
     DEAD_IDS_FIELD_NUMBER: _ClassVar[int]
     TURNS_FIELD_NUMBER: _ClassVar[int]
     TEAM_INFO_FIELD_NUMBER: _ClassVar[int]
-    DRONE_SCANS_FIELD_NUMBER: _ClassVar[int]
+    DRONE_SCANS_STARTED_FIELD_NUMBER: _ClassVar[int]
+    DRONE_SCANS_EXPIRED_FIELD_NUMBER: _ClassVar[int]
     round: int
     layers_removed: _containers.RepeatedCompositeFieldContainer[_location_pb2.Location]
     dead_ids: _containers.RepeatedScalarFieldContainer[int]
     turns: _containers.RepeatedCompositeFieldContainer[_turn_pb2.Turn]
     team_info: _containers.RepeatedCompositeFieldContainer[_team_pb2.TeamInfo]
-    drone_scans: _containers.RepeatedCompositeFieldContainer[DroneScan]
-    def __init__(self, round: _Optional[int] = ..., layers_removed: _Optional[_Iterable[_Union[_location_pb2.Location, _Mapping]]] = ..., dead_ids: _Optional[_Iterable[int]] = ..., turns: _Optional[_Iterable[_Union[_turn_pb2.Turn, _Mapping]]] = ..., team_info: _Optional[_Iterable[_Union[_team_pb2.TeamInfo, _Mapping]]] = ..., drone_scans: _Optional[_Iterable[_Union[DroneScan, _Mapping]]] = ...) -> None: ...
+    drone_scans_started: _containers.RepeatedCompositeFieldContainer[DroneScan]
+    drone_scans_expired: _containers.RepeatedCompositeFieldContainer[DroneScan]
+    def __init__(self, round: _Optional[int] = ..., layers_removed: _Optional[_Iterable[_Union[_location_pb2.Location, _Mapping]]] = ..., dead_ids: _Optional[_Iterable[int]] = ..., turns: _Optional[_Iterable[_Union[_turn_pb2.Turn, _Mapping]]] = ..., team_info: _Optional[_Iterable[_Union[_team_pb2.TeamInfo, _Mapping]]] = ..., drone_scans_started: _Optional[_Iterable[_Union[DroneScan, _Mapping]]] = ..., drone_scans_expired: _Optional[_Iterable[_Union[DroneScan, _Mapping]]] = ...) -> None: ...
 
 class GameFooter(_message.Message):
     __slots__ = ()
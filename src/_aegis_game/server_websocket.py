@@ -1,105 +1,372 @@
-# pyright: reportMissingTypeStubs = false
+import asyncio
 import base64
-import queue
+import contextlib
+import itertools
 import threading
-import time
-from typing import NamedTuple
+from concurrent.futures import Future
+from enum import Enum
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import parse_qs, urlsplit
 
-from websocket_server import WebsocketServer
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
 
 from .logger import LOGGER
+from .types import Backpressure
 
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
 
-class Client(NamedTuple):
-    """Represents a connected client."""
+DEFAULT_QUEUE_SIZE = 256
+SHUTDOWN_TIMEOUT = 10.0
+# Clients only send control frames, anything bigger is a broken client
+MAX_CLIENT_MESSAGE = 0xFFFF
 
-    id: int
-    handler: object
-    address: str
+
+class OutgoingEvent(NamedTuple):
+    """A serialized event waiting to be sent."""
+
+    data: bytes
+    broadcast: bool
+    keyframe: bool
+
+
+class EventFrames:
+    """
+    A serialized event and its payloads, built at most once per transport.
+
+    Every client on the same transport is sent the same bytes, so fanning an
+    event out to many clients doesn't re-encode it for each of them.
+    """
+
+    def __init__(self, seq: int, data: bytes) -> None:
+        self.seq: int = seq
+        self.data: bytes = data
+
+    @cached_property
+    def text(self) -> bytes:
+        return base64.b64encode(self.data)
+
+
+class _Signal(Enum):
+    CATCH_UP = "catch_up"
+    CLOSE = "close"
+
+
+class Client:
+    """
+    A connected client and the events waiting to be sent to it.
+
+    A client is `stale` until it has been sent the catch-up stream, and again
+    whenever it falls behind. Stale clients are not queued new events, the
+    catch-up stream already includes them.
+    """
+
+    def __init__(
+        self,
+        client_id: int,
+        connection: ServerConnection,
+        *,
+        binary: bool,
+        queue_size: int,
+    ) -> None:
+        self.id: int = client_id
+        self.connection: ServerConnection = connection
+        self.binary: bool = binary
+        self.queue: asyncio.Queue[EventFrames | _Signal] = asyncio.Queue(queue_size)
+        self.stale: bool = True
+        # sequence number of the last event sent, -1 before the first
+        self.sent: int = -1
+        self.closed: asyncio.Event = asyncio.Event()
+
+    async def send(self, event: EventFrames) -> None:
+        """Send an event in the transport the client negotiated."""
+        if self.binary:
+            await self.connection.send(event.data)
+        else:
+            await self.connection.send(event.text, text=True)
+        self.sent = event.seq
+
+    def clear(self) -> None:
+        """Discard every queued event."""
+        while not self.queue.empty():
+            _ = self.queue.get_nowait()
 
 
 class WebSocketServer:
-    def __init__(self, *, wait_for_client: bool) -> None:
-        """Initialize a new server."""
+    def __init__(
+        self,
+        *,
+        wait_for_client: bool,
+        backpressure: Backpressure = Backpressure.DROP,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        port: int = 6003,
+    ) -> None:
+        """
+        Initialize a new server.
+
+        Args:
+            wait_for_client: Whether to serve events and wait for a client.
+            backpressure: What to do when a client's send queue is full.
+            queue_size: Number of events queued per client before
+                `backpressure` applies.
+            port: Port to listen on, 0 picks a free one.
+
+        """
         self._host: str = "localhost"
-        self._port: int = 6003
+        self.port: int = port
         self._wait_for_client: bool = wait_for_client
-        self._connected: bool = False
+        self._backpressure: Backpressure = backpressure
+        self._queue_size: int = queue_size
         self._done: bool = False
-        self._server: WebsocketServer | None = None
-        self._previous_events: list[str] = []
-        self._incoming_events: queue.Queue[str] = queue.Queue()
-        self._queue_thread: threading.Thread = threading.Thread(
-            target=self._process_queue,
-        )
-        self._lock: threading.Lock = threading.Lock()
-
-    def _process_queue(self) -> None:
-        """Events to process that are in the event queue."""
-        try:
-            while not self._done:
-                try:
-                    event = self._incoming_events.get(timeout=0.3)
-                    self._process_event(event)
-                except queue.Empty:
-                    pass
-
-            while not self._incoming_events.empty():
-                event = self._incoming_events.get()
-                self._process_event(event)
-        except (OSError, RuntimeError) as e:
-            LOGGER.exception("Error processing queue: %s", e)
-
-    def _process_event(self, event: str) -> None:
-        if self._server is not None:
-            with self._lock:
-                for client in self._server.clients:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-                    self._server.send_message(client, event)  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
-                self._previous_events.append(event)
+        self._connected: threading.Event = threading.Event()
+        # set once `port` is bound, for callers running `start` on a thread
+        self.listening: threading.Event = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: Server | None = None
+        self._thread: threading.Thread | None = None
+        self._clients: set[Client] = set()
+        self._client_ids: itertools.count[int] = itertools.count()
+        # What clients joining or falling behind are caught up from: the
+        # GamesHeader, the current game's header, the latest keyframe within
+        # that game and every event since the later of the two
+        self._seq: int = -1
+        self._games_header: EventFrames | None = None
+        self._game_header: EventFrames | None = None
+        self._keyframe: EventFrames | None = None
+        self._backlog: list[EventFrames] = []
 
-    def add_event(self, event: bytes) -> None:
+    def _put(self, event: bytes, *, broadcast: bool, keyframe: bool) -> None:
         if self._done:
             error = "Can't add event, server already finished!"
             raise RuntimeError(error)
-        encoded_event = base64.b64encode(event).decode("utf-8")
-        self._incoming_events.put(encoded_event)
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(
+            self._dispatch(OutgoingEvent(event, broadcast, keyframe)), self._loop
+        )
+        if self._backpressure is Backpressure.BLOCK:
+            future.result()
+        else:
+            future.add_done_callback(self._log_failure)
 
-    def _on_open(self, client: dict[str, object], server: WebsocketServer) -> None:
-        self._connected = True
-        for event in self._previous_events:
-            server.send_message(client, event)  # pyright: ignore[reportUnknownMemberType]
+    @staticmethod
+    def _log_failure(future: Future[None]) -> None:
+        if not future.cancelled() and (e := future.exception()) is not None:
+            LOGGER.error("Error sending event: %s", e)
 
-    def start(self) -> None:
-        if not self._wait_for_client:
+    def add_event(self, event: bytes, *, keyframe: bool = False) -> None:
+        """
+        Send an event to every connected client.
+
+        Args:
+            event: The serialized event.
+            keyframe: Whether the event starts a game, so clients connecting
+                later no longer need the game events before it.
+
+        """
+        self._put(event, broadcast=True, keyframe=keyframe)
+
+    def has_clients(self) -> bool:
+        """Check whether the server is running with at least one client connected."""
+        return self._loop is not None and bool(self._clients)
+
+    def set_keyframe(self, event: bytes) -> None:
+        """
+        Replace the current game in the catch-up stream with a snapshot of it.
+
+        The event is not sent to connected clients, which already have the
+        state it describes.
+
+        Args:
+            event: The serialized event describing the current game.
+
+        """
+        self._put(event, broadcast=False, keyframe=True)
+
+    async def _dispatch(self, event: OutgoingEvent) -> None:
+        if not event.broadcast:
+            # covers every event sent so far, so it takes the latest number
+            self._keyframe = EventFrames(self._seq, event.data)
+            self._backlog.clear()
             return
 
-        self._server = WebsocketServer(self._host, self._port)
-        self._server.set_fn_new_client(self._on_open)  # pyright: ignore[reportUnknownMemberType]
+        self._seq += 1
+        frames = EventFrames(self._seq, event.data)
+        if self._games_header is None:
+            self._games_header = frames
+        elif event.keyframe:
+            self._game_header = frames
+            self._keyframe = None
+            self._backlog.clear()
+        else:
+            self._backlog.append(frames)
+
+        blocked: list[Coroutine[None, None, None]] = []
+        for client in list(self._clients):
+            if client.stale:
+                continue
+            if not client.queue.full():
+                client.queue.put_nowait(frames)
+            elif self._backpressure is Backpressure.BLOCK:
+                blocked.append(client.queue.put(frames))
+            else:
+                self._fall_behind(client)
+        # wait on every full client at once rather than one after another
+        _ = await asyncio.gather(*blocked)
+
+    def _fall_behind(self, client: Client) -> None:
+        """
+        Stop queueing events for a client whose queue is full.
+
+        It is caught up once its writer reaches the end of the queue, after
+        discarding it first if the policy is to drop.
+        """
+        LOGGER.warning(f"Client {client.id} fell behind, catching it up")
+        if self._backpressure is Backpressure.DROP:
+            client.clear()
+            # wake a writer waiting on the queue it just emptied
+            client.queue.put_nowait(_Signal.CATCH_UP)
+        client.stale = True
+
+    def _catch_up_events(self, client: Client) -> list[EventFrames]:
+        """
+        Return the events that bring a client from what it was last sent to now.
+
+        A client that already has the current game is only sent the events it
+        missed, or the latest keyframe and the events after it if it missed
+        the ones before that keyframe. It is never sent the GamesHeader again,
+        which would make it start over and lose the games before this one.
+        """
+        events: list[EventFrames] = []
+        games_header = self._games_header
+        if games_header is not None and games_header.seq > client.sent:
+            events.append(games_header)
+        # the first event after the GamesHeader is always a game's header
+        has_game = games_header is not None and client.sent > games_header.seq
+
+        game_header = self._game_header
+        missed_start = game_header is not None and game_header.seq > client.sent
+        # a keyframe replaces the client's current game, so a client still on
+        # an earlier game gets this game's header first
+        if (
+            game_header is not None
+            and missed_start
+            and (self._keyframe is None or has_game)
+        ):
+            events.append(game_header)
+
+        if self._keyframe is not None and self._keyframe.seq > client.sent:
+            events.append(self._keyframe)
+            events.extend(self._backlog)
+        else:
+            events.extend(e for e in self._backlog if e.seq > client.sent)
+        return events
+
+    async def _catch_up(self, client: Client) -> None:
+        client.stale = False
+        for event in self._catch_up_events(client):
+            await client.send(event)
+
+    async def _write_loop(self, client: Client) -> None:
+        # the handler sees the connection drop and removes the client
+        with contextlib.suppress(ConnectionClosed):
+            await self._write_events(client)
 
-        self._queue_thread.start()
-        self._server.run_forever(threaded=True)
+    async def _write_events(self, client: Client) -> None:
+        while True:
+            if client.stale and client.queue.empty():
+                await self._catch_up(client)
+                continue
 
-        while not self._connected:
-            time.sleep(0.3)
+            item = await client.queue.get()
+            if item is _Signal.CATCH_UP:
+                continue
+            if item is _Signal.CLOSE:
+                if client.stale:
+                    await self._catch_up(client)
+                await client.connection.close()
+                return
 
-    def shutdown_gracefully(self) -> None:
-        if self._server is None:
+            await client.send(item)
+
+    async def _on_connection(self, connection: ServerConnection) -> None:
+        query = parse_qs(urlsplit(connection.request.path).query)  # pyright: ignore[reportOptionalMemberAccess]
+        client = Client(
+            next(self._client_ids),
+            connection,
+            binary=query.get("transport") == ["binary"],
+            queue_size=self._queue_size,
+        )
+        self._clients.add(client)
+        self._connected.set()
+        write_task = asyncio.create_task(self._write_loop(client))
+        try:
+            # clients have nothing to say, pings and closes are answered for us
+            async for _ in connection:
+                pass
+        except ConnectionClosed as e:
+            LOGGER.warning(f"Client {client.id} disconnected: {e}")
+        finally:
+            self._clients.discard(client)
+            # unblock a dispatch waiting on the queue of a client that is gone
+            client.clear()
+            _ = write_task.cancel()
+            client.closed.set()
+
+    async def _shutdown(self) -> None:
+        clients = list(self._clients)
+        try:
+            async with asyncio.timeout(SHUTDOWN_TIMEOUT):
+                for client in clients:
+                    await client.queue.put(_Signal.CLOSE)
+                _ = await asyncio.gather(*(client.closed.wait() for client in clients))
+        except TimeoutError:
+            LOGGER.warning("Timed out waiting for clients to disconnect")
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self) -> Server:
+        return await serve(
+            self._on_connection,
+            self._host,
+            self.port,
+            # every client is sent the same events, compressing them for each
+            # one would cost more than the bandwidth it saves
+            compression=None,
+            max_size=MAX_CLIENT_MESSAGE,
+        )
+
+    def start(self) -> None:
+        if not self._wait_for_client:
             return
-        self._server.keep_alive = False
-        self._server._disconnect_clients_gracefully(1000, bytes("", encoding="utf-8"))  # pyright: ignore[reportPrivateUsage]  # noqa: SLF001
-        # These bottom two are flipped from regular order in websocket_server
-        self._server.shutdown()
-        self._server.server_close()
+
+        loop = asyncio.new_event_loop()
+        self._server = loop.run_until_complete(self._serve())
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+        self._loop = loop
+        self._thread = threading.Thread(target=loop.run_forever, daemon=True)
+        self._thread.start()
+        self.listening.set()
+
+        _ = self._connected.wait()
 
     def finish(self) -> None:
         if not self._wait_for_client:
             return
         self._done = True
+        if self._loop is None or self._thread is None:
+            return
         try:
-            self._queue_thread.join()
-            self.shutdown_gracefully()
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
         except (OSError, RuntimeError) as e:
             LOGGER.exception("Error shutting down server: %s", e)
+        finally:
+            _ = self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
 
     def set_wait_for_client(self) -> None:
         self._wait_for_client = True
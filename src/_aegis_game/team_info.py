@@ -65,3 +65,12 @@ class TeamInfo:
 
     def add_lumens(self, team: Team, amount: int) -> None:
         self._add(self._lumens, team, amount)
+
+    def snapshot(self) -> dict[str, list[int]]:
+        """Capture every counter of both teams."""
+        return {name: list(values) for name, values in vars(self).items()}
+
+    def restore(self, snapshot: dict[str, list[int]]) -> None:
+        """Replace every counter of both teams with a snapshot."""
+        for name, values in snapshot.items():
+            setattr(self, name, list(values))
@@ -0,0 +1,243 @@
+import csv
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from functools import cache
+from pathlib import Path
+
+from .args_parser import LaunchArgs, TournamentArgs
+from .game import Game
+from .game_pb import HeadlessGamePb
+from .logger import AGENT_LOGGER, LOGGER, setup_console_logging
+from .play import load_named_world, run_rounds
+from .sandbox.cache import CodeCache
+from .sandbox.sandbox import Sandbox, SandboxError
+from .team import Team
+from .types import ExecMode
+from .world_binary import WorldCache
+
+
+@dataclass(frozen=True)
+class Matchup:
+    """A single game to run in a tournament."""
+
+    agent: str | None
+    agent2: str | None
+    world: str
+    seed: int | None
+
+
+@dataclass
+class MatchResult:
+    """The outcome of a single tournament game."""
+
+    agent: str | None
+    agent2: str | None
+    world: str
+    seed: int | None
+    rounds: int
+    reason: str
+    goobs_score: int
+    goobs_saved: int
+    voidseers_score: int
+    voidseers_saved: int
+    error: str = ""
+
+
+# Sandboxes compiled once per worker process by `_init_worker`
+_worker_sandboxes: dict[str, Sandbox] = {}
+# Why each agent that couldn't be compiled failed
+_worker_errors: dict[str, str] = {}
+
+
+@cache
+def _worker_worlds() -> WorldCache:
+    """Return the worlds loaded once per worker process and copied for each game."""
+    return WorldCache()
+
+
+def _init_worker(agents: list[str]) -> None:
+    """
+    Compile every agent once per worker and silence per-game logging.
+
+    An agent that fails to compile is recorded in `_worker_errors` rather than
+    raised, which would break the pool and end every other game with it.
+    """
+    LOGGER.setLevel(logging.WARNING)
+    AGENT_LOGGER.setLevel(logging.ERROR)
+    code_cache = CodeCache()
+    for agent in agents:
+        try:
+            _worker_sandboxes[agent] = Sandbox.from_directory(
+                Path.cwd() / "agents" / agent, code_cache
+            )
+        except (SandboxError, OSError) as e:
+            _worker_errors[agent] = f"Agent '{agent}' failed to compile: {e}"
+
+
+def _run_matchup(matchup: Matchup, amount: int, rounds: int) -> MatchResult:
+    """Run one headless game in a worker process."""
+    args = LaunchArgs(
+        amount=amount,
+        world=[matchup.world],
+        rounds=rounds,
+        agent=matchup.agent,
+        agent2=matchup.agent2,
+        client=False,
+        debug=False,
+        log=False,
+        headless=True,
+        exec_mode=ExecMode.POOL,
+    )
+    result = MatchResult(
+        agent=matchup.agent,
+        agent2=matchup.agent2,
+        world=matchup.world,
+        seed=matchup.seed,
+        rounds=0,
+        reason="",
+        goobs_score=0,
+        goobs_saved=0,
+        voidseers_score=0,
+        voidseers_saved=0,
+    )
+
+    for agent in (matchup.agent, matchup.agent2):
+        if agent in _worker_errors:
+            result.error = _worker_errors[agent]
+            return result
+
+    try:
+        world = load_named_world(matchup.world, _worker_worlds())
+        world.rounds = rounds
+        if matchup.seed is not None:
+            world.seed = matchup.seed
+
+        code = [
+            _worker_sandboxes.get(matchup.agent) if matchup.agent else None,
+            _worker_sandboxes.get(matchup.agent2) if matchup.agent2 else None,
+        ]
+        game = Game(code, args, world, HeadlessGamePb())
+        run_rounds(game)
+    except Exception as e:  # noqa: BLE001
+        result.error = str(e)
+        return result
+
+    result.rounds = game.round
+    result.reason = getattr(game.reason, "value", "Unknown")
+    result.goobs_score = game.team_info.get_score(Team.GOOBS)
+    result.goobs_saved = game.team_info.get_saved(Team.GOOBS)
+    result.voidseers_score = game.team_info.get_score(Team.VOIDSEERS)
+    result.voidseers_saved = game.team_info.get_saved(Team.VOIDSEERS)
+    return result
+
+
+def _match_label(result: MatchResult) -> str:
+    if result.agent2 is None:
+        return f"{result.agent}"
+    return f"{result.agent} vs {result.agent2}"
+
+
+def make_matchups(args: TournamentArgs) -> list[Matchup]:
+    """Build the agents x worlds x seeds matrix of games to run."""
+    if args.versus:
+        pairings: list[tuple[str | None, str | None]] = list(
+            itertools.permutations(args.agents, 2)
+        )
+    else:
+        pairings = [(agent, None) for agent in args.agents]
+
+    seeds: list[int | None] = list(args.seeds) if args.seeds else [None]
+
+    return [
+        Matchup(agent, agent2, world, seed)
+        for (agent, agent2), world, seed in itertools.product(
+            pairings, args.world, seeds
+        )
+    ]
+
+
+def write_results_csv(results: list[MatchResult], path: Path) -> None:
+    """Write one row per game to a CSV file."""
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(MatchResult.__dataclass_fields__))
+        writer.writeheader()
+        for result in results:
+            writer.writerow(asdict(result))
+
+
+def log_standings(results: list[MatchResult]) -> None:
+    """Log the total score and saved survivors of every agent."""
+    totals: dict[str, list[int]] = {}
+    for result in results:
+        if result.error:
+            continue
+        for agent, score, saved in (
+            (result.agent, result.goobs_score, result.goobs_saved),
+            (result.agent2, result.voidseers_score, result.voidseers_saved),
+        ):
+            if agent is None:
+                continue
+            games, total_score, total_saved = totals.get(agent, [0, 0, 0])
+            totals[agent] = [games + 1, total_score + score, total_saved + saved]
+
+    LOGGER.info("========== TOURNAMENT END ==========")
+    LOGGER.info(f"{'Agent':<24} {'Games':>6} {'Score':>8} {'Avg':>8} {'Saved':>8}")
+    LOGGER.info("-" * 58)
+    standings = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+    for agent, (games, score, saved) in standings:
+        LOGGER.info(
+            f"{agent:<24} {games:>6} {score:>8} {score / games:>8.1f} {saved:>8}"
+        )
+    LOGGER.info("=" * 58)
+
+    errors = [result for result in results if result.error]
+    for result in errors:
+        LOGGER.warning(
+            f"{_match_label(result)} on {result.world} failed: {result.error}"
+        )
+
+
+def run_tournament(args: TournamentArgs) -> None:
+    setup_console_logging()
+
+    matchups = make_matchups(args)
+    if not matchups:
+        error = "No games to run, versus mode needs at least two agents"
+        raise ValueError(error)
+
+    workers = args.workers or os.cpu_count() or 1
+    LOGGER.info(f"Running {len(matchups)} games across {workers} workers")
+
+    results: list[MatchResult] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args.agents,),
+    ) as executor:
+        futures = [
+            executor.submit(_run_matchup, matchup, args.amount, args.rounds)
+            for matchup in matchups
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            LOGGER.info(
+                f"[{done}/{len(matchups)}] {_match_label(result)} "
+                f"on {result.world} (seed {result.seed}) finished"
+            )
+
+    results.sort(
+        key=lambda r: (
+            r.agent or "",
+            r.agent2 or "",
+            r.world,
+            r.seed if r.seed is not None else -1,
+        )
+    )
+    if args.output is not None:
+        write_results_csv(results, Path(args.output))
+        LOGGER.info(f"Wrote results to {args.output}")
+    log_standings(results)
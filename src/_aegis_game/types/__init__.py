@@ -1,3 +1,19 @@
-__all__ = ["AegisConfig", "CellType", "FeatureKey", "GameOverReason", "MethodDict"]
+__all__ = [
+    "AegisConfig",
+    "Backpressure",
+    "CellType",
+    "ExecMode",
+    "FeatureKey",
+    "GameOverReason",
+    "MethodDict",
+]
 
-from .others import AegisConfig, CellType, FeatureKey, GameOverReason, MethodDict
+from .others import (
+    AegisConfig,
+    Backpressure,
+    CellType,
+    ExecMode,
+    FeatureKey,
+    GameOverReason,
+    MethodDict,
+)
@@ -27,6 +27,28 @@ class GameOverReason(Enum):
     MAX_ROUNDS_REACHED = "Maximum number of rounds reached"
 
 
+class ExecMode(Enum):
+    """How agent turns are executed."""
+
+    THREAD = "thread"
+    """One dedicated thread per agent."""
+    POOL = "pool"
+    """Turns run on a small worker pool shared by every agent in the game."""
+    INLINE = "inline"
+    """Turns run directly on the game thread."""
+
+
+class Backpressure(Enum):
+    """What the event server does when a client's send queue is full."""
+
+    BLOCK = "block"
+    """Wait for the client, slowing the game down to its pace."""
+    DROP = "drop"
+    """Discard the queued events and catch the client up from where it was."""
+    COALESCE = "coalesce"
+    """Send what is queued, then only the events that didn't fit."""
+
+
 FeatureKey = Literal[
     "ALLOW_AGENT_PREDICTIONS",
     "ALLOW_AGENT_MESSAGES",
@@ -1,5 +1,70 @@
-from .common import Cell, Location
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, overload, override
+
+from .common import Cell
 from .constants import Constants
+from .world_grid import WorldGrid
+
+if TYPE_CHECKING:
+    from .common import Location
+    from .common.objects import WorldObject
+
+
+def _copy_cell(cell: Cell) -> Cell:
+    copied = Cell(cell.location.x, cell.location.y)
+    copied.type = cell.type
+    copied.move_cost = cell.move_cost
+    copied.agents = list(cell.agents)
+    copied.layers = [copy.copy(layer) for layer in cell.layers]
+    return copied
+
+
+class CopyOnWriteCells(Sequence[Cell]):
+    """
+    The cells of a copied world, shared with the original until touched.
+
+    Cells are mutated in place by whoever accesses them, so each cell is
+    copied the first time it is accessed instead of the first time it is
+    written. Cells a game never touches are never copied, and `peek` reads
+    cells without copying them.
+    """
+
+    def __init__(self, template: Sequence[Cell]) -> None:
+        self._template: Sequence[Cell] = template
+        self._cells: dict[int, Cell] = {}
+
+    @override
+    def __len__(self) -> int:
+        return len(self._template)
+
+    @overload
+    def __getitem__(self, index: int) -> Cell: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Cell]: ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> Cell | list[Cell]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        index = range(len(self))[index]
+        cell = self._cells.get(index)
+        if cell is None:
+            cell = self._cells[index] = _copy_cell(self._template[index])
+        return cell
+
+    def peek(self, index: int) -> Cell:
+        """Return a cell as it is now without copying it, for reading only."""
+        cell = self._cells.get(index)
+        return cell if cell is not None else self._template[index]
+
+    def copied(self) -> int:
+        """Return how many cells have been copied so far."""
+        return len(self._cells)
 
 
 class World:
@@ -9,20 +74,78 @@ class World:
         height: int,
         seed: int,
         start_energy: int,
-        cells: list[Cell],
+        cells: Sequence[Cell],
         init_spawns: dict[Location, int],
+        *,
+        grid: WorldGrid | None = None,
     ) -> None:
         self.width: int = width
         self.height: int = height
         self.rounds: int = Constants.DEFAULT_MAX_ROUNDS
         self.seed: int = seed
         self.start_energy: int = start_energy
-        self.cells: list[Cell] = cells
-        self.total_survivors: int = sum(cell.number_of_survivors() for cell in cells)
+        self.cells: Sequence[Cell] = cells
         self.init_spawns: dict[Location, int] = init_spawns
 
         self._validate_map()
 
+        self.grid: WorldGrid = (
+            grid if grid is not None else WorldGrid.from_cells(cells, width, height)
+        )
+        self.total_survivors: int = int(self.grid.survivors.sum())
+
+    def copy(self) -> World:
+        """
+        Return a world for another game that shares the cells of this one.
+
+        The grid arrays are copied up front and cells when first accessed, so
+        neither world sees the other's changes.
+        """
+        world = World(
+            self.width,
+            self.height,
+            self.seed,
+            self.start_energy,
+            CopyOnWriteCells(self.cells),
+            dict(self.init_spawns),
+            grid=self.grid.copy(),
+        )
+        world.rounds = self.rounds
+        world.total_survivors = self.total_survivors
+        return world
+
+    def peek_cell(self, index: int) -> Cell:
+        """
+        Return the cell at `index` in `cells` for reading only.
+
+        Unlike indexing `cells`, this doesn't copy a cell still shared with
+        the world this one was copied from, so it must not be mutated.
+        """
+        if isinstance(self.cells, CopyOnWriteCells):
+            return self.cells.peek(index)
+        return self.cells[index]
+
+    def peek_cells(self) -> Iterator[Cell]:
+        """Iterate every cell for reading only, see `peek_cell`."""
+        return (self.peek_cell(index) for index in range(len(self.cells)))
+
+    def get_cell_at(self, loc: Location) -> Cell:
+        return self.cells[loc.x + loc.y * self.width]
+
+    def add_agent_at(self, loc: Location, agent_id: int) -> None:
+        self.get_cell_at(loc).agents.append(agent_id)
+        self.grid.agent_count[loc.y, loc.x] += 1
+
+    def remove_agent_at(self, loc: Location, agent_id: int) -> None:
+        self.get_cell_at(loc).agents.remove(agent_id)
+        self.grid.agent_count[loc.y, loc.x] -= 1
+
+    def remove_top_layer(self, loc: Location) -> WorldObject:
+        cell = self.get_cell_at(loc)
+        layer = cell.remove_top_layer()
+        self.grid.update_layers(cell)
+        return layer
+
     def _validate_map(self) -> None:
         min_size = Constants.WORLD_MIN
         max_size = Constants.WORLD_MAX
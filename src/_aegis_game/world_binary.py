@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, overload, override
+
+import numpy as np
+
+from .common import Cell, Location
+from .common.objects import Rubble, Survivor
+from .logger import LOGGER
+from .types import CellType
+from .world import World
+from .world_grid import LayerKind, WorldGrid, top_layer_kind
+from .world_pb import load_world
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# relative to the directory games are run from
+CACHE_DIR = Path(".aegis_cache") / "worlds"
+MAGIC = b"AEGISWLD"
+VERSION = 1
+
+# File layout:
+#   header - magic, version, width, height, seed, start energy, table lengths
+#   cells  - one CELL_DTYPE record per cell, in `World.cells` order
+#   layers - the layers of each cell, contiguous and top layer first
+#   agents - ids of the agents the world file places on cells
+#   spawns - the initial spawn locations
+_HEADER = struct.Struct("<8sHiiiiIII")
+CELL_DTYPE = np.dtype(
+    [
+        ("move_cost", "<i4"),
+        ("type", "i1"),
+        ("top_layer", "i1"),
+        ("survivors", "<i2"),
+        ("layer_start", "<u4"),
+        ("layer_count", "<u4"),
+        ("agent_start", "<u4"),
+        ("agent_count", "<u4"),
+    ]
+)
+# `value` is the health of a survivor or the energy required by rubble
+LAYER_DTYPE = np.dtype(
+    [("kind", "i1"), ("id", "<i4"), ("value", "<i4"), ("agents_required", "<i4")]
+)
+AGENT_DTYPE = np.dtype("<i4")
+SPAWN_DTYPE = np.dtype([("x", "<i4"), ("y", "<i4"), ("amount", "<i4")])
+
+
+class LazyCells(Sequence[Cell]):
+    """
+    The cells of a mapped world, each built from its records on first access.
+
+    Games only touch the cells agents interact with, the rest of the world is
+    served from the `WorldGrid` arrays and never becomes `Cell` objects.
+    """
+
+    def __init__(
+        self,
+        records: NDArray[np.void],
+        layers: NDArray[np.void],
+        agents: NDArray[np.int32],
+        width: int,
+    ) -> None:
+        self._records: NDArray[np.void] = records
+        self._layers: NDArray[np.void] = layers
+        self._agents: NDArray[np.int32] = agents
+        self._width: int = width
+        self._cells: list[Cell | None] = [None] * len(records)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @overload
+    def __getitem__(self, index: int) -> Cell: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Cell]: ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> Cell | list[Cell]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        index = range(len(self))[index]
+        cell = self._cells[index]
+        if cell is None:
+            cell = self._cells[index] = self._build(index)
+        return cell
+
+    def materialized(self) -> int:
+        """Return how many cells have been built so far."""
+        return sum(cell is not None for cell in self._cells)
+
+    def _build(self, index: int) -> Cell:
+        record = self._records[index]
+        cell = Cell(index % self._width, index // self._width)
+        cell.type = CellType(int(record["type"]))
+        cell.move_cost = int(record["move_cost"])
+
+        agent_start = int(record["agent_start"])
+        agent_end = agent_start + int(record["agent_count"])
+        cell.agents = self._agents[agent_start:agent_end].tolist()
+
+        layer_start = int(record["layer_start"])
+        layer_end = layer_start + int(record["layer_count"])
+        for layer in self._layers[layer_start:layer_end]:
+            if layer["kind"] == LayerKind.SURVIVOR:
+                cell.add_layer(Survivor(int(layer["id"]), int(layer["value"])))
+            else:
+                cell.add_layer(
+                    Rubble(
+                        int(layer["id"]),
+                        int(layer["value"]),
+                        int(layer["agents_required"]),
+                    )
+                )
+        return cell
+
+
+def write_world_file(world: World, path: Path) -> None:
+    """Write a world in the mappable binary format."""
+    cells = np.zeros(len(world.cells), dtype=CELL_DTYPE)
+    layers: list[tuple[int, int, int, int]] = []
+    agents: list[int] = []
+
+    for i, cell in enumerate(world.cells):
+        record = cells[i]
+        record["move_cost"] = cell.move_cost
+        record["type"] = cell.type.value
+        record["top_layer"] = top_layer_kind(cell)
+        record["survivors"] = cell.number_of_survivors()
+        record["layer_start"] = len(layers)
+        record["layer_count"] = len(cell.layers)
+        record["agent_start"] = len(agents)
+        record["agent_count"] = len(cell.agents)
+        agents.extend(cell.agents)
+        for layer in cell.layers:
+            if isinstance(layer, Survivor):
+                layers.append((LayerKind.SURVIVOR, layer.id, layer.health, 0))
+            elif isinstance(layer, Rubble):
+                layers.append(
+                    (
+                        LayerKind.RUBBLE,
+                        layer.id,
+                        layer.energy_required,
+                        layer.agents_required,
+                    )
+                )
+
+    spawns = [(loc.x, loc.y, amount) for loc, amount in world.init_spawns.items()]
+
+    with path.open("wb") as file:
+        _ = file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                world.width,
+                world.height,
+                world.seed,
+                world.start_energy,
+                len(layers),
+                len(agents),
+                len(spawns),
+            )
+        )
+        _ = file.write(cells.tobytes())
+        _ = file.write(np.array(layers, dtype=LAYER_DTYPE).tobytes())
+        _ = file.write(np.array(agents, dtype=AGENT_DTYPE).tobytes())
+        _ = file.write(np.array(spawns, dtype=SPAWN_DTYPE).tobytes())
+
+
+def map_world_file(path: Path) -> World:
+    """
+    Map a world written by `write_world_file` without parsing it.
+
+    The grid arrays are copied out of the mapping since games mutate them,
+    cells are only built when first accessed.
+
+    Raises:
+        ValueError: If the file isn't a complete world file.
+
+    """
+    with path.open("rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(data) < _HEADER.size:
+        error = f"{path} is too short to be a world file"
+        raise ValueError(error)
+    (
+        magic,
+        version,
+        width,
+        height,
+        seed,
+        start_energy,
+        layer_count,
+        agent_count,
+        spawn_count,
+    ) = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        error = f"{path} is not a version {VERSION} world file"
+        raise ValueError(error)
+
+    offset = _HEADER.size
+    records = np.frombuffer(data, CELL_DTYPE, width * height, offset)
+    offset += records.nbytes
+    layers = np.frombuffer(data, LAYER_DTYPE, layer_count, offset)
+    offset += layers.nbytes
+    agents = np.frombuffer(data, AGENT_DTYPE, agent_count, offset)
+    offset += agents.nbytes
+    spawns = np.frombuffer(data, SPAWN_DTYPE, spawn_count, offset)
+
+    init_spawns: dict[Location, int] = {}
+    for x, y, amount in spawns.tolist():
+        loc = Location(x, y)
+        init_spawns[loc] = init_spawns.get(loc, 0) + amount
+
+    return World(
+        width,
+        height,
+        seed,
+        start_energy,
+        LazyCells(records, layers, agents, width),
+        init_spawns,
+        grid=WorldGrid.from_records(records, width, height),
+    )
+
+
+class WorldCache:
+    """
+    Cache of world files converted to the mappable binary format.
+
+    Converted worlds are stored on disk for later runs. Within a run, each
+    world is loaded once as a template and every `load` returns a copy of it.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory the converted worlds are stored in,
+                `CACHE_DIR` under the current directory by default.
+
+        """
+        self.directory: Path = (
+            Path.cwd() / CACHE_DIR if directory is None else directory
+        )
+        self._templates: dict[Path, tuple[int, World]] = {}
+
+    def key(self, path: Path) -> str:
+        """Return the cache key for a world file, from its path and mtime."""
+        stat = path.stat()
+        digest = hashlib.sha256(MAGIC + VERSION.to_bytes(2, "little"))
+        digest.update(str(path.resolve()).encode())
+        digest.update(f"\0{stat.st_mtime_ns}\0{stat.st_size}".encode())
+        return digest.hexdigest()
+
+    def load(self, path: Path) -> World:
+        """
+        Load a world file for a new game.
+
+        Returns:
+            A copy of the world, which the game is free to change.
+
+        Raises:
+            FileNotFoundError: If the world file doesn't exist.
+            DecodeError: If the world file can't be parsed.
+
+        """
+        path = path.resolve()
+        mtime = path.stat().st_mtime_ns
+        entry = self._templates.get(path)
+        if entry is None or entry[0] != mtime:
+            entry = self._templates[path] = (mtime, self._load(path))
+        return entry[1].copy()
+
+    def _load(self, path: Path) -> World:
+        cached = self.directory / f"{self.key(path)}.bin"
+        try:
+            return map_world_file(cached)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f"Ignoring unreadable world cache entry {cached}: {e}")
+
+        world = load_world(path)
+        self.put(cached, world)
+        return world
+
+    def put(self, cached: Path, world: World) -> None:
+        """Store a converted world. Failures are only logged."""
+        tmp_path = cached.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_world_file(world, tmp_path)
+            # atomic so concurrent tournament workers never see partial files
+            _ = tmp_path.replace(cached)
+        except OSError as e:
+            LOGGER.warning(f"Unable to write world cache entry {cached}: {e}")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .common import Cell, Location
+from .common.objects import Rubble, Survivor
+from .types import CellType
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+
+
+class LayerKind(IntEnum):
+    """Kind of the top layer of a cell, as stored in `WorldGrid.top_layer`."""
+
+    NONE = 0
+    SURVIVOR = 1
+    RUBBLE = 2
+
+
+def top_layer_kind(cell: Cell) -> LayerKind:
+    top = cell.get_top_layer()
+    if isinstance(top, Survivor):
+        return LayerKind.SURVIVOR
+    if isinstance(top, Rubble):
+        return LayerKind.RUBBLE
+    return LayerKind.NONE
+
+
+class WorldGrid:
+    """
+    Structure-of-arrays view of the world's cells.
+
+    Every array has shape `(height, width)` and is indexed `[y, x]`. The grid
+    mirrors `World.cells` and must be updated through the `World` mutation
+    methods so both stay in sync.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        shape = (height, width)
+        self.move_cost: NDArray[np.int32] = np.ones(shape, dtype=np.int32)
+        self.cell_type: NDArray[np.int8] = np.full(
+            shape, CellType.NORMAL_CELL.value, dtype=np.int8
+        )
+        self.survivors: NDArray[np.int16] = np.zeros(shape, dtype=np.int16)
+        self.top_layer: NDArray[np.int8] = np.zeros(shape, dtype=np.int8)
+        self.agent_count: NDArray[np.int16] = np.zeros(shape, dtype=np.int16)
+
+    @classmethod
+    def from_cells(cls, cells: Sequence[Cell], width: int, height: int) -> WorldGrid:
+        grid = cls(width, height)
+        for cell in cells:
+            x, y = cell.location.x, cell.location.y
+            grid.move_cost[y, x] = cell.move_cost
+            grid.cell_type[y, x] = cell.type.value
+            grid.agent_count[y, x] = len(cell.agents)
+            grid.update_layers(cell)
+        return grid
+
+    @classmethod
+    def from_records(
+        cls, records: NDArray[np.void], width: int, height: int
+    ) -> WorldGrid:
+        """Build a grid from the cell records of a mapped world file."""
+        shape = (height, width)
+        grid = cls(width, height)
+        grid.move_cost[:] = records["move_cost"].reshape(shape)
+        grid.cell_type[:] = records["type"].reshape(shape)
+        grid.survivors[:] = records["survivors"].reshape(shape)
+        grid.top_layer[:] = records["top_layer"].reshape(shape)
+        grid.agent_count[:] = records["agent_count"].reshape(shape)
+        return grid
+
+    def copy(self) -> WorldGrid:
+        """Return a grid with its own copy of every array."""
+        height, width = self.move_cost.shape
+        grid = WorldGrid(width, height)
+        grid.move_cost[:] = self.move_cost
+        grid.cell_type[:] = self.cell_type
+        grid.survivors[:] = self.survivors
+        grid.top_layer[:] = self.top_layer
+        grid.agent_count[:] = self.agent_count
+        return grid
+
+    def update_layers(self, cell: Cell) -> None:
+        """Refresh the layer arrays after the layers of a cell changed."""
+        x, y = cell.location.x, cell.location.y
+        self.survivors[y, x] = cell.number_of_survivors()
+        self.top_layer[y, x] = top_layer_kind(cell)
+
+    def locations_where(self, mask: NDArray[np.bool_]) -> list[Location]:
+        """Return the locations where `mask` is set, in `World.cells` order."""
+        ys, xs = np.nonzero(mask)
+        return [Location(int(x), int(y)) for y, x in zip(ys, xs, strict=True)]
+
+    def locations_of_type(self, cell_type: CellType) -> list[Location]:
+        return self.locations_where(self.cell_type == cell_type.value)
+
+    def survivor_locations(self) -> list[Location]:
+        return self.locations_where(self.survivors > 0)
+
+    def is_type(self, loc: Location, cell_type: CellType) -> bool:
+        return self.cell_type[loc.y, loc.x] == cell_type.value
@@ -63,7 +63,7 @@ def serialize_world(world: World) -> world_pb2.World:
     proto_world.start_energy = world.start_energy
     proto_world.total_survivors = world.total_survivors
 
-    for cell in world.cells:
+    for cell in world.peek_cells():
         proto_cell = proto_world.cells.add()
         proto_cell.loc.x = cell.location.x
         proto_cell.loc.y = cell.location.y
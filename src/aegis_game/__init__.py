@@ -6,11 +6,13 @@ from _aegis_game.common import CellInfo, Direction, Location
 from _aegis_game.common.objects import Rubble, Survivor
 from _aegis_game.message import Message
 from _aegis_game.team import Team
+from _aegis_game.world_grid import LayerKind
 
 __all__ = [
     "AgentType",
     "CellInfo",
     "Direction",
+    "LayerKind",
     "Location",
     "Message",
     "Rubble",
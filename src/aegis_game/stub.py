@@ -8,10 +8,14 @@ Do not modify manually.
 # pyright: reportUnusedImport=false
 # pyright: reportUnusedParameter=false
 
+import numpy as np
+from numpy.typing import NDArray
+
 from . import (
     AgentType,
     CellInfo,
     Direction,
+    LayerKind,
     Location,
     Rubble,
     Survivor,
@@ -43,6 +47,10 @@ def get_energy_level() -> int:
     """Return the current energy level of the agent."""
 
 
+def get_lumens() -> int:
+    """Return the current lumens of the agent's team."""
+
+
 def move(direction: Direction) -> None:
     """
     Move the agent in the specified direction.
@@ -122,6 +130,70 @@ def get_cell_info_at(loc: Location) -> CellInfo:
     """
 
 
+def get_cell_infos(locs: list[Location]) -> list[CellInfo]:
+    """
+    Return the cell info at each of the given locations.
+
+    Equivalent to calling `get_cell_info_at` for every location, with the same
+    visibility rules, but in a single call.
+
+    Args:
+        locs: The locations to query.
+
+    Returns:
+        Information about each cell, in the same order as `locs`.
+
+    """
+
+
+def get_region(x0: int, y0: int, x1: int, y1: int) -> list[CellInfo]:
+    """
+    Return the cell info of every cell in a rectangular region.
+
+    Both corners are inclusive. The same visibility rules as `get_cell_info_at`
+    apply to every cell.
+
+    Args:
+        x0: The x-coordinate of the bottom-left corner.
+        y0: The y-coordinate of the bottom-left corner.
+        x1: The x-coordinate of the top-right corner.
+        y1: The y-coordinate of the top-right corner.
+
+    Returns:
+        Information about each cell, row by row starting at `y0`.
+
+    Raises:
+        AgentError: If a corner is off the map or the corners are out of order.
+
+    """
+
+
+def get_region_arrays(
+    x0: int, y0: int, x1: int, y1: int
+) -> tuple[NDArray[np.int32], NDArray[np.int8]]:
+    """
+    Return the move costs and top layer kinds of a rectangular region as arrays.
+
+    Both corners are inclusive. Both arrays have shape `(y1 - y0 + 1, x1 - x0 + 1)`
+    and are indexed `[y - y0, x - x0]`. Top layers are given as `LayerKind` values.
+
+    If `HIDDEN_MOVE_COSTS` feature is enabled, unvisited cells have `move_cost = 1`.
+
+    Args:
+        x0: The x-coordinate of the bottom-left corner.
+        y0: The y-coordinate of the bottom-left corner.
+        x1: The x-coordinate of the top-right corner.
+        y1: The y-coordinate of the top-right corner.
+
+    Returns:
+        A tuple of the move cost array and the top layer kind array.
+
+    Raises:
+        AgentError: If a corner is off the map or the corners are out of order.
+
+    """
+
+
 def log(*args: object) -> None:
     """
     Log a message.
@@ -0,0 +1,114 @@
+"""Fixtures shared by the tests of games and the commands that run them."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _aegis_game.args_parser import LaunchArgs
+from _aegis_game.common import Cell, Location
+from _aegis_game.common.objects import Rubble, Survivor
+from _aegis_game.game import Game
+from _aegis_game.game_pb import GamePb, HeadlessGamePb
+from _aegis_game.sandbox.sandbox import Sandbox
+from _aegis_game.types import ExecMode
+from _aegis_game.world import World
+from _aegis_game.world_pb import serialize_world
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+# keeps no state of its own, so it plays the same after a restore
+AGENT = """
+from aegis_game.stub import *
+
+def think() -> None:
+    directions = list(Direction)
+    move(directions[(get_id() + get_round_number()) % len(directions)])
+    send_message(f"{get_id()} {get_round_number()}", [])
+"""
+
+IDLE = "def think() -> None:\n    pass\n"
+
+
+def _make_game(
+    size: int = 5,
+    agent: str = AGENT,
+    exec_mode: ExecMode = ExecMode.INLINE,
+    shared: str | None = None,
+    game_pb: GamePb | None = None,
+) -> Game:
+    """Start a game of one agent per team on a square world with a few layers."""
+    cells = [Cell(x, y) for y in range(size) for x in range(size)]
+    cells[size + 1].add_layer(Rubble(1, 2, 1))
+    cells[size + 1].add_layer(Survivor(2, 10))
+    cells[-2].add_layer(Survivor(3, 5))
+    spawn = Location(size // 2, size // 2)
+    cells[spawn.y * size + spawn.x].set_spawn_cell()
+    world = World(size, size, 7, 100, cells, {spawn: 1})
+    files = {"main.py": agent}
+    if shared is not None:
+        files["shared.py"] = shared
+    code = Sandbox.from_directory_dict(files)
+    args = LaunchArgs(
+        amount=1,
+        world=[],
+        rounds=20,
+        agent="a",
+        agent2="b",
+        client=False,
+        debug=False,
+        log=False,
+        headless=True,
+        exec_mode=exec_mode,
+    )
+    return Game([code, code], args, world, game_pb or HeadlessGamePb())
+
+
+def _state(game: Game) -> tuple[object, ...]:
+    """Return what the agents and teams can observe about a game."""
+    agents = [
+        (a.id, a.location, a.energy_level, a.steps_taken, a.has_visited.tolist())
+        for a in game.agents.values()
+    ]
+    layers = [
+        [type(layer).__name__ for layer in game.world.cells[i].layers]
+        for i in range(len(game.world.cells))
+    ]
+    return (game.round, agents, layers, game.team_info.snapshot())
+
+
+@pytest.fixture
+def make_game() -> Callable[..., Game]:
+    """Return a function starting small games, see `_make_game`."""
+    return _make_game
+
+
+@pytest.fixture
+def state() -> Callable[[Game], tuple[object, ...]]:
+    """Return a function telling what can be observed about a game."""
+    return _state
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write a working agent, a broken agent and a 3x3 world and run from there."""
+    for name, source in (("good", IDLE), ("bad", "def think(:\n")):
+        agent_dir = tmp_path / "agents" / name
+        agent_dir.mkdir(parents=True)
+        _ = (agent_dir / "main.py").write_text(source)
+
+    cells = [Cell(x, y) for y in range(3) for x in range(3)]
+    cells[4].set_spawn_cell()
+    cells[0].add_layer(Survivor(1, 10))
+    pb_world = serialize_world(World(3, 3, 1, 100, cells, {Location(1, 1): 1}))
+    spawn = pb_world.init_spawns.add()
+    spawn.loc.x = 1
+    spawn.loc.y = 1
+    spawn.amount = 1
+    (tmp_path / "worlds").mkdir()
+    _ = (tmp_path / "worlds" / "tiny.world").write_bytes(pb_world.SerializeToString())
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
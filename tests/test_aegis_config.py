@@ -0,0 +1,56 @@
+"""Tests for reading feature flags from the config."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from _aegis_game import aegis_config
+from _aegis_game.aegis_config import Features, has_feature, load_config, load_features
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+CONFIG = """
+features:
+  ALLOW_AGENT_PREDICTIONS: false
+  ALLOW_AGENT_MESSAGES: true
+  ALLOW_DRONE_SCAN: false
+  HIDDEN_MOVE_COSTS: true
+
+competition_specific:
+  ALLOW_AGENT_TYPES: true
+"""
+
+
+class TestFeatures:
+    """Tests for `load_features`."""
+
+    def test_flags_match_the_config(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that flags are resolved like `has_feature` and only read once."""
+        path = tmp_path / "config.yaml"
+        _ = path.write_text(CONFIG)
+        monkeypatch.setattr(aegis_config, "CONFIG_PATH", path)
+        load_config.cache_clear()
+        load_features.cache_clear()
+        try:
+            features = load_features()
+            assert features == Features(
+                allow_agent_predictions=False,
+                allow_agent_messages=True,
+                allow_drone_scan=False,
+                allow_agent_types=True,
+                hidden_move_costs=True,
+            )
+            assert features.allow_agent_types == has_feature("ALLOW_AGENT_TYPES")
+
+            # edits after the first load aren't picked up mid run
+            _ = path.write_text(CONFIG.replace("DRONE_SCAN: false", "DRONE_SCAN: true"))
+            load_config.cache_clear()
+            assert load_features() is features
+        finally:
+            load_config.cache_clear()
+            load_features.cache_clear()
@@ -0,0 +1,119 @@
+"""Tests for what agents can see of the world through their controller."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from _aegis_game.aegis_config import Features
+from _aegis_game.agent_controller import AgentController
+from _aegis_game.common import CellInfo, Direction, Location
+from _aegis_game.common.objects import Rubble, Survivor
+from _aegis_game.world_grid import LayerKind
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _aegis_game.game import Game
+
+IDLE = "def think() -> None:\n    pass\n"
+
+
+def start(
+    make_game: Callable[..., Game], *, hidden_move_costs: bool = False
+) -> tuple[Game, AgentController]:
+    """Play a round of idle agents and return the controller of the first one."""
+    game = make_game(agent=IDLE)
+    game.features = Features(
+        allow_agent_predictions=False,
+        allow_agent_messages=False,
+        allow_drone_scan=True,
+        allow_agent_types=False,
+        hidden_move_costs=hidden_move_costs,
+    )
+    game.run_round()
+    agent = next(iter(game.agents.values()))
+    return game, AgentController(game, agent)
+
+
+def set_move_cost(game: Game, loc: Location, move_cost: int) -> None:
+    """Change the move cost of a cell along with the grid that mirrors it."""
+    game.world.get_cell_at(loc).move_cost = move_cost
+    game.world.grid.move_cost[loc.y, loc.x] = move_cost
+
+
+def kind(cell_info: CellInfo) -> LayerKind:
+    """Return the `LayerKind` of a cell info's top layer."""
+    top = cell_info.top_layer
+    if isinstance(top, Survivor):
+        return LayerKind.SURVIVOR
+    if isinstance(top, Rubble):
+        return LayerKind.RUBBLE
+    return LayerKind.NONE
+
+
+class TestAgentController:
+    """Tests for the batched cell queries of `AgentController`."""
+
+    def test_only_scanned_neighbours_show_every_layer(
+        self, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that other cells only show their top layer and no agents."""
+        game, controller = start(make_game)
+        agent_loc = controller.get_location()
+        neighbour, far = Location(1, 1), Location(3, 4)
+        game.start_drone_scan(neighbour, controller.get_team())
+        game.activate_pending_drone_scans()
+
+        near_info, far_info, own_info = controller.get_cell_infos(
+            [neighbour, far, agent_loc]
+        )
+        assert [type(layer) for layer in near_info.layers] == [Rubble, Survivor]
+        assert [type(layer) for layer in far_info.layers] == [Survivor]
+        assert own_info.agents == []
+
+        for _ in range(game.get_drone_scan_duration(neighbour, controller.get_team())):
+            game.tick_drone_scans()
+        (expired_info,) = controller.get_cell_infos([neighbour])
+        assert [type(layer) for layer in expired_info.layers] == [Rubble]
+
+    def test_unvisited_move_costs_are_masked(
+        self, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that move costs of unvisited cells read as 1 in both forms."""
+        game, controller = start(make_game, hidden_move_costs=True)
+        agent = game.get_agent(controller.get_id())
+        game.mark_surrounding_cells_visited(agent, agent.location)
+        visited = agent.location.add(Direction.NORTH)
+        set_move_cost(game, visited, 4)
+        set_move_cost(game, Location(0, 0), 5)
+
+        region = controller.get_region(0, 0, 4, 4)
+        move_costs, _ = controller.get_region_arrays(0, 0, 4, 4)
+        assert region[visited.y * 5 + visited.x].move_cost == 4  # noqa: PLR2004
+        assert region[0].move_cost == 1
+        assert move_costs[visited.y, visited.x] == 4  # noqa: PLR2004
+        assert move_costs[0, 0] == 1
+
+    def test_region_forms_agree(self, make_game: Callable[..., Game]) -> None:
+        """Test that the region arrays match the region's cell infos."""
+        game, controller = start(make_game, hidden_move_costs=True)
+        agent = game.get_agent(controller.get_id())
+        game.mark_surrounding_cells_visited(agent, agent.location)
+        set_move_cost(game, Location(2, 1), 3)
+        set_move_cost(game, Location(3, 4), 6)
+
+        region = controller.get_region(1, 1, 3, 4)
+        move_costs, top_layers = controller.get_region_arrays(1, 1, 3, 4)
+        assert move_costs.shape == top_layers.shape == (4, 3)
+        assert [cell.location for cell in region] == [
+            Location(x, y) for y in range(1, 5) for x in range(1, 4)
+        ]
+        assert np.array_equal(move_costs.ravel(), [cell.move_cost for cell in region])
+        assert set(move_costs.ravel().tolist()) == {1, 3}
+        assert np.array_equal(top_layers.ravel(), [kind(cell) for cell in region])
+        infos = controller.get_cell_infos([cell.location for cell in region])
+        assert [(cell.move_cost, cell.layers) for cell in region] == [
+            (cell.move_cost, cell.layers) for cell in infos
+        ]
@@ -0,0 +1,43 @@
+"""Tests for the `random` module agents import."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _aegis_game.game import Game
+
+# wanders off in random directions and says what else it drew
+AGENT = """
+import random
+from random import choice
+from aegis_game.stub import *
+
+def think() -> None:
+    move(choice(list(Direction)))
+    send_message(str(random.random()), [])
+"""
+
+
+class TestAgentRandom:
+    """Tests for seeding the `random` module of each agent."""
+
+    def test_same_seed_plays_the_same(
+        self,
+        make_game: Callable[..., Game],
+        state: Callable[[Game], tuple[object, ...]],
+    ) -> None:
+        """Test that two games with the same seed make the same random choices."""
+        first = make_game(agent=AGENT)
+        second = make_game(agent=AGENT)
+        # whatever else draws from the global generator changes nothing
+        for _ in range(5):
+            first.run_round()
+            _ = random.random()
+            second.run_round()
+            random.seed()
+
+        assert state(first) == state(second)
@@ -0,0 +1,42 @@
+"""Tests for measuring games with `aegis bench`."""
+
+from __future__ import annotations
+
+import pytest
+
+from _aegis_game.args_parser import BenchArgs
+from _aegis_game.bench import BenchCase, _run_case, make_cases
+from _aegis_game.logger import AGENT_LOGGER, LOGGER
+from _aegis_game.types import ExecMode
+
+
+class TestBench:
+    """Tests for the games `aegis bench` runs and what it reports."""
+
+    @pytest.mark.usefixtures("project")
+    def test_cases_are_measured(self) -> None:
+        """Test that every agent, world and amount is measured on its own."""
+        args = BenchArgs(None, None, [1, 2], 3, ExecMode.INLINE, None)
+        assert make_cases(args) == [
+            BenchCase("bad", "tiny", 1),
+            BenchCase("bad", "tiny", 2),
+            BenchCase("good", "tiny", 1),
+            BenchCase("good", "tiny", 2),
+        ]
+
+        levels = LOGGER.level, AGENT_LOGGER.level
+        try:
+            result = _run_case(BenchCase("good", "tiny", 1), args)
+            broken = _run_case(BenchCase("bad", "tiny", 1), args)
+        finally:
+            LOGGER.setLevel(levels[0])
+            AGENT_LOGGER.setLevel(levels[1])
+
+        assert result.error == ""
+        assert result.rounds == result.turns == 3  # noqa: PLR2004
+        assert result.rounds_per_sec > 0
+        assert 0 < result.turn_p50_us <= result.turn_p99_us
+        assert result.cpu_p50_us > 0
+        assert result.bytes_per_round > 0
+        assert broken.error
+        assert broken.rounds == 0
@@ -0,0 +1,34 @@
+"""Tests for the location indexes `Game` keeps up to date."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from _aegis_game.common import Location
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _aegis_game.game import Game
+
+
+class TestGameIndexes:
+    """Tests for the survivor and spawn indexes of `Game`."""
+
+    def test_indexes_follow_the_world(self, make_game: Callable[..., Game]) -> None:
+        """Test that the indexes match the grid as survivors are removed."""
+        game = make_game()
+        grid = game.world.grid
+        assert game.get_survs() == grid.survivor_locations()
+        assert game.is_spawn(Location(2, 2))
+        assert not game.is_spawn(Location(1, 1))
+
+        # rubble sits on top of the survivor, it stays indexed until dug out
+        game.remove_layer(Location(1, 1))
+        assert Location(1, 1) in game.get_survs()
+        game.remove_layer(Location(1, 1))
+        assert game.get_survs() == grid.survivor_locations() == [Location(3, 4)]
+
+        # callers get a copy they can't change the index through
+        game.get_survs().clear()
+        assert game.get_survs() == [Location(3, 4)]
@@ -0,0 +1,147 @@
+"""Tests for the events `GamePb` builds from a game."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from _aegis_game.common import Location
+from _aegis_game.constants import Constants
+from _aegis_game.game_pb import GamePb, HeadlessGamePb
+from _aegis_game.replay import ReplayReader, ReplayWriter
+from _aegis_game.schemas.event_pb2 import Event
+from _aegis_game.server_websocket import WebSocketServer
+from _aegis_game.team import Team
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from _aegis_game.game import Game
+
+# moves on the first round only, so later turns leave the agent unchanged
+AGENT = """
+from aegis_game.stub import *
+
+def think() -> None:
+    if get_round_number() == 1:
+        move(Direction.NORTH)
+"""
+
+type AgentStates = dict[int, tuple[int, int, int, int]]
+type DroneScans = dict[tuple[int, int, int], int]
+
+
+def observe(game: Game, game_pb: GamePb) -> tuple[AgentStates, DroneScans]:
+    """Return the agents and drone scans of `game` as a client should see them."""
+    agents = {
+        agent.id: (
+            agent.energy_level,
+            agent.steps_taken,
+            agent.location.x,
+            agent.location.y,
+        )
+        for agent in game.agents.values()
+    }
+    scans = {
+        (loc.x, loc.y, game_pb.team_to_schema(team)): duration
+        for loc, teams in game._drone_scans.items()  # noqa: SLF001
+        for team, duration in teams.items()
+    }
+    return agents, scans
+
+
+def replay(path: Path) -> list[tuple[AgentStates, DroneScans]]:
+    """Rebuild the state after each round from the recorded changes alone."""
+    agents: AgentStates = {}
+    scans: DroneScans = {}
+    states: list[tuple[AgentStates, DroneScans]] = []
+    for recorded in ReplayReader(path).events():
+        event = Event.FromString(recorded.data)
+        if not event.HasField("round"):
+            continue
+        for turn in event.round.turns:
+            agents[turn.agentId] = (
+                turn.energy_level,
+                turn.steps_taken,
+                turn.loc.x,
+                turn.loc.y,
+            )
+        # durations count down on their own, as in the client's `World`
+        scans = {key: duration - 1 for key, duration in scans.items() if duration > 1}
+        for scan in event.round.drone_scans_expired:
+            _ = scans.pop((scan.location.x, scan.location.y, scan.team), None)
+        for scan in event.round.drone_scans_started:
+            scans[scan.location.x, scan.location.y, scan.team] = scan.duration
+        states.append((dict(agents), dict(scans)))
+    return states
+
+
+class TestGamePb:
+    """Tests for the rounds `GamePb` sends to clients."""
+
+    def test_changes_rebuild_every_round(
+        self, tmp_path: Path, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that applying each round's changes gives the game's state."""
+        path = tmp_path / "game.aegisreplay"
+        expected: list[tuple[AgentStates, DroneScans]] = []
+        with ReplayWriter(path) as writer:
+            game_pb = GamePb(writer)
+            game_pb.make_games_header(WebSocketServer(wait_for_client=False))
+            game = make_game(agent=AGENT, game_pb=game_pb)
+            game_pb.make_game_header(game.world)
+            for game_round in range(Constants.DRONE_SCAN_DURATION + 3):
+                if game_round in {0, 2}:
+                    # the second scan restarts the first one's countdown
+                    game.start_drone_scan(Location(0, 0), Team.GOOBS)
+                if game_round == 1:
+                    game.start_drone_scan(Location(1, 0), Team.VOIDSEERS)
+                game.run_round()
+                expected.append(observe(game, game_pb))
+            game_pb.make_game_footer()
+            game_pb.make_games_footer()
+
+        assert replay(path) == expected
+        assert expected[3][1]
+        assert not expected[-1][1]
+
+    def test_unchanged_agents_are_skipped(
+        self, tmp_path: Path, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that only agents whose state changed get a turn in a round."""
+        path = tmp_path / "game.aegisreplay"
+        with ReplayWriter(path) as writer:
+            game_pb = GamePb(writer)
+            game_pb.make_games_header(WebSocketServer(wait_for_client=False))
+            game = make_game(agent=AGENT, game_pb=game_pb)
+            game_pb.make_game_header(game.world)
+            for _ in range(3):
+                game.run_round()
+
+        rounds = [
+            Event.FromString(recorded.data).round
+            for recorded in ReplayReader(path).events()
+            if Event.FromString(recorded.data).HasField("round")
+        ]
+        assert [len(pb_round.turns) for pb_round in rounds] == [len(game.agents), 0, 0]
+
+    def test_headless_game_plays_the_same(
+        self,
+        make_game: Callable[..., Game],
+        state: Callable[[Game], tuple[object, ...]],
+    ) -> None:
+        """Test that discarding events changes nothing about how a game plays."""
+        headless_pb = HeadlessGamePb()
+        headless = make_game(game_pb=headless_pb)
+        game_pb = GamePb()
+        game_pb.make_games_header(WebSocketServer(wait_for_client=False))
+        game = make_game(game_pb=game_pb)
+        game_pb.make_game_header(game.world)
+        for _ in range(3):
+            headless.run_round()
+            game.run_round()
+
+        assert state(headless) == state(game)
+        assert headless_pb.ws_server is None
+        assert not headless_pb.turns
+        assert not headless_pb.team_info
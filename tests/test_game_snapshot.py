@@ -0,0 +1,64 @@
+"""Tests for snapshotting and restoring games."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _aegis_game.game import Game
+
+
+class TestGameSnapshot:
+    """Tests for `Game.snapshot` and `Game.restore`."""
+
+    def test_restored_game_plays_the_same(
+        self,
+        make_game: Callable[..., Game],
+        state: Callable[[Game], tuple[object, ...]],
+    ) -> None:
+        """Test that a game continued from a snapshot matches the original."""
+        game = make_game()
+        for _ in range(3):
+            game.run_round()
+        data = game.snapshot()
+        for _ in range(3):
+            game.run_round()
+
+        restored = make_game()
+        restored.restore(data)
+        assert restored.round == 3  # noqa: PLR2004
+        for _ in range(3):
+            restored.run_round()
+
+        assert state(restored) == state(game)
+        for agent in game.agents.values():
+            messages = restored.get_agent(agent.id).message_buffer
+            assert messages.snapshot() == agent.message_buffer.snapshot()
+
+    def test_other_world_is_rejected(self, make_game: Callable[..., Game]) -> None:
+        """Test that a snapshot can't be restored onto a world of another size."""
+        data = make_game(size=4).snapshot()
+
+        with pytest.raises(ValueError, match="4x4 world"):
+            make_game().restore(data)
+
+    def test_garbage_is_rejected(self, make_game: Callable[..., Game]) -> None:
+        """Test that data that isn't a snapshot is reported."""
+        with pytest.raises(ValueError, match="not a game snapshot"):
+            make_game().restore(b"not a snapshot")
+
+    def test_games_have_their_own_random(self, make_game: Callable[..., Game]) -> None:
+        """Test that draws elsewhere don't change what a game draws next."""
+        first = make_game()
+        second = make_game()
+        _ = [first.random.random() for _ in range(10)]
+        _ = random.random()
+
+        expected = make_game()
+        assert second.random.random() == expected.random.random()
+        assert second.np_random.random() == expected.np_random.random()
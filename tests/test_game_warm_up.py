@@ -0,0 +1,72 @@
+"""Tests for initializing agent code before the first round."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from _aegis_game.constants import Constants
+from _aegis_game.types import ExecMode
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import pytest
+
+    from _aegis_game.game import Game
+
+AGENT = "def think() -> None:\n    pass\n"
+
+
+def busy_setup(seconds: float) -> str:
+    """Return module-level agent code that takes about `seconds` of CPU time."""
+    iterations = 1_000_000
+    loop = "count = 0\nwhile count < {}:\n    count = count + 1\n"
+    start = time.thread_time()
+    exec(loop.format(iterations), {})  # noqa: S102
+    return loop.format(int(iterations * seconds / (time.thread_time() - start)))
+
+
+class TestWarmUp:
+    """Tests for `Game.warm_up`."""
+
+    def test_agents_initialize_before_their_first_turn(
+        self, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that every agent's code is initialized by the time round 1 runs."""
+        game = make_game(exec_mode=ExecMode.THREAD)
+        try:
+            game.warm_up()
+            assert game.round == 0
+            assert all(agent.core.initialized for agent in game.agents.values())  # pyright: ignore[reportOptionalMemberAccess]
+        finally:
+            game.stop()
+
+    def test_slow_initialization_is_killed(
+        self, monkeypatch: pytest.MonkeyPatch, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that agents over the init limit are killed before round 1."""
+        monkeypatch.setattr(Constants, "INIT_TIME_LIMIT", 0.2)
+        game = make_game(
+            agent="while True:\n    pass\n" + AGENT, exec_mode=ExecMode.THREAD
+        )
+        try:
+            game.run_round()
+            assert game.agents == {}
+            assert not game.running
+        finally:
+            game.stop()
+
+    def test_each_agent_has_its_own_budget(
+        self, monkeypatch: pytest.MonkeyPatch, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that agents initializing together don't share one deadline."""
+        monkeypatch.setattr(Constants, "INIT_TIME_LIMIT", 0.5)
+        # together the agents take longer than the limit, each one doesn't
+        game = make_game(agent=busy_setup(0.3) + AGENT, exec_mode=ExecMode.THREAD)
+        try:
+            game.warm_up()
+            assert len(game.agents) == 2  # noqa: PLR2004
+            assert all(agent.core.initialized for agent in game.agents.values())  # pyright: ignore[reportOptionalMemberAccess]
+        finally:
+            game.stop()
@@ -0,0 +1,49 @@
+"""Tests for running games with `aegis launch`."""
+
+from __future__ import annotations
+
+import pytest
+
+from _aegis_game import play
+from _aegis_game.args_parser import LaunchArgs
+from _aegis_game.types import ExecMode
+
+
+def launch_args(*, client: bool = False) -> LaunchArgs:
+    """Return the arguments of a short headless game of the `good` agent."""
+    return LaunchArgs(
+        amount=1,
+        world=["tiny"],
+        rounds=3,
+        agent="good",
+        agent2=None,
+        client=client,
+        debug=False,
+        log=False,
+        headless=True,
+        exec_mode=ExecMode.INLINE,
+    )
+
+
+def no_server(**_kwargs: object) -> None:
+    """Stand in for `WebSocketServer`, which headless games must not start."""
+    error = "Headless games must not start a server"
+    raise AssertionError(error)
+
+
+@pytest.mark.usefixtures("project")
+class TestRun:
+    """Tests for `play.run`."""
+
+    def test_headless_game_starts_no_server(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a headless game runs without a WebSocket server."""
+        monkeypatch.setattr(play, "setup_console_logging", lambda: None)
+        monkeypatch.setattr(play, "WebSocketServer", no_server)
+        play.run(launch_args())
+
+    def test_headless_game_rejects_a_client(self) -> None:
+        """Test that waiting for a client that would get no events is refused."""
+        with pytest.raises(ValueError, match="no events to send to a client"):
+            play.run(launch_args(client=True))
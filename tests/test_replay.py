@@ -0,0 +1,156 @@
+"""Tests for recording and reading replay files."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _aegis_game.constants import Constants
+from _aegis_game.game_pb import GamePb
+from _aegis_game.replay import ReplayReader, ReplayWriter
+from _aegis_game.schemas.event_pb2 import Event
+from _aegis_game.server_websocket import WebSocketServer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from _aegis_game.game import Game
+
+
+def record(path: Path) -> None:
+    """Write two three-round games of placeholder events."""
+    with ReplayWriter(path) as writer:
+        writer.add_event(b"games-header")
+        for game in range(2):
+            writer.start_game()
+            writer.add_event(f"header-{game}".encode(), keyframe=True)
+            for game_round in range(1, 4):
+                writer.add_event(f"round-{game}-{game_round}".encode())
+                writer.end_round(game_round)
+                if game_round == 2:  # noqa: PLR2004
+                    writer.add_keyframe(f"keyframe-{game}-{game_round}".encode())
+            writer.add_event(f"footer-{game}".encode())
+        writer.add_event(b"games-footer")
+
+
+class TestReplay:
+    """Tests for the replay writer and reader."""
+
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        """Test that every event is read back in order with its keyframe flag."""
+        path = tmp_path / "game.aegisreplay"
+        record(path)
+
+        events = list(ReplayReader(path).events())
+        assert [event.data for event in events] == [
+            b"games-header",
+            b"header-0",
+            b"round-0-1",
+            b"round-0-2",
+            b"round-0-3",
+            b"footer-0",
+            b"header-1",
+            b"round-1-1",
+            b"round-1-2",
+            b"round-1-3",
+            b"footer-1",
+            b"games-footer",
+        ]
+        assert [event.data for event in events if event.keyframe] == [
+            b"header-0",
+            b"header-1",
+        ]
+
+    def test_seek_to_round(self, tmp_path: Path) -> None:
+        """Test that the index finds the block of a round in a later game."""
+        path = tmp_path / "game.aegisreplay"
+        record(path)
+
+        reader = ReplayReader(path)
+        start = reader.find(1, 2)
+        assert reader.index[start].game == 1
+        assert reader.index[start].round == 2  # noqa: PLR2004
+        assert next(reader.events(start)).data == b"round-1-2"
+
+    def test_seek_plays_from_the_keyframe_before(self, tmp_path: Path) -> None:
+        """Test that seeking starts at the nearest keyframe and plays on."""
+        path = tmp_path / "game.aegisreplay"
+        record(path)
+        reader = ReplayReader(path)
+
+        assert [event.data for event in reader.seek(1, 3)] == [
+            b"games-header",
+            b"keyframe-1-2",
+            b"round-1-3",
+            b"footer-1",
+            b"games-footer",
+        ]
+        # round 2 comes before that keyframe, so it plays from the game header
+        assert [event.data for event in reader.seek(1, 2)][:3] == [
+            b"games-header",
+            b"header-1",
+            b"round-1-1",
+        ]
+
+    def test_seek_to_game(self, tmp_path: Path) -> None:
+        """Test that seeking to a game without a round plays it from its header."""
+        path = tmp_path / "game.aegisreplay"
+        record(path)
+        reader = ReplayReader(path)
+
+        assert [event.data for event in reader.seek(1, 0)] == [
+            b"games-header",
+            b"header-1",
+            b"round-1-1",
+            b"round-1-2",
+            b"round-1-3",
+            b"footer-1",
+            b"games-footer",
+        ]
+        assert list(reader.seek(0, 0)) == list(reader.events())
+
+    def test_rounds_are_indexed_once(self, tmp_path: Path) -> None:
+        """Test that events after a game's last round don't get an entry of their own."""
+        path = tmp_path / "game.aegisreplay"
+        record(path)
+
+        keys = [(entry.game, entry.round) for entry in ReplayReader(path).index]
+        assert keys == [(0, 0), (0, 1), (0, 2), (0, 3), (1, 1), (1, 2), (1, 3)]
+
+    def test_game_keyframes_are_recorded(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        make_game: Callable[..., Game],
+    ) -> None:
+        """Test that a recorded game can be played from its periodic keyframes."""
+        monkeypatch.setattr(Constants, "KEYFRAME_INTERVAL", 2)
+        path = tmp_path / "game.aegisreplay"
+        with ReplayWriter(path) as writer:
+            game_pb = GamePb(writer)
+            game_pb.make_games_header(WebSocketServer(wait_for_client=False))
+            game = make_game(game_pb=game_pb)
+            game_pb.make_game_header(game.world)
+            for _ in range(5):
+                game.run_round()
+            game_pb.make_game_footer()
+            game_pb.make_games_footer()
+
+        events = list(ReplayReader(path).seek(0, 5))
+        keyframe = Event.FromString(events[1].data)
+        assert keyframe.game_header.start_round == 4  # noqa: PLR2004
+        assert len(keyframe.game_header.agents) == len(game.agents)
+        played = [Event.FromString(event.data) for event in events[2:]]
+        rounds = [event.round.round for event in played if event.HasField("round")]
+        assert rounds == [5]
+
+    def test_unfinished_recording_is_rejected(self, tmp_path: Path) -> None:
+        """Test that a file without an index is reported instead of misread."""
+        path = tmp_path / "game.aegisreplay"
+        record(path)
+        _ = path.write_bytes(path.read_bytes()[:-4])
+
+        with pytest.raises(ValueError, match="didn't finish"):
+            _ = ReplayReader(path)
@@ -0,0 +1,63 @@
+"""Tests for the compiled code cache used by Sandbox."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from _aegis_game.sandbox.cache import CodeCache
+from _aegis_game.sandbox.sandbox import Sandbox
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+SOURCE = "def think() -> None:\n    return None\n"
+
+
+class TestCodeCache:
+    """Tests for storing and loading compiled agent code."""
+
+    def test_miss_then_hit(self, tmp_path: Path) -> None:
+        """Test that a compiled file is stored and loaded on the next compile."""
+        cache = CodeCache(tmp_path)
+        assert cache.get("main.py", SOURCE) is None
+
+        first = Sandbox.from_directory_dict({"main.py": SOURCE}, cache)
+        cached = cache.get("main.py", SOURCE)
+        assert cached is not None
+        assert cached.co_code == first["main"].co_code
+
+        second = Sandbox.from_directory_dict({"main.py": SOURCE}, cache)
+        assert second["main"].co_code == first["main"].co_code
+
+    def test_changed_source_misses(self, tmp_path: Path) -> None:
+        """Test that editing a file invalidates its cached code."""
+        cache = CodeCache(tmp_path)
+        _ = Sandbox.from_directory_dict({"main.py": SOURCE}, cache)
+        assert cache.get("main.py", SOURCE + "\n# edited\n") is None
+
+    def test_key_depends_on_filename(self, tmp_path: Path) -> None:
+        """Test that the same source in a different file gets its own entry."""
+        cache = CodeCache(tmp_path)
+        assert cache.key("main.py", SOURCE) != cache.key("helper.py", SOURCE)
+
+    def test_corrupt_entry_is_ignored(self, tmp_path: Path) -> None:
+        """Test that an unreadable entry is treated as a miss and recompiled."""
+        cache = CodeCache(tmp_path)
+        _ = (tmp_path / f"{cache.key('main.py', SOURCE)}.bin").write_bytes(b"\x00")
+        assert cache.get("main.py", SOURCE) is None
+
+        sandbox = Sandbox.from_directory_dict({"main.py": SOURCE}, cache)
+        assert "main" in sandbox
+
+    def test_default_directory_follows_cwd(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the default directory is found when the cache is made."""
+        monkeypatch.chdir(tmp_path)
+        cache = CodeCache()
+        _ = Sandbox.from_directory_dict({"main.py": SOURCE}, cache)
+
+        assert cache.directory == tmp_path / ".aegis_cache" / "code"
+        assert any(cache.directory.iterdir())
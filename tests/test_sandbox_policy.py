@@ -0,0 +1,155 @@
+"""Tests for the restricting policy agent code is compiled with."""
+
+from __future__ import annotations
+
+from types import CodeType
+
+import pytest
+
+from _aegis_game.sandbox.core import LumenCore
+from _aegis_game.sandbox.sandbox import CompilationError, Sandbox
+from _aegis_game.types import ExecMode
+
+SOURCE = """
+class Node:
+    pass
+
+def think() -> None:
+    edges = [(1, 2), (2, 3), (3, 1)]
+    seen = {}
+    for start, end in edges:
+        seen[start] = end
+    first, (second, third) = 1, (2, 3)
+    node = Node()
+    node.label = [key for key in seen]
+    result = (node.label, seen, first + second + third)
+"""
+
+
+class Holder:
+    """Has an attribute only the engine should read."""
+
+    _: int = 1
+
+
+def names(code: CodeType) -> set[str]:
+    """Return every global name used by `code` and the code nested in it."""
+    found = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            found |= names(const)
+    return found
+
+
+class TestNodeTransformer:
+    """Tests for leaving out the guards that change nothing."""
+
+    def test_identity_guards_are_left_out(self) -> None:
+        """Test that loops, unpacking and writes don't call their guards."""
+        code = Sandbox.from_directory_dict({"main.py": SOURCE})["main"]
+        assert not names(code) & {
+            "_getiter_",
+            "_write_",
+            "_iter_unpack_sequence_",
+            "_unpack_sequence_",
+        }
+
+    def test_code_runs_the_same(self) -> None:
+        """Test that the code without the guards still behaves as written."""
+        results: list[object] = []
+        errors: list[str] = []
+        core = LumenCore(
+            Sandbox.from_directory_dict({"main.py": SOURCE + "    save(result)\n"}),
+            {"save": results.append},
+            errors.append,
+            mode=ExecMode.INLINE,
+        )
+        core.step()
+
+        assert errors == []
+        assert results == [([1, 2, 3], {1: 2, 2: 3, 3: 1}, 6)]
+
+    def test_known_safe_loads_are_unguarded(self) -> None:
+        """Test that literal attributes and literal or tuple keys aren't guarded."""
+        source = "def think(a, b):\n    return a.real, b[0], b['x'], b[1, 2]\n"
+        code = Sandbox.from_directory_dict({"main.py": source})["main"]
+        assert not names(code) & {"_getattr_", "_getitem_"}
+
+    def test_private_keys_are_still_denied(self) -> None:
+        """Test that keys only known when the code runs are still checked."""
+        errors: list[str] = []
+        source = (
+            "def think() -> None:\n"
+            "    key = '_secret'\n"
+            "    value = {'_secret': 1}[key]\n"
+        )
+        core = LumenCore(
+            Sandbox.from_directory_dict({"main.py": source}),
+            {},
+            errors.append,
+            mode=ExecMode.INLINE,
+        )
+        core.step()
+
+        assert len(errors) == 1
+        assert "Access to private key '_secret' is denied" in errors[0]
+
+    def test_private_attributes_are_still_denied(self) -> None:
+        """Test that `_`, the one private name that compiles, is still checked."""
+        errors: list[str] = []
+        source = (
+            "def think() -> None:\n    value = Holder._\n    data = {'_': 1}['_']\n"
+        )
+        core = LumenCore(
+            Sandbox.from_directory_dict({"main.py": source}),
+            {"Holder": Holder},
+            errors.append,
+            mode=ExecMode.INLINE,
+        )
+        core.step()
+
+        assert len(errors) == 1
+        assert "Access to private attribute '_' is denied" in errors[0]
+        code = Sandbox.from_directory_dict({"main.py": source})["main"]
+        assert {"_getattr_", "_getitem_"} <= names(code)
+
+    def test_private_writes_are_still_rejected(self) -> None:
+        """Test that writes keep the private name checks."""
+        with pytest.raises(CompilationError, match="invalid attribute name"):
+            _ = Sandbox.from_directory_dict({"main.py": "x = 1\nx._y = 2\n"})
+
+    @pytest.mark.parametrize(
+        ("jump", "name"),
+        [
+            ("continue", "continue"),
+            ("break", "break"),
+            ("return", "return"),
+            ("if spin(): return", "return"),
+        ],
+    )
+    def test_leaving_finally_is_rejected(self, jump: str, name: str) -> None:
+        """Test that `finally` can't discard the interrupt that ends a turn."""
+        source = f"""
+def think() -> None:
+    while True:
+        try:
+            spin()
+        finally:
+            {jump}
+"""
+        with pytest.raises(CompilationError, match=f"'{name}' in 'finally'"):
+            _ = Sandbox.from_directory_dict({"main.py": source})
+
+    def test_finally_may_loop_and_define(self) -> None:
+        """Test that jumps staying inside a `finally` block still compile."""
+        source = """
+def think() -> None:
+    try:
+        pass
+    finally:
+        for _ in range(3):
+            break
+        def helper() -> int:
+            return 1
+"""
+        _ = Sandbox.from_directory_dict({"main.py": source})
@@ -0,0 +1,285 @@
+"""Tests for the event WebSocket server."""
+
+from __future__ import annotations
+
+import base64
+import os
+import socket
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from websockets.frames import Opcode
+
+from _aegis_game.game_pb import GamePb, HeadlessGamePb
+from _aegis_game.replay import ReplayWriter
+from _aegis_game.server_websocket import WebSocketServer
+from _aegis_game.types import Backpressure
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# lengths that say the real length follows in 16 or 64 bits
+PAYLOAD_LEN_EXT16 = 126
+PAYLOAD_LEN_EXT64 = 127
+# seconds to wait for the server before failing the test
+TIMEOUT = 5.0
+
+
+def start_server(backpressure: Backpressure, queue_size: int = 8) -> WebSocketServer:
+    """Start a server on a free port, with `start()` on a thread as it blocks."""
+    server = WebSocketServer(
+        wait_for_client=True, backpressure=backpressure, queue_size=queue_size, port=0
+    )
+    # a daemon, so a test failing before it connects doesn't hang the run
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    assert server.listening.wait(TIMEOUT)
+    return server
+
+
+def wait_for_client(server: WebSocketServer) -> None:
+    """Wait until the server has registered a connection, failing after `TIMEOUT`."""
+    deadline = time.monotonic() + TIMEOUT
+    while not server.has_clients():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def connect(port: int, *, binary: bool = True) -> socket.socket:
+    """Open a WebSocket connection and read the handshake response."""
+    sock = socket.create_connection(("localhost", port), timeout=TIMEOUT)
+    key = base64.b64encode(os.urandom(16)).decode()
+    path = "/?transport=binary" if binary else "/"
+    sock.sendall(
+        (
+            f"GET {path} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode()
+    )
+    response = b""
+    while b"\r\n\r\n" not in response:
+        response += sock.recv(1)
+    assert response.startswith(b"HTTP/1.1 101")
+    return sock
+
+
+def read_exactly(sock: socket.socket, size: int) -> bytes:
+    """Read exactly `size` bytes."""
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        assert chunk
+        data += chunk
+    return data
+
+
+def read_frame(sock: socket.socket) -> tuple[int, bytes]:
+    """Read a single frame and return its opcode and payload."""
+    opcode, length = struct.unpack("!BB", read_exactly(sock, 2))
+    if length == PAYLOAD_LEN_EXT16:
+        (length,) = struct.unpack("!H", read_exactly(sock, 2))
+    elif length == PAYLOAD_LEN_EXT64:
+        (length,) = struct.unpack("!Q", read_exactly(sock, 8))
+    return opcode & 0x0F, read_exactly(sock, length)
+
+
+def read_frames(sock: socket.socket) -> list[tuple[int, bytes]]:
+    """Read frames until the server closes the connection, answering its close."""
+    frames: list[tuple[int, bytes]] = []
+    while True:
+        opcode, payload = read_frame(sock)
+        if opcode == Opcode.CLOSE:
+            sock.sendall(bytes([0x80 | Opcode.CLOSE, 0x80 | len(payload)]))
+            sock.sendall(b"\0\0\0\0" + payload)
+            sock.close()
+            return frames
+        frames.append((opcode, payload))
+
+
+def read_events(sock: socket.socket) -> list[bytes]:
+    """
+    Read events until the server closes the connection.
+
+    Text frames are base64 decoded, so both transports return the raw events.
+    """
+    events: list[bytes] = []
+    for opcode, payload in read_frames(sock):
+        if opcode == Opcode.TEXT:
+            events.append(base64.b64decode(payload))
+        else:
+            assert opcode == Opcode.BINARY
+            events.append(payload)
+    return events
+
+
+class TestWebSocketServer:
+    """Tests for the catch-up stream and the backpressure policies."""
+
+    def test_late_client_starts_from_keyframe(self) -> None:
+        """Test that a client connecting later skips the events before a keyframe."""
+        server = start_server(Backpressure.BLOCK)
+        first = connect(server.port)
+        server.add_event(b"games-header")
+        server.add_event(b"game-header", keyframe=True)
+        server.add_event(b"round-1")
+        server.set_keyframe(b"keyframe-1")
+        server.add_event(b"round-2")
+
+        late = connect(server.port)
+        results: dict[str, list[bytes]] = {}
+        readers = [
+            threading.Thread(target=lambda: results.update(first=read_events(first))),
+            threading.Thread(target=lambda: results.update(late=read_events(late))),
+        ]
+        for reader in readers:
+            reader.start()
+        server.add_event(b"round-3")
+        server.finish()
+        for reader in readers:
+            reader.join()
+
+        assert results["first"] == [
+            b"games-header",
+            b"game-header",
+            b"round-1",
+            b"round-2",
+            b"round-3",
+        ]
+        assert results["late"] == [
+            b"games-header",
+            b"keyframe-1",
+            b"round-2",
+            b"round-3",
+        ]
+
+    def test_fan_out(self) -> None:
+        """Test that every client on either transport gets every event."""
+        server = start_server(Backpressure.BLOCK)
+        socks = [connect(server.port) for _ in range(2)]
+        socks.append(connect(server.port, binary=False))
+        events = [
+            b"games-header",
+            b"game-header",
+            *(bytes([i]) * 200 for i in range(8)),
+        ]
+
+        results: list[list[bytes]] = [[] for _ in socks]
+        readers = [
+            threading.Thread(
+                target=lambda i=i: results[i].extend(read_events(socks[i]))
+            )
+            for i in range(len(socks))
+        ]
+        for reader in readers:
+            reader.start()
+        server.add_event(events[0])
+        server.add_event(events[1], keyframe=True)
+        for event in events[2:]:
+            server.add_event(event)
+        server.finish()
+        for reader in readers:
+            reader.join()
+
+        assert results == [events, events, events]
+
+    def test_transport_picks_the_frame_type(self) -> None:
+        """Test that binary clients get raw frames and others get base64 text."""
+        server = start_server(Backpressure.BLOCK)
+        socks = [connect(server.port), connect(server.port, binary=False)]
+        results: list[list[tuple[int, bytes]]] = [[], []]
+        readers = [
+            threading.Thread(
+                target=lambda i=i: results[i].extend(read_frames(socks[i]))
+            )
+            for i in range(len(socks))
+        ]
+        for reader in readers:
+            reader.start()
+        server.add_event(b"\x00\xffevent")
+        server.finish()
+        for reader in readers:
+            reader.join()
+
+        assert results[0] == [(Opcode.BINARY, b"\x00\xffevent")]
+        assert results[1] == [(Opcode.TEXT, base64.b64encode(b"\x00\xffevent"))]
+
+    @pytest.mark.parametrize("backpressure", [Backpressure.DROP, Backpressure.COALESCE])
+    def test_slow_client_is_caught_up(
+        self, backpressure: Backpressure, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that a client that stops reading is sent only what it missed."""
+        server = start_server(backpressure, queue_size=2)
+        sock = connect(server.port)
+        wait_for_client(server)
+        # large enough that the socket buffers fill and the queue overflows
+        payload = bytes(1 << 20)
+        events = [
+            b"games-header",
+            b"game-header",
+            *(payload + bytes([i]) for i in range(32)),
+        ]
+        server.add_event(events[0])
+        server.add_event(events[1], keyframe=True)
+        results = [read_frame(sock)[1], read_frame(sock)[1]]
+        for event in events[2:]:
+            server.add_event(event)
+
+        reader = threading.Thread(target=lambda: results.extend(read_events(sock)))
+        reader.start()
+        server.finish()
+        reader.join()
+
+        assert "fell behind" in caplog.text
+        # nothing is sent twice, least of all the GamesHeader that resets it
+        assert results == events
+
+    def test_caught_up_client_keeps_earlier_games(self) -> None:
+        """Test that catching up from a keyframe doesn't start the stream over."""
+        server = start_server(Backpressure.DROP, queue_size=2)
+        sock = connect(server.port)
+        wait_for_client(server)
+        payload = bytes(1 << 20)
+        earlier = [b"games-header", b"game-1", b"footer-1"]
+        server.add_event(earlier[0])
+        server.add_event(earlier[1], keyframe=True)
+        server.add_event(earlier[2])
+        results = [read_frame(sock)[1] for _ in earlier]
+        server.add_event(b"game-2", keyframe=True)
+        for i in range(32):
+            server.add_event(payload + bytes([i]))
+        server.set_keyframe(b"keyframe-2")
+        server.add_event(b"round-2")
+
+        reader = threading.Thread(target=lambda: results.extend(read_events(sock)))
+        reader.start()
+        server.finish()
+        reader.join()
+
+        # the client still has game 1 and is sent game 2's header before the
+        # keyframe that replaces it
+        assert results[:4] == [*earlier, b"game-2"]
+        assert results.count(b"games-header") == 1
+        assert results[-2:] == [b"keyframe-2", b"round-2"]
+
+    def test_keyframes_need_a_client_or_replay(self, tmp_path: Path) -> None:
+        """Test that keyframes are only made when something would use them."""
+        server = start_server(Backpressure.BLOCK)
+        game_pb = GamePb()
+        game_pb.ws_server = server
+        assert not game_pb.wants_keyframe()
+
+        sock = connect(server.port)
+        wait_for_client(server)
+        assert game_pb.wants_keyframe()
+        reader = threading.Thread(target=read_events, args=(sock,))
+        reader.start()
+        server.finish()
+        reader.join()
+
+        with ReplayWriter(tmp_path / "game.aegisreplay") as writer:
+            assert GamePb(writer).wants_keyframe()
+            assert not HeadlessGamePb(writer).wants_keyframe()
@@ -0,0 +1,115 @@
+"""Tests for running a team's shared.py once for all its agents."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from _aegis_game.constants import Constants
+from _aegis_game.sandbox.core import LumenCore, SharedModule, load_shared
+from _aegis_game.sandbox.sandbox import Sandbox
+from _aegis_game.types import ExecMode
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _aegis_game.game import Game
+
+SHARED = """
+import math
+import numpy as np
+
+TABLE = [math.isqrt(n) for n in range(100)]
+LOOKUP = {"roots": [1, 2], "seen": {1}}
+GRID = np.zeros((3, 3))
+"""
+
+
+def run_agent(
+    code: Sandbox, shared: SharedModule | None
+) -> tuple[list[object], list[str]]:
+    """Run one turn of `code` and return what it saved and the errors it raised."""
+    results: list[object] = []
+    errors: list[str] = []
+    core = LumenCore(
+        code,
+        {"save": results.append},
+        errors.append,
+        mode=ExecMode.INLINE,
+        shared=shared,
+    )
+    core.step()
+    return results, errors
+
+
+class TestSharedModule:
+    """Tests for `load_shared` and importing its result."""
+
+    def test_agents_share_one_module(self) -> None:
+        """Test that every agent imports the same objects, built once."""
+        main = "import shared\n\ndef think() -> None:\n    save(shared.TABLE)\n"
+        code = Sandbox.from_directory_dict({"main.py": main, "shared.py": SHARED})
+        shared = load_shared(code, print)
+        assert shared is not None
+        assert "__builtins__" not in vars(shared)
+
+        first, errors = run_agent(code, shared)
+        second, _ = run_agent(code, shared)
+        assert errors == []
+        assert first[0] is second[0] is shared.TABLE
+
+    def test_module_is_read_only(self) -> None:
+        """Test that an agent can't rebind names for its teammates."""
+        main = "import shared\n\ndef think() -> None:\n    shared.TABLE = []\n"
+        code = Sandbox.from_directory_dict({"main.py": main, "shared.py": SHARED})
+        shared = load_shared(code, print)
+
+        _, errors = run_agent(code, shared)
+        assert len(errors) == 1
+        assert "read-only" in errors[0]
+
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "shared.TABLE.append(1)",
+            "shared.LOOKUP['roots'] = []",
+            "shared.LOOKUP['roots'].append(3)",
+            "shared.LOOKUP['seen'].add(2)",
+            "shared.GRID[0, 0] = 1",
+            "shared.GRID.flags.writeable = True",
+        ],
+    )
+    def test_shared_values_are_frozen(self, statement: str) -> None:
+        """Test that an agent can't change a shared container for its teammates."""
+        main = f"import shared\n\ndef think() -> None:\n    {statement}\n"
+        code = Sandbox.from_directory_dict({"main.py": main, "shared.py": SHARED})
+        shared = load_shared(code, print)
+
+        _, errors = run_agent(code, shared)
+        assert len(errors) == 1
+        assert shared is not None
+        assert shared.TABLE[:3] == (0, 1, 1)
+        assert shared.LOOKUP["roots"] == (1, 2)
+        assert not shared.GRID.any()
+
+    def test_failed_setup_is_reported(self) -> None:
+        """Test that an error in shared.py is reported and nothing is shared."""
+        code = Sandbox.from_directory_dict({"shared.py": "x = 1 / 0\n"})
+        errors: list[str] = []
+
+        assert load_shared(code, errors.append) is None
+        assert "ZeroDivisionError" in errors[0]
+        assert load_shared(Sandbox.from_directory_dict({}), errors.append) is None
+
+    def test_slow_setup_fails_the_team(
+        self, monkeypatch: pytest.MonkeyPatch, make_game: Callable[..., Game]
+    ) -> None:
+        """Test that a shared.py over the init limit is stopped, with its team."""
+        monkeypatch.setattr(Constants, "INIT_TIME_LIMIT", 0.2)
+        game = make_game(exec_mode=ExecMode.THREAD, shared="while True:\n    pass\n")
+        try:
+            game.warm_up()
+            assert game.agents == {}
+        finally:
+            game.stop()
@@ -0,0 +1,43 @@
+"""Tests for running tournaments of headless games."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from _aegis_game import tournament
+from _aegis_game.logger import AGENT_LOGGER, LOGGER
+from _aegis_game.tournament import Matchup, _init_worker, _run_matchup
+from _aegis_game.world_binary import WorldCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+class TestTournamentWorker:
+    """Tests for the per-process worker of a tournament."""
+
+    def test_broken_agent_only_fails_its_games(
+        self, monkeypatch: pytest.MonkeyPatch, project: Path
+    ) -> None:
+        """Test that an agent that doesn't compile doesn't stop other games."""
+        monkeypatch.setattr(tournament, "_worker_sandboxes", {})
+        monkeypatch.setattr(tournament, "_worker_errors", {})
+        monkeypatch.setattr(tournament, "_worker_worlds", lambda: WorldCache(project))
+        levels = LOGGER.level, AGENT_LOGGER.level
+        try:
+            _init_worker(["good", "bad", "missing"])
+        finally:
+            LOGGER.setLevel(levels[0])
+            AGENT_LOGGER.setLevel(levels[1])
+
+        broken = _run_matchup(Matchup("good", "bad", "tiny", None), 1, 3)
+        assert "'bad' failed to compile" in broken.error
+        assert broken.rounds == 0
+        missing = _run_matchup(Matchup("missing", None, "tiny", None), 1, 3)
+        assert "'missing' failed to compile" in missing.error
+
+        result = _run_matchup(Matchup("good", None, "tiny", None), 1, 3)
+        assert result.error == ""
+        assert result.rounds == 3  # noqa: PLR2004
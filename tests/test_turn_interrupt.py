@@ -0,0 +1,123 @@
+"""Tests for interrupting agent turns that run over the time limit."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+from _aegis_game.constants import Constants
+from _aegis_game.sandbox.core import (
+    LumenCore,
+    LumenPool,
+    TurnTimeoutError,
+    _wait_for_future,
+)
+from _aegis_game.sandbox.sandbox import Sandbox
+from _aegis_game.types import ExecMode
+
+if TYPE_CHECKING:
+    import pytest
+
+    from _aegis_game.types import MethodDict
+
+# the interrupt waits for API calls to return, so one that never does keeps
+# the turn running until the test lets it go
+STUBBORN = """
+def think() -> None:
+    spin()
+"""
+
+
+BUSY = """
+def think() -> None:
+    while True:
+        pass
+"""
+
+CALLS = """
+def think() -> None:
+    while True:
+        work()
+"""
+
+
+def make_core(
+    source: str, methods: MethodDict, pool: LumenPool
+) -> tuple[LumenCore, list[str]]:
+    """Build a pool mode core running `source` and return it with its errors."""
+    errors: list[str] = []
+    code = Sandbox.from_directory_dict({"main.py": source})
+    return (
+        LumenCore(code, methods, errors.append, mode=ExecMode.POOL, executor=pool),
+        errors,
+    )
+
+
+class TestLumenPool:
+    """Tests for running turns on `LumenPool`."""
+
+    def test_stuck_worker_is_replaced(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a turn ignoring its interrupt doesn't take its worker along."""
+        monkeypatch.setattr(Constants, "TURN_INTERRUPT_GRACE", 0.05)
+        release = threading.Event()
+        pool = LumenPool(1)
+        stuck, _ = make_core(STUBBORN, {"spin": release.wait}, pool)
+        try:
+            assert not stuck.run(0.05)
+            assert len(pool.abandoned) == 1
+            assert all(worker.daemon for worker in pool.workers)
+
+            results: list[int] = []
+            source = "def think() -> None:\n    save(1)\n"
+            core, errors = make_core(source, {"save": results.append}, pool)
+            assert core.run(1.0)
+            assert errors == []
+            assert results == [1]
+        finally:
+            release.set()
+            pool.shutdown()
+
+
+class TestInterrupt:
+    """Tests for preempting turns that run over the time limit."""
+
+    def test_loop_without_api_calls_is_preempted(self) -> None:
+        """Test that a turn making no API calls is stopped from outside."""
+        pool = LumenPool(1)
+        core, errors = make_core(BUSY, {}, pool)
+        try:
+            assert not core.wait(core.start(), 0.05)
+            assert not pool.abandoned
+            assert len(errors) == 1
+            assert "interrupted" in errors[0]
+        finally:
+            pool.shutdown()
+
+    def test_api_calls_are_never_cut_short(self) -> None:
+        """Test that the interrupt lands between API calls, not inside one."""
+        started: list[int] = []
+        finished: list[int] = []
+
+        def work() -> None:
+            started.append(1)
+            # engine code long enough for the interrupt to be tried during it
+            for _ in range(10_000):
+                pass
+            finished.append(1)
+
+        pool = LumenPool(1)
+        core, errors = make_core(CALLS, {"work": work}, pool)
+        try:
+            assert not core.wait(core.start(), 0.05)
+        finally:
+            pool.shutdown()
+
+        assert len(started) == len(finished) > 0
+        assert "interrupted" in errors[0]
+
+    def test_late_interrupt_ends_the_wait(self) -> None:
+        """Test that an interrupt escaping a pool turn isn't raised in the game."""
+        future: Future[None] = Future()
+        future.set_exception(TurnTimeoutError())
+        assert _wait_for_future(future, 0)
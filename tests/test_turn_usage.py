@@ -0,0 +1,90 @@
+"""Tests for measuring what agent turns cost and holding them to budgets."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from _aegis_game.constants import Constants
+from _aegis_game.sandbox.core import LumenCore, TurnUsage
+from _aegis_game.sandbox.sandbox import Sandbox
+from _aegis_game.types import ExecMode
+
+if TYPE_CHECKING:
+    import pytest
+
+    from _aegis_game.types import MethodDict
+
+BUSY = """
+def think() -> None:
+    for _ in range(999):
+        for _ in range(999):
+            for _ in range(999):
+                pass
+"""
+
+
+def make_core(
+    source: str, methods: MethodDict, mode: ExecMode
+) -> tuple[LumenCore, list[str]]:
+    """Build a core running `source` and return it with the errors it reports."""
+    errors: list[str] = []
+    code = Sandbox.from_directory_dict({"main.py": source})
+    return LumenCore(code, methods, errors.append, mode=mode), errors
+
+
+class TestTurnUsage:
+    """Tests for `TurnUsage` and how `LumenCore` records it."""
+
+    def test_api_calls_are_counted_and_capped(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that calls over the budget fail inside the agent's turn."""
+        monkeypatch.setattr(Constants, "MAX_TURN_API_CALLS", 5)
+        calls: list[int] = []
+        source = "def think() -> None:\n    for i in range(10):\n        call(i)\n"
+        core, errors = make_core(source, {"call": calls.append}, ExecMode.INLINE)
+        core.step()
+
+        assert calls == [0, 1, 2, 3, 4]
+        assert len(errors) == 1
+        assert "limit of 5 API calls" in errors[0]
+        assert core.usage is not None
+        assert core.usage.api_calls == 6  # noqa: PLR2004
+
+    def test_over_budget(self) -> None:
+        """Test that turns are checked against the CPU and memory budgets."""
+        assert TurnUsage(0.1, None, 10).over_budget() is None
+        cpu = TurnUsage(Constants.MAX_TURN_TIME_LIMIT, None, 0).over_budget()
+        assert cpu is not None
+        assert "CPU time" in cpu
+        memory = TurnUsage(0.1, Constants.MAX_TURN_MEMORY, 0).over_budget()
+        assert memory is not None
+        assert "MiB" in memory
+
+    def test_waiting_turn_is_not_interrupted(self) -> None:
+        """Test that a turn using little CPU time gets more time on the clock."""
+        source = "def think() -> None:\n    nap()\n"
+        core, errors = make_core(
+            source, {"nap": lambda: time.sleep(0.15)}, ExecMode.THREAD
+        )
+        try:
+            assert core.run(0.1)
+        finally:
+            core.kill()
+
+        assert errors == []
+        assert core.usage is not None
+        assert core.usage.cpu_time < 0.1  # noqa: PLR2004
+
+    def test_busy_turn_is_interrupted(self) -> None:
+        """Test that a turn using up its CPU time is still interrupted."""
+        core, errors = make_core(BUSY, {}, ExecMode.THREAD)
+        try:
+            assert not core.run(0.1)
+        finally:
+            core.kill()
+
+        assert core.usage is not None
+        assert core.usage.cpu_time >= 0.1  # noqa: PLR2004
+        assert "time limit" in errors[0]
@@ -0,0 +1,154 @@
+"""Tests for the mappable binary world format and its cache."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from _aegis_game.common import Cell, Location
+from _aegis_game.common.objects import Rubble, Survivor
+from _aegis_game.world import CopyOnWriteCells, World
+from _aegis_game.world_binary import (
+    LazyCells,
+    WorldCache,
+    map_world_file,
+    write_world_file,
+)
+from _aegis_game.world_pb import serialize_world
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def make_world() -> World:
+    """Build a 3x3 world with stacked layers, an agent and a spawn."""
+    cells = [Cell(x, y) for y in range(3) for x in range(3)]
+    cells[4].add_layer(Rubble(1, 2, 3))
+    cells[4].add_layer(Survivor(2, 10))
+    cells[5].move_cost = 4
+    cells[5].agents = [7]
+    cells[0].set_spawn_cell()
+    cells[8].set_charging_cell()
+    return World(3, 3, 5, 100, cells, {Location(0, 0): 2})
+
+
+def write_world(path: Path) -> None:
+    """Write `make_world()` as a protobuf world file."""
+    pb_world = serialize_world(make_world())
+    spawn = pb_world.init_spawns.add()
+    spawn.loc.x = 0
+    spawn.loc.y = 0
+    spawn.amount = 2
+    _ = path.write_bytes(pb_world.SerializeToString())
+
+
+class TestWorldCache:
+    """Tests for converting, mapping and caching worlds."""
+
+    def test_mapped_world_matches_parsed(self, tmp_path: Path) -> None:
+        """Test that a cached world has the same grid, cells and spawns."""
+        path = tmp_path / "test.world"
+        write_world(path)
+        _ = WorldCache(tmp_path / "cache").load(path)
+
+        # a new cache, as in a later run, maps the converted file
+        world = WorldCache(tmp_path / "cache").load(path)
+        expected = make_world()
+        assert isinstance(world.cells, CopyOnWriteCells)
+        assert world.init_spawns == expected.init_spawns
+        assert (world.seed, world.start_energy) == (5, 100)
+        for name in ("move_cost", "cell_type", "survivors", "top_layer", "agent_count"):
+            assert np.array_equal(
+                getattr(world.grid, name), getattr(expected.grid, name)
+            )
+
+        cell = world.cells[4]
+        rubble, survivor = cell.layers
+        assert isinstance(rubble, Rubble)
+        assert (rubble.id, rubble.energy_required, rubble.agents_required) == (1, 2, 3)
+        assert isinstance(survivor, Survivor)
+        assert (survivor.id, survivor.health) == (2, 10)
+        assert world.cells[5].agents == [7]
+        assert world.cells[8].is_charging_cell()
+
+    def test_cells_are_built_lazily(self, tmp_path: Path) -> None:
+        """Test that only the cells that are accessed get built, and only once."""
+        path = tmp_path / "test.bin"
+        write_world_file(make_world(), path)
+        world = map_world_file(path)
+        assert isinstance(world.cells, LazyCells)
+        assert world.cells.materialized() == 0
+
+        cell = world.get_cell_at(Location(1, 1))
+        assert world.get_cell_at(Location(1, 1)) is cell
+        assert world.cells.materialized() == 1
+
+    def test_loads_are_independent_copies(self, tmp_path: Path) -> None:
+        """Test that games on the same world don't see each other's changes."""
+        path = tmp_path / "test.world"
+        write_world(path)
+        cache = WorldCache(tmp_path / "cache")
+        first = cache.load(path)
+        second = cache.load(path)
+
+        _ = first.remove_top_layer(Location(1, 1))
+        first.add_agent_at(Location(1, 1), 3)
+
+        assert len(second.get_cell_at(Location(1, 1)).layers) == 2  # noqa: PLR2004
+        assert second.get_cell_at(Location(1, 1)).agents == []
+        assert second.grid.agent_count[1, 1] == 0
+        assert isinstance(first.cells, CopyOnWriteCells)
+        assert first.cells.copied() == 1
+
+    def test_serializing_copies_nothing(self, tmp_path: Path) -> None:
+        """Test that reading the whole world leaves shared cells shared."""
+        path = tmp_path / "test.world"
+        write_world(path)
+        world = WorldCache(tmp_path / "cache").load(path)
+        world.add_agent_at(Location(1, 1), 3)
+        assert isinstance(world.cells, CopyOnWriteCells)
+
+        pb_world = serialize_world(world)
+        assert world.cells.copied() == 1
+        assert list(pb_world.cells[4].agents) == [3]
+        assert list(pb_world.cells[5].agents) == [7]
+
+    def test_modified_world_misses(self, tmp_path: Path) -> None:
+        """Test that editing a world file gives it a new cache entry."""
+        path = tmp_path / "test.world"
+        write_world(path)
+        cache = WorldCache(tmp_path / "cache")
+        key = cache.key(path)
+
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert cache.key(path) != key
+
+    def test_corrupt_entry_is_ignored(self, tmp_path: Path) -> None:
+        """Test that an unreadable entry is treated as a miss and rewritten."""
+        path = tmp_path / "test.world"
+        write_world(path)
+        cache = WorldCache(tmp_path / "cache")
+        cache.directory.mkdir()
+        entry = cache.directory / f"{cache.key(path)}.bin"
+        _ = entry.write_bytes(b"\x00")
+
+        assert cache.load(path).total_survivors == 1
+        assert isinstance(map_world_file(entry).cells, LazyCells)
+
+    def test_default_directory_follows_cwd(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the default directory is found when the cache is made."""
+        path = tmp_path / "test.world"
+        write_world(path)
+        monkeypatch.chdir(tmp_path)
+        cache = WorldCache()
+        _ = cache.load(path)
+
+        assert cache.directory == tmp_path / ".aegis_cache" / "worlds"
+        assert any(cache.directory.iterdir())
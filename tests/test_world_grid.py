@@ -0,0 +1,61 @@
+"""Tests for the array-backed WorldGrid kept alongside World.cells."""
+
+from __future__ import annotations
+
+from _aegis_game.common import Cell, Location
+from _aegis_game.common.objects import Rubble, Survivor
+from _aegis_game.types import CellType
+from _aegis_game.world import World
+from _aegis_game.world_grid import LayerKind
+
+
+def make_world() -> World:
+    """Build a 3x3 world with a survivor under rubble and special cells."""
+    cells = [Cell(x, y) for y in range(3) for x in range(3)]
+    cells[4].add_layer(Rubble(1, 2, 1))
+    cells[4].add_layer(Survivor(2, 10))
+    cells[5].add_layer(Survivor(3, 10))
+    cells[5].move_cost = 4
+    cells[0].set_spawn_cell()
+    cells[8].set_charging_cell()
+    return World(3, 3, 0, 100, cells, {})
+
+
+class TestWorldGrid:
+    """Tests for building the grid and keeping it in sync."""
+
+    def test_arrays_match_cells(self) -> None:
+        """Test that the grid mirrors the cells it was built from."""
+        world = make_world()
+        grid = world.grid
+        assert grid.survivors[1, 1] == 1
+        assert grid.top_layer[1, 1] == LayerKind.RUBBLE
+        assert grid.top_layer[1, 2] == LayerKind.SURVIVOR
+        assert grid.move_cost[1, 2] == 4  # noqa: PLR2004
+        assert world.total_survivors == 2  # noqa: PLR2004
+
+    def test_queries_follow_cell_order(self) -> None:
+        """Test that location queries match a scan of World.cells."""
+        world = make_world()
+        grid = world.grid
+        assert grid.survivor_locations() == [Location(1, 1), Location(2, 1)]
+        assert grid.locations_of_type(CellType.SPAWN_CELL) == [Location(0, 0)]
+        assert grid.locations_of_type(CellType.CHARGING_CELL) == [Location(2, 2)]
+
+    def test_remove_top_layer_updates_grid(self) -> None:
+        """Test that removing layers through World updates the arrays."""
+        world = make_world()
+        _ = world.remove_top_layer(Location(1, 1))
+        assert world.grid.top_layer[1, 1] == LayerKind.SURVIVOR
+        _ = world.remove_top_layer(Location(1, 1))
+        assert world.grid.top_layer[1, 1] == LayerKind.NONE
+        assert world.grid.survivor_locations() == [Location(2, 1)]
+
+    def test_agent_count_tracks_moves(self) -> None:
+        """Test that adding and removing agents updates the agent counts."""
+        world = make_world()
+        world.add_agent_at(Location(0, 0), 7)
+        world.add_agent_at(Location(0, 0), 8)
+        world.remove_agent_at(Location(0, 0), 7)
+        assert world.grid.agent_count[0, 0] == 1
+        assert world.get_cell_at(Location(0, 0)).agents == [8]